@@ -1,42 +1,113 @@
 from django.contrib import admin, messages
-from django.http import HttpResponse, HttpResponseRedirect, FileResponse
+from django.http import HttpResponse, HttpResponseRedirect, FileResponse, JsonResponse
 from django.utils import timezone
 from django.shortcuts import render, redirect
 from django.utils.html import format_html
 from urllib.parse import unquote as urlunquote
-from django.urls import path
+from django.urls import path, reverse
+from django.core.paginator import Paginator
+from urllib.parse import urlencode
 from django.template.response import TemplateResponse
-from django.db.models import Count, Q, Case, When
+from django.db.models import Count, Q, Case, When, Exists, OuterRef, Subquery, prefetch_related_objects
+from django.db import transaction
 from .models import Pillar, Headline
 from datetime import timedelta, datetime
-from django.db import transaction
 from collections import defaultdict
 import csv
 import io
-import random
 from decimal import Decimal
 from django.db.models import Max
-from .models import Pillar, Headline, PinTemplateVariation, Board, ScheduledPin, Campaign, Keyword, PinKeywordAssignment, RepurposedPostStatus
+from .models import Pillar, Headline, PinTemplateVariation, Board, ScheduledPin, ScheduledPinLog, StagedScheduledPin, Campaign, Keyword, PinKeywordAssignment, RepurposedPostStatus, DailyRepurposePick
 from .forms import PinTemplateVariationForm, ScheduledPinForm, KeywordCSVUploadForm, CampaignAdminForm
 from pinterest_scheduler.services.exporter import export_scheduled_pins_to_csv
-from pinterest_scheduler.services.hook_generator import build_context, generate_hook_openai
-from django.utils.timezone import now, localtime, make_aware
+from pinterest_scheduler.services.hook_generator import generate_hook_for_pin, get_openai_client, looks_like_real_hook
+from pinterest_scheduler.services.caching import cached_boards, cached_value
+from pinterest_scheduler.services.db_pool import pool_stats
+from pinterest_scheduler.services.daily_picks import (
+    DAILY_PICK_COUNT,
+    fill_missing_hooks,
+    get_daily_picks,
+    precompute_daily_picks,
+)
+from pinterest_scheduler.services.repurpose import mark_repurposed
+from pinterest_scheduler.services.slots import allocate_days, ensure_allocated
+from pinterest_scheduler.services.schedule_checks import check_schedule, load_schedule, schedule_arrays, summarize
+from pinterest_scheduler.services.schedule_optimizer import optimize_schedule
+from pinterest_scheduler.services.scheduling import (
+    CampaignLocked, apply_schedule, diff_staged, discard_staged, group_by_campaign, planned_rows, promote_staged,
+    stage_schedule, summarize_diff,
+)
+from pinterest_scheduler.services.transitions import claim_for_export, mark_posted, transition
+from ruoth_pins.log_handlers import dropped_records
+from pinterest_scheduler.services.summary import (
+    DEFAULT_MAX_VARIATIONS, HEADLINES_PER_PILLAR, REPURPOSE_PLATFORMS, pillar_completion_summary, pillar_variation_target,
+    repurpose_rollup,
+)
+from django.utils.timezone import now, localtime
+import time
 import zipfile
 import logging
 
 from django.utils.safestring import mark_safe
 from django.conf import settings
 
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover
-    OpenAI = None
-
-
 logger = logging.getLogger(__name__)
+# Per-row CSV import chatter; sampled by settings.LOG_SAMPLING.
+row_logger = logging.getLogger(f"{__name__}.csv_rows")
+
+# Rows per page on the schedule preview.
+PREVIEW_PAGE_SIZE = 50
 
 admin.site.index_template = "admin/index.html"
 
+# ----------------------
+# RELATED-OBJECT LABELS
+# ----------------------
+# __str__ of these models reads a related row (variation → headline text,
+# headline → pillar name, pillar → campaign name). Pickers, filters and list
+# columns load those rows with the options instead of once per option.
+LABEL_RELATED = {
+    PinTemplateVariation: ['headline'],
+    Headline: ['pillar'],
+    Pillar: ['campaign'],
+}
+
+
+def labelled_queryset(model):
+    return model._default_manager.select_related(*LABEL_RELATED.get(model, []))
+
+
+class LabelledChoicesMixin:
+    """Foreign-key pickers whose option labels render without a query each."""
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.related_model in LABEL_RELATED and 'queryset' not in kwargs:
+            kwargs['queryset'] = labelled_queryset(db_field.related_model)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class IdSearchMixin:
+    """Admin search (and so autocomplete) where a numeric term also matches the primary key."""
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term.isdigit():
+            results |= queryset.filter(pk=int(term))
+        # Autocomplete labels each result; load what the label reads.
+        return results.select_related(*LABEL_RELATED.get(self.model, [])), may_have_duplicates
+
+
+class LabelledRelatedFilter(admin.RelatedFieldListFilter):
+    """RelatedFieldListFilter that builds its choices from one select_related query."""
+
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        queryset = labelled_queryset(field.related_model)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
 # -----------------------
 # CUSTOM ADMIN ACTIONS
 # -----------------------
@@ -52,15 +123,16 @@ class PinterestSchedulerAdminSite(admin.AdminSite):
         return custom_urls + urls
 
     def pinterest_summary(self, request):
+        # Ignore a non-numeric ?campaign= rather than letting the filter raise.
+        campaign = request.GET.get('campaign', '')
         data = []
-        for pillar in Pillar.objects.all():
-            headlines = pillar.headlines.annotate(variation_count=Count('variations'))
-            variation_total = sum(h.variation_count for h in headlines)
+        for row in pillar_completion_summary(campaign_id=campaign if campaign.isdigit() else None):
             data.append({
-                'pillar': pillar.name,
-                'headline_count': f"{headlines.count()} / 5",
-                'variation_count': f"{variation_total} / 20",
-                'status': "✅ 100%" if variation_total == 20 else "🔄 In Progress",
+                'campaign': row['campaign'],
+                'pillar': row['pillar'],
+                'headline_count': f"{row['headline_count']} / {row['headline_target']}",
+                'variation_count': f"{row['variation_count']} / {row['variation_target']}",
+                'status': "✅ 100%" if row['complete'] else f"🔄 {row['percent_complete']}%",
             })
         return TemplateResponse(request, "admin/pinterest_summary.html", {'data': data})
 
@@ -74,21 +146,22 @@ class PinterestSchedulerAdminSite(admin.AdminSite):
 class PillarAdmin(admin.ModelAdmin):
     list_display = ['name', 'campaign','tagline', 'headline_progress', 'variation_progress']
     list_filter = ['campaign']
+    list_select_related = ['campaign']
 
     def campaign(self, obj):
         return obj.campaign.name if obj.campaign else "—"
     campaign.short_description = "Campaign"
 
     def headline_progress(self, obj):
-        count = obj.headlines.count()
-        return f"{count} / 5"
+        return f"{obj.headline_count} / {HEADLINES_PER_PILLAR}"
     headline_progress.short_description = "Headlines"
+    headline_progress.admin_order_field = 'headline_count'
 
     def variation_progress(self, obj):
-        total = sum(h.variations.count() for h in obj.headlines.all())
-        max_allowed = (obj.campaign.max_variations_per_headline or 4) * obj.headlines.count()
-        return f"{total} / {max_allowed}"
+        per_headline = (obj.campaign.max_variations_per_headline if obj.campaign else None) or DEFAULT_MAX_VARIATIONS
+        return f"{obj.variation_count} / {pillar_variation_target(obj.headline_count, per_headline)}"
     variation_progress.short_description = "Variations"
+    variation_progress.admin_order_field = 'variation_count'
 
 # ----------------------
 # INLINE for HEADLINE (shows 4 pin variations per headline)
@@ -119,10 +192,11 @@ class VariationInline(admin.TabularInline):
     show_change_link = True
 
 @admin.register(Headline)
-class HeadlineAdmin(admin.ModelAdmin):
+class HeadlineAdmin(IdSearchMixin, LabelledChoicesMixin, admin.ModelAdmin):
     list_display = ['pillar', 'text']
-    list_filter = ['pillar']
-    search_fields = ['text']
+    list_filter = [('pillar', LabelledRelatedFilter)]
+    list_select_related = ['pillar__campaign']
+    search_fields = ['text', 'pillar__name']
     inlines = [VariationInline]
 
 # ----------------------
@@ -134,6 +208,10 @@ class PinKeywordInline(admin.TabularInline):
     autocomplete_fields = ['keyword']
     readonly_fields = ['assigned_at', 'auto_assigned']
 
+    def get_queryset(self, request):
+        # Row labels (PinKeywordAssignment.__str__) read the pin's headline and the keyword.
+        return super().get_queryset(request).select_related('pin__headline', 'keyword')
+
 
 # ----------------------
 # PIN TEMPLATE VARIATION ADMIN (structured with previews + grouping)
@@ -167,8 +245,11 @@ class CampaignFilter(admin.SimpleListFilter):
     parameter_name = 'campaign'
 
     def lookups(self, request, model_admin):
-        from .models import Campaign
-        return [(c.id, c.name) for c in Campaign.objects.all()]
+        return cached_value(
+            'campaign_filter_lookups',
+            [Campaign],
+            lambda: list(Campaign.objects.values_list('id', 'name')),
+        )
 
     def queryset(self, request, queryset):
         if self.value():
@@ -176,7 +257,7 @@ class CampaignFilter(admin.SimpleListFilter):
         return queryset
 
 @admin.register(PinTemplateVariation)
-class PinTemplateVariationAdmin(admin.ModelAdmin):
+class PinTemplateVariationAdmin(IdSearchMixin, LabelledChoicesMixin, admin.ModelAdmin):
     form = PinTemplateVariationForm
     change_list_template = "admin/change_list_with_upload_button.html"
 
@@ -185,15 +266,22 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         'cta', 'mockup_name', 'background_style', 'keyword_list',
         'repurpose_tiktok', 'repurpose_instagram', 'repurpose_youtube'
     ]
-    list_filter = ['headline__pillar', 'headline', HasKeywordsFilter, CampaignFilter]
+    list_filter = [
+        ('headline__pillar', LabelledRelatedFilter), ('headline', LabelledRelatedFilter), HasKeywordsFilter, CampaignFilter
+    ]
     inlines = [PinKeywordInline, RepurposedStatusInline]
     # filter_horizontal = ('keywords',)
-    search_fields = ['cta', 'mockup_name', 'badge_icon']
+    # Each of these has a trigram index on PostgreSQL (PinTemplateVariation.Meta.indexes); keep them in step.
+    # Headline text is searched separately (get_search_results).
+    search_fields = ['title', 'cta', 'mockup_name', 'badge_icon']
+    # Paged server-side search (HeadlineAdmin.search_fields) instead of a <select> of every headline.
+    autocomplete_fields = ['headline']
     readonly_fields = ['pillar_preview', 'thumbnail_preview', 'variation_progress']
     list_select_related = ['headline__pillar']
     actions = [
         'auto_assign_keywords',
         'smartloop_schedule',
+        'smartloop_stage',
         'mark_repurposed_tiktok',
         'mark_repurposed_instagram',
         'mark_repurposed_youtube',
@@ -219,12 +307,40 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         return obj.headline.pillar.name if obj.headline and obj.headline.pillar else "-"
     pillar_preview.short_description = 'Pillar'
 
+    def get_queryset(self, request):
+        # The list columns below read these instead of querying per row. The
+        # position counts siblings in a subquery rather than a ROW_NUMBER()
+        # window, which would number only the rows left after search/filters.
+        return super().get_queryset(request).annotate(
+            variation_index=Subquery(
+                PinTemplateVariation.objects.filter(headline=OuterRef('headline'), id__lte=OuterRef('id'))
+                .order_by()
+                .values('headline')
+                .annotate(n=Count('pk'))
+                .values('n')[:1]
+            ),
+            **{
+                f'repurposed_{platform}': Exists(
+                    RepurposedPostStatus.objects.filter(variation=OuterRef('pk'), platform=platform)
+                )
+                for platform in REPURPOSE_PLATFORMS
+            },
+        ).prefetch_related('keywords')
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term:
+            # Matching headlines are looked up first (their own trigram index) and
+            # ORed in by id: a joined column among the search fields would keep
+            # PostgreSQL from combining the variation indexes.
+            headline_ids = list(Headline.objects.filter(text__icontains=term).values_list('pk', flat=True))
+            if headline_ids:
+                results |= queryset.filter(headline_id__in=headline_ids)
+        return results, may_have_duplicates
+
     def variation_position(self, obj):
-        siblings = list(obj.headline.variations.order_by('id'))
-        if obj.pk in [s.pk for s in siblings]:
-            index = siblings.index(obj) + 1
-            return f"Variation {index} of {len(siblings)}"
-        return "-"
+        return f"Variation {obj.variation_index} of {obj.headline.variation_count}"
     variation_position.short_description = 'Variation Position'
 
     def thumbnail_preview(self, obj):
@@ -234,10 +350,11 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
     thumbnail_preview.short_description = 'Thumbnail Preview'
 
     def variation_progress(self, obj):
-        count = obj.headline.variations.count()
+        count = obj.headline.variation_count
+        campaign = obj.headline.pillar.campaign
         max_allowed = (
-            obj.headline.pillar.campaign.max_variations_per_headline
-            if obj.headline.pillar.campaign.max_variations_per_headline is not None
+            campaign.max_variations_per_headline
+            if campaign and campaign.max_variations_per_headline is not None
             else 4
         )
         if count >= max_allowed:
@@ -271,60 +388,14 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
 
     def _get_openai_client(self):
         """Return an OpenAI client or None if not configured."""
-        api_key = getattr(settings, 'OPENAI_API_KEY', None)
-        if not api_key:
-            logger.error("OPENAI_API_KEY missing in Django settings")
-            return None
-        if OpenAI is None:
-            logger.error("OpenAI SDK import failed (OpenAI is None)")
-            return None
-        try:
-            logger.info("OpenAI client initialised for hook generation")
-            return OpenAI(api_key=api_key)
-        except Exception as e:
-            logger.exception("Failed to init OpenAI client: %s", e)
-            return None
+        return get_openai_client()
 
     def _generate_hook(self, pin, recent_hooks=None, max_chars=50):
         """Generate a punchy hook (<= max_chars) for a PinTemplateVariation.
 
         Single source of truth: delegates to pinterest_scheduler.services.hook_generator.
-
-        IMPORTANT:
-        - If OpenAI is not configured or generation fails, return an empty string.
-        - We NEVER fall back to headline/title/tagline because that pollutes the DB/UI.
         """
-        recent_hooks = recent_hooks or []
-
-        pin_id = getattr(pin, 'id', None)
-        logger.info("Hook gen start pin=%s recent_hooks=%s", pin_id, len(recent_hooks))
-
-        # Build canonical context from the model
-        ctx = build_context(pin)
-
-        # If OpenAI isn't available, do not fabricate a "hook".
-        client = self._get_openai_client()
-        if client is None:
-            logger.error("Hook gen skipped pin=%s (no OpenAI client)", pin_id)
-            return ""
-
-        try:
-            hook = generate_hook_openai(
-                context=ctx,
-                client=client,
-                recent_hooks=recent_hooks,
-                max_chars=max_chars,
-            )
-        except Exception as e:
-            logger.exception("Hook gen failed pin=%s: %s", pin_id, e)
-            return ""
-
-        hook = (hook or "").strip()[:max_chars]
-        if hook:
-            logger.info("Hook gen ok pin=%s len=%s", pin_id, len(hook))
-        else:
-            logger.error("Hook gen empty pin=%s", pin_id)
-        return hook
+        return generate_hook_for_pin(pin, recent_hooks=recent_hooks, max_chars=max_chars)
 
 
     def upload_pin_variations_csv(self, request):
@@ -336,7 +407,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
             added, skipped, errors = 0, 0, 0
 
             for row_num, row in enumerate(reader, start=2):  # header = row 1
-                logger.debug(f"[Row {row_num}] Processing row: {row}")
+                row_logger.debug("[Row %s] Processing row: %s", row_num, row)
                 try:
                     campaign_name = row.get('campaign', '').strip()
                     pillar_name = row.get('pillar', '').strip()
@@ -351,21 +422,21 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                     link = row.get('link', '').strip()
 
                     if not all([campaign_name, pillar_name, headline_text, title, image_url, description]):
-                        logger.debug(f"[Row {row_num}] Missing required fields: {row}")
+                        row_logger.debug("[Row %s] Missing required fields: %s", row_num, row)
                         skipped += 1
                         continue
 
                     try:
                         campaign = Campaign.objects.get(name=campaign_name)
                     except Campaign.DoesNotExist:
-                        logger.debug(f"[Row {row_num}] Campaign not found: {campaign_name}")
+                        row_logger.debug("[Row %s] Campaign not found: %s", row_num, campaign_name)
                         skipped += 1
                         continue
 
                     try:
                         pillar = Pillar.objects.get(name=pillar_name, campaign=campaign)
                     except Pillar.DoesNotExist:
-                        logger.debug(f"[Row {row_num}] Pillar not found: {pillar_name}")
+                        row_logger.debug("[Row %s] Pillar not found: %s", row_num, pillar_name)
                         skipped += 1
                         continue
 
@@ -374,7 +445,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                     if not headline:
                         # 🔧 Create the headline if missing
                         headline = Headline.objects.create(pillar=pillar, text=headline_text.strip())
-                        logger.debug(f"[Row {row_num}] Created new headline: {headline_text}")
+                        row_logger.debug("[Row %s] Created new headline: %s", row_num, headline_text)
 
                     # 🛡️ Defensive check: skip if a similar variation already exists
                     variation_exists = PinTemplateVariation.objects.filter(
@@ -389,7 +460,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                     ).exists()
 
                     if variation_exists:
-                        logger.debug(f"[Row {row_num}] Variation already exists — skipping.")
+                        row_logger.debug("[Row %s] Variation already exists — skipping.", row_num)
                         skipped += 1
                         continue
 
@@ -405,7 +476,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                         else 4
                     )
                     if existing_count >= max_allowed:
-                        logger.warning(f"[Row {row_num}] Max variations reached ({existing_count}/{max_allowed}) for headline: {headline.text}")
+                        row_logger.warning("[Row %s] Max variations reached (%s/%s) for headline: %s", row_num, existing_count, max_allowed, headline.text)
                         skipped += 1
                         continue
 
@@ -421,13 +492,14 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                         description=description,
                         link=link
                     )
-                    logger.info(f"[Row {row_num}] ✅ Added variation: {title}")
+                    row_logger.info("[Row %s] ✅ Added variation: %s", row_num, title)
                     added += 1
 
                 except Exception as e:
-                    logger.exception(f"[Row {row_num}] ❌ Error adding row: {e}")
+                    row_logger.exception("[Row %s] ❌ Error adding row: %s", row_num, e)
                     errors += 1
 
+            logger.info("Pin variations CSV import: added=%s skipped=%s errors=%s", added, skipped, errors)
             messages.success(request, f"✅ Added: {added} — 🔁 Skipped: {skipped} — ⚠️ Errors: {errors}")
             return redirect("..")
 
@@ -437,9 +509,6 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
     def auto_assign_keywords(self, request, queryset):
         from random import randint
         from collections import defaultdict
-        import logging
-
-        logger = logging.getLogger(__name__)
         keywords_by_tier = defaultdict(list)
 
         logger.info("🔁 Smart keyword assignment with global rotation")
@@ -484,7 +553,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
             def pick_keywords(tier, count):
                 pool = [k for k in keywords_by_tier[tier] if global_usage.get(k.id, 0) == 0]
                 if len(pool) < count:
-                    logger.warning(f"⚠️ Not enough unused {tier}-tier keywords. Allowing reuse.")
+                    logger.warning("⚠️ Not enough unused %s-tier keywords. Allowing reuse.", tier)
                     pool = sorted(keywords_by_tier[tier], key=lambda k: global_usage.get(k.id, 0))
                 if len(pool) < count:
                     raise ValueError(f"Not enough keywords in tier: {tier}")
@@ -514,22 +583,19 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
 
         # ✅ Log unused keywords to console
         unused_keywords = [k.phrase for k in all_keywords if k.id not in used_keywords]
-        logger.info(f"📉 Unused keywords: {len(unused_keywords)}")
-        for phrase in unused_keywords:
-            print(f"🔍 Unused: {phrase}")
+        logger.info("📉 Unused keywords: %s", len(unused_keywords))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 Unused: %s", ", ".join(unused_keywords))
 
     @admin.action(description="📅 SmartLoop: Auto-schedule pins across 30 days")
     def smartloop_schedule(self, request, queryset, dry_run=False, preview=False):
-        boards = list(Board.objects.all())[:5]
-        pins = list(queryset.select_related('headline__pillar'))
-        logger.info(f"SmartLoop: {len(pins)} pins selected by admin.")
+        boards = cached_boards()[:5]
+        pins = list(queryset.select_related('headline__pillar__campaign'))
+        logger.info("SmartLoop: %s pins selected by admin.", len(pins))
 
         # 1. Bucket pins into 6 groups of 20
-        pin_count = len(pins)
         repeats_per_pin = 5
-        total_slots = pin_count * repeats_per_pin
         days = 30
-        pins_per_day = total_slots // days
         spacing = days // repeats_per_pin 
 
         # 2. Compute next Monday
@@ -537,46 +603,76 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         days_until_mon = (7 - today.weekday()) % 7 or 7
         start = today + timedelta(days=days_until_mon)
 
-        # 3. Build schedule_by_day and collect per-pillar counts
-        schedule_by_day   = defaultdict(list)
-        pillar_diagnostics = defaultdict(lambda: defaultdict(int))  # pillar_diagnostics[date][pillar] = count
+        # 3. Plan each campaign on its own: pillar mix is balanced within a campaign,
+        # and each campaign's write only replaces that campaign's rows.
+        by_campaign = group_by_campaign(pins)
+        orphans = by_campaign.pop(None, [])
+        if orphans:
+            self.message_user(request, f"⚠️ Skipped {len(orphans)} pins whose pillar has no campaign.", level=messages.WARNING)
 
-        # ✅ IMPROVED LOGIC: Each pin 5×, 6-day spaced, full rotation
-        random.shuffle(pins)  # shuffle to introduce variety
-
-        for i, pin in enumerate(pins):
-            for rot in range(repeats_per_pin):
-                day_index = (i + rot * spacing) % days
-                pub_date = start + timedelta(days=day_index)
-                board = boards[rot]
-                schedule_by_day[pub_date].append((pin, board))
-                pillar_diagnostics[pub_date][pin.headline.pillar.name] += 1
-
-        # 4. Validate 20 pins/day
-        # 🧪 Soft validation (optional): Warn if days have unusually high pin counts
-        for pub_date, items in sorted(schedule_by_day.items()):
-            if len(items) > pins_per_day + 5:
-                self.message_user(
-                    request,
-                    f"⚠️ Scheduling warning: {pub_date} has {len(items)} pins (target ≈ {pins_per_day})",
-                    level=messages.WARNING
-                )
+        plans = {}  # campaign_id -> {publish_date: [(pin, board), ...]}
+        pillar_diagnostics = defaultdict(lambda: defaultdict(int))  # pillar_diagnostics[date][pillar] = count
+        # One optimiser budget for the whole request, shared out as campaigns are
+        # planned: each gets an even share of what's left, so time a campaign
+        # doesn't need passes on to the next.
+        budget_deadline = time.perf_counter() + settings.SCHEDULE_OPTIMIZER_BUDGET
+        for planned, (campaign_id, campaign_pins) in enumerate(by_campaign.items()):
+            campaign = campaign_pins[0].headline.pillar.campaign
+            schedule_by_day = defaultdict(list)
+            time_budget = max(budget_deadline - time.perf_counter(), 0) / (len(by_campaign) - planned)
+
+            # ✅ Each pin 5×, 6-day spaced, once per board; the optimiser picks each
+            # pin's start day and board rotation to even out pillars/boards per day.
+            placements, plan = optimize_schedule(
+                [pin.headline.pillar_id for pin in campaign_pins],
+                days=days,
+                repeats=repeats_per_pin,
+                spacing=spacing,
+                boards=len(boards),
+                time_budget=time_budget,
+                # Same pins → same plan, so re-running SmartLoop leaves an empty diff.
+                seed=campaign_id,
+            )
+            logger.info("SmartLoop optimiser (%s): %s", campaign, plan)
+
+            for pin, slots in zip(campaign_pins, placements):
+                for day_index, board_index in slots:
+                    pub_date = start + timedelta(days=day_index)
+                    schedule_by_day[pub_date].append((pin, boards[board_index]))
+                    pillar_diagnostics[pub_date][pin.headline.pillar.name] += 1
+            plans[campaign_id] = schedule_by_day
+
+            # 4. Validate spacing, board repeats, daily load and pillar/board mix
+            report = check_schedule(schedule_arrays(
+                (pub_date, board.id, pin.id, pin.headline.pillar_id)
+                for pub_date, items in schedule_by_day.items()
+                for pin, board in items
+            ))
+            self.message_user(request, f"SmartLoop {campaign}: {summarize(report)}", level=messages.SUCCESS if report['ok'] else messages.WARNING)
+            self.message_user(
+                request,
+                f"📐 {campaign}: mix score {plan['score']} (unoptimised ≈ {plan['baseline_score']}, lower is better) "
+                f"in {plan['elapsed_s']}s{'' if plan['converged'] else ' — time budget reached'}",
+                level=messages.INFO,
+            )
 
         # 5. Generate CSV preview
         csv_buffer = io.StringIO()
         csv_writer = csv.writer(csv_buffer)
-        csv_writer.writerow(['publish_date','campaign_day','slot_number','pin_id','pillar','board_id'])
-        for pub_date, items in sorted(schedule_by_day.items()):
-            campaign_day = (pub_date - start).days + 1
-            for slot_num, (pin, board) in enumerate(items, start=1):
-                csv_writer.writerow([
-                    pub_date.isoformat(),
-                    campaign_day,
-                    slot_num,
-                    pin.id,
-                    pin.headline.pillar.name,
-                    board.id
-                ])
+        csv_writer.writerow(['publish_date','campaign_day','slot_number','pin_id','pillar','board_id','campaign_id'])
+        for campaign_id, schedule_by_day in plans.items():
+            for pub_date, items in sorted(schedule_by_day.items()):
+                campaign_day = (pub_date - start).days + 1
+                for slot_num, (pin, board) in enumerate(items, start=1):
+                    csv_writer.writerow([
+                        pub_date.isoformat(),
+                        campaign_day,
+                        slot_num,
+                        pin.id,
+                        pin.headline.pillar.name,
+                        board.id,
+                        campaign_id,
+                    ])
         # Write file for download or storage
         with open('/tmp/pins_schedule.csv','w', newline='') as f:
             f.write(csv_buffer.getvalue())
@@ -594,56 +690,43 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
             )
             return
 
-        # 7. Actual DB write (or preview mode)
-        with transaction.atomic():
-            # clear existing for the month
-            ScheduledPin.objects.filter(
-                publish_date__range=(start, start+timedelta(days=29))
-            ).delete()
+        # 7. Stage for review (preview) or write. Either way each campaign is handled
+        # under its own lock, so other campaigns (and workers scheduling them) are untouched.
+        staged_url = reverse('admin:pinterest_scheduler_stagedscheduledpin_changelist')
+        for campaign_id, schedule_by_day in plans.items():
+            rows = planned_rows(schedule_by_day, start)
+            if not rows:
+                self.message_user(request, f"⚠️ Campaign {campaign_id}: nothing to schedule.", level=messages.WARNING)
+                continue
             if preview:
-                # bulk-create in SmartLoopPreview for admin UI
-                preview_objs = []
-                for pub_date, items in schedule_by_day.items():
-                    campaign_day = (pub_date - start).days + 1
-                    for slot_num, (pin, board) in enumerate(items, start=1):
-                        preview_objs.append(
-                            SmartLoopPreview(
-                                pin=pin,
-                                board=board,
-                                publish_date=pub_date,
-                                campaign_day=campaign_day,
-                                slot_number=slot_num,
-                            )
-                        )
-                SmartLoopPreview.objects.bulk_create(preview_objs)
-                self.message_user(
-                    request,
-                    f"✅ Preview created ({len(preview_objs)} entries). Check SmartLoopPreview in admin.",
-                    level=messages.SUCCESS
-                )
-            else:
-                # real scheduling
-                for pub_date, items in schedule_by_day.items():
-                    campaign_day = (pub_date - start).days + 1
-                    for slot_num, (pin, board) in enumerate(items, start=1):
-                        ScheduledPin.objects.create(
-                            pin=pin,
-                            board=board,
-                            publish_date=pub_date,
-                            campaign_day=campaign_day,
-                            slot_number=slot_num,
-                            status='scheduled'
-                        )
-                self.message_user(
-                    request,
-                    f"✅ {total_slots} pins scheduled: ≈{pins_per_day}/day, 6-day spacing, 5× per pin, CSV backup at /tmp/pins_schedule.csv",
-                    level=messages.SUCCESS
-                )
+                stage_schedule(campaign_id, rows, start, days=days)
+                self.message_user(request, format_html(
+                    '📝 Campaign {}: {} pins staged — {} against the live schedule. '
+                    '<a href="{}?campaign__id__exact={}">Review and promote</a>',
+                    campaign_id, len(rows), summarize_diff(diff_staged(campaign_id)), staged_url, campaign_id,
+                ), level=messages.SUCCESS)
+                continue
+
+            try:
+                diff = apply_schedule(campaign_id, rows, start, days=days, nowait=True)
+            except CampaignLocked as e:
+                self.message_user(request, f"⏳ {e}; try again once it finishes.", level=messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"✅ Campaign {campaign_id}: {len(rows)} pins scheduled (≈{len(rows) // days}/day, 6-day spacing, "
+                f"5× per pin) — {summarize_diff(diff)}. CSV backup at /tmp/pins_schedule.csv",
+                level=messages.SUCCESS
+            )
+
+    @admin.action(description="📝 SmartLoop: Stage a 30-day schedule for review")
+    def smartloop_stage(self, request, queryset):
+        return self.smartloop_schedule(request, queryset, preview=True)
         
     auto_assign_keywords.short_description = "🎯 Smart Assign Keywords (Balanced + Unique)"
 
     def _platform_status(self, obj, platform):
-        return "✅" if obj.repurposed_statuses.filter(platform=platform).exists() else "⛔"
+        return "✅" if getattr(obj, f'repurposed_{platform}') else "⛔"
 
     @admin.display(description="TikTok")
     def repurpose_tiktok(self, obj):
@@ -674,63 +757,21 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         self._mark_repurposed(request, queryset, 'all')
 
     def _mark_repurposed(self, request, queryset, platform):
-        from pinterest_scheduler.models import RepurposedPostStatus
-
         if not queryset.exists():
             selected_ids = request.POST.getlist('_selected_action')
             queryset = PinTemplateVariation.objects.filter(pk__in=selected_ids)
 
-        added = 0
         platforms = ['tiktok', 'instagram', 'youtube'] if platform == 'all' else [platform]
-
-        for variation in queryset:
-            for p in platforms:
-                if not RepurposedPostStatus.objects.filter(variation=variation, platform=p).exists():
-                    RepurposedPostStatus.objects.create(
-                        variation=variation,
-                        platform=p,
-                        campaign=variation.headline.pillar.campaign
-                    )
-                    added += 1
+        added = mark_repurposed(queryset, platforms)
 
         self.message_user(
             request,
-            f"✅ Marked as repurposed to {', '.join(platforms)} ({queryset.count()} pins × {len(platforms)} platforms)",
+            f"✅ Marked as repurposed to {', '.join(platforms)} ({queryset.count()} pins × {len(platforms)} platforms, {added} new)",
             level=messages.SUCCESS
         )
 
     def _looks_like_real_hook(self, text: str) -> bool:
-        """Heuristic: distinguish a real AI hook from placeholders/labels.
-
-        We treat short labels like "profit/loss question" or "origin of the dish" as NOT a hook.
-        """
-        t = (text or "").strip()
-        if not t:
-            return False
-
-        low = t.lower()
-        # Common placeholder labels / buckets that have shown up in DB
-        banned = {
-            "profit/loss question",
-            "industry stat trivia",
-            "origin of the dish",
-            "ingredient origin or source quiz",
-            "tool-for-task quiz",
-            "hack-or-myth challenge",
-            "flavour pair challenge",
-        }
-        if low in banned:
-            return False
-
-        # Too short to be a hook
-        if len(t) < 18:
-            return False
-
-        # Hooks usually read like a sentence / question
-        if not any(ch in t for ch in ["?", "!", "."]):
-            return False
-
-        return True
+        return looks_like_real_hook(text)
 
     def random_repurpose_view(self, request):
         from pinterest_scheduler.models import RepurposedPostStatus
@@ -745,7 +786,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         # ---------------------------
         # CSV export for the *current* Daily 4 picks
         # - supports exporting by explicit ids: ?export=1&ids=1,2,3,4
-        # - or exporting the persisted session Daily 4: ?export=1
+        # - or exporting the stored Daily 4 (DailyRepurposePick): ?export=1
         #
         # IMPORTANT:
         # - Must be FAST (no hook generation, no random selection)
@@ -759,15 +800,25 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                 if part.isdigit():
                     ids.append(int(part))
 
-            # If ids not provided, fall back to the persisted "today's 4" in session
             today_key = now().date().isoformat()
-            session_key = f"daily4:{campaign_id}:{today_key}"
-            if not ids:
-                ids = request.session.get(session_key) or []
-
             logger.info("repurpose_random EXPORT start campaign=%s ids=%s", campaign_id, ids)
 
-            if not ids:
+            if ids:
+                # Fetch pins (small set) and preserve the requested order
+                export_qs = (
+                    PinTemplateVariation.objects
+                    .filter(id__in=ids, headline__pillar__campaign_id=campaign_id)
+                    .select_related("headline__pillar", "headline__pillar__campaign")
+                    .prefetch_related("keywords")
+                )
+                by_id = {p.id: p for p in export_qs}
+                ordered = [by_id[i] for i in ids if i in by_id]
+            else:
+                # If ids not provided, fall back to the stored "today's 4"
+                ordered = get_daily_picks(campaign_id, now().date())
+                prefetch_related_objects(ordered, "keywords")
+
+            if not ordered:
                 self.message_user(
                     request,
                     "⚠️ No Daily 4 saved for today yet. Refresh the page once, then export.",
@@ -775,16 +826,6 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                 )
                 return redirect(request.get_full_path().split("?")[0] + f"?campaign={campaign_id}")
 
-            # Fetch pins (small set) and preserve the requested order
-            export_qs = (
-                PinTemplateVariation.objects
-                .filter(id__in=ids, headline__pillar__campaign_id=campaign_id)
-                .select_related("headline__pillar", "headline__pillar__campaign")
-                .prefetch_related("keywords")
-            )
-            by_id = {p.id: p for p in export_qs}
-            ordered = [by_id[i] for i in ids if i in by_id]
-
             csv_buffer = io.StringIO()
             writer = csv.writer(csv_buffer)
             writer.writerow([
@@ -824,94 +865,29 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
             logger.info("repurpose_random EXPORT ok rows=%s", len(ordered))
             return resp
 
-        # GET mode: Select 4 random pins not fully repurposed
-        qs = PinTemplateVariation.objects.annotate(
-            repurposed_count=Count('repurposed_statuses')
-        ).filter(
-            headline__pillar__campaign_id=campaign_id,
-            repurposed_count__lt=3
-        ).select_related('headline__pillar')
-
-        # Persist "today's 4" so POST/redirect doesn't reshuffle.
-        today_key_daily4 = now().date().isoformat()
-        session_key_daily4 = f"daily4:{campaign_id}:{today_key_daily4}"
-        saved_ids = request.session.get(session_key_daily4) or []
-
-        selected = []
-        if saved_ids:
-            selected = list(qs.filter(id__in=saved_ids))
-            # Preserve the original order
-            selected_by_id = {p.id: p for p in selected}
-            selected = [selected_by_id[i] for i in saved_ids if i in selected_by_id]
-
-        # If no saved set, pick fresh 4 with unique pillar + headline
-        if len(selected) < 4:
-            pins = list(qs)
-            random.shuffle(pins)
-
-            used_pillars = set()
-            used_headlines = set()
-            picked = []
-
-            for pin in pins:
-                pillar_id = pin.headline.pillar_id
-                headline_id = pin.headline_id
-
-                if pillar_id in used_pillars or headline_id in used_headlines:
-                    continue
-
-                picked.append(pin)
-                used_pillars.add(pillar_id)
-                used_headlines.add(headline_id)
-
-                if len(picked) == 4:
-                    break
-
-            selected = picked
-            request.session[session_key_daily4] = [p.id for p in selected]
-
-        if len(selected) < 4:
-            self.message_user(request, f"⚠️ Only {len(selected)} eligible unique variations found.", level=messages.WARNING)
+        # Today's 4 are precomputed nightly (manage.py precompute_daily_picks) and stored
+        # in DailyRepurposePick, so this is a single indexed read. If the job hasn't run
+        # yet, or picks have been repurposed everywhere since, pick + store now so
+        # POST/redirect doesn't reshuffle.
+        today = now().date()
+        selected = get_daily_picks(campaign_id, today)
+        if len(selected) < DAILY_PICK_COUNT:
+            campaign = Campaign.objects.filter(pk=campaign_id).first()
+            if campaign is None:
+                self.message_user(request, f"❌ Campaign {campaign_id} not found.", level=messages.ERROR)
+                return redirect("..")
+            selected, _hooks = precompute_daily_picks(campaign, today, generate_hooks=False)
 
-        # ✅ Auto-generate missing hooks for today's 4 (GET)
-        # Keeps your workflow fast: open the page and hooks are ready.
-        try:
-            logger.info("repurpose_random GET auto-gen start selected=%s", len(selected))
-            recent_hooks = list(
-                PinTemplateVariation.objects.exclude(repurpose_hook__isnull=True)
-                .exclude(repurpose_hook='')
-                .order_by('-repurpose_hook_generated_at')
-                .values_list('repurpose_hook', flat=True)[:20]
-            )
+        # The cards show keywords and per-platform status for each pick.
+        prefetch_related_objects(selected, "keywords", "repurposed_statuses")
 
-            auto_updated = 0
-            for p in selected:
-                logger.info("repurpose_random GET auto-gen check pin=%s", getattr(p, "id", None))
-                current = (getattr(p, 'repurpose_hook', '') or '').strip()
-                if current and self._looks_like_real_hook(current):
-                    logger.info("repurpose_random GET auto-gen skip pin=%s (already real hook)", getattr(p, "id", None))
-                    recent_hooks.append(current)
-                    continue
-
-                hook = (self._generate_hook(p, recent_hooks=recent_hooks, max_chars=50) or "").strip()
-                if not hook:
-                    logger.error("repurpose_random GET auto-gen failed pin=%s (empty hook)", getattr(p, "id", None))
-                    # Don't save junk / placeholders. Leave it empty so UI shows "No hook yet".
-                    continue
-
-                if hasattr(p, 'repurpose_hook'):
-                    p.repurpose_hook = hook
-                if hasattr(p, 'repurpose_hook_generated_at'):
-                    p.repurpose_hook_generated_at = now()
-
-                p.save(update_fields=['repurpose_hook', 'repurpose_hook_generated_at'])
-                # Ensure the object used by the template has the new values
-                p.repurpose_hook = hook
-                p.repurpose_hook_generated_at = now()
-                logger.info("repurpose_random GET auto-gen saved pin=%s hook_len=%s", getattr(p, "id", None), len(hook))
-                recent_hooks.append(hook)
-                auto_updated += 1
+        if len(selected) < DAILY_PICK_COUNT:
+            self.message_user(request, f"⚠️ Only {len(selected)} eligible unique variations found.", level=messages.WARNING)
 
+        # ✅ Auto-generate any hooks the nightly job didn't manage to fill (GET).
+        # No-op (and no queries) when every pick already has a real hook.
+        try:
+            auto_updated = fill_missing_hooks(selected)
             if auto_updated:
                 self.message_user(request, f"✅ Auto-generated {auto_updated} hooks for today.", level=messages.SUCCESS)
         except Exception as e:
@@ -922,15 +898,8 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
         # - mark repurposed (existing)
         # - generate hooks (new)
         if request.method == "POST":
-            logger.info("repurpose_random POST path=%s", request.path)
-            logger.info("repurpose_random POST keys=%s", list(request.POST.keys()))
-            logger.info("repurpose_random POST action=%s", request.POST.get("action"))
-            logger.info("repurpose_random POST generate_hooks=%s", request.POST.get("generate_hooks"))
-            logger.info("repurpose_random POST regenerate=%s", request.POST.get("regenerate"))
-            logger.info("repurpose_random POST force=%s", request.POST.get("force"))
-            logger.info("repurpose_random POST single_id=%s", request.POST.get("single_id"))
             selected_ids = request.POST.getlist("_selected_action")
-            logger.info("repurpose_random selected_ids=%s", selected_ids)
+            logger.debug("repurpose_random POST path=%s keys=%s", request.path, list(request.POST.keys()))
 
             # Action detection (works even if template isn't updated)
             action = (request.POST.get("action") or "").strip()
@@ -940,10 +909,12 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                     action = "generate_hooks"
                 else:
                     action = "mark_repurposed"
-            logger.info("repurpose_random resolved action=%s", action)
 
             force = request.POST.get("force") == "1" or request.POST.get("regenerate") == "1"
-            logger.info("repurpose_random force=%s", force)
+            logger.info(
+                "repurpose_random POST action=%s force=%s single_id=%s selected_ids=%s",
+                action, force, request.POST.get("single_id"), selected_ids,
+            )
 
             if action == "generate_hooks":
                 # If user ticked checkboxes, use those; otherwise generate for today's 4.
@@ -969,7 +940,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                         .select_related("headline__pillar", "headline__pillar__campaign")
                     )
 
-                logger.info("repurpose_random generate_hooks queryset_count=%s", queryset.count())
+                logger.debug("repurpose_random generate_hooks pins=%s", len(queryset))
 
                 # Pull recent hooks to avoid repeats
                 recent_hooks = list(
@@ -983,10 +954,10 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                 updated, skipped, failed = 0, 0, 0
 
                 for pin in queryset:
-                    logger.info("repurpose_random gen pin=%s", getattr(pin, "id", None))
+                    logger.debug("repurpose_random gen pin=%s", getattr(pin, "id", None))
                     current = (getattr(pin, "repurpose_hook", "") or "").strip()
                     if current and self._looks_like_real_hook(current) and not force:
-                        logger.info("repurpose_random skip pin=%s (already has real hook)", getattr(pin, "id", None))
+                        logger.debug("repurpose_random skip pin=%s (already has real hook)", getattr(pin, "id", None))
                         skipped += 1
                         continue
 
@@ -1005,7 +976,7 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                     pin.repurpose_hook = hook
                     pin.repurpose_hook_generated_at = now()
                     pin.save(update_fields=["repurpose_hook", "repurpose_hook_generated_at"])
-                    logger.info("repurpose_random saved pin=%s hook_len=%s", getattr(pin, "id", None), len(hook))
+                    logger.debug("repurpose_random saved pin=%s hook_len=%s", getattr(pin, "id", None), len(hook))
 
                     recent_hooks.append(hook)
                     updated += 1
@@ -1028,20 +999,27 @@ class PinTemplateVariationAdmin(admin.ModelAdmin):
                 self.message_user(request, f"✅ {len(selected_ids)} pins marked as repurposed to {platform.title()}")
                 return redirect(request.get_full_path())  # refresh the page
 
-        today_key_daily4 = now().date().isoformat()
-        session_key_daily4 = f"daily4:{campaign_id}:{today_key_daily4}"
         context = {
             'title': "🎯 Daily 4 Repurpose Picks (Unique Pillars & Headlines)",
             'pins': selected,
             'platform': platform,
             'opts': self.model._meta,
-            # Export the current Daily 4 (uses session ids server-side)
+            # Export the current Daily 4 (uses the stored picks server-side)
             'export_url': f"?campaign={campaign_id}&platform={platform}&export=1",
         }
         return TemplateResponse(request, "admin/repurpose_random_list.html", context)
 
 
 
+@admin.register(DailyRepurposePick)
+class DailyRepurposePickAdmin(LabelledChoicesMixin, admin.ModelAdmin):
+    list_display = ['pick_date', 'campaign', 'position', 'variation', 'created_at']
+    list_filter = ['campaign', 'pick_date']
+    list_select_related = ['campaign', 'variation__headline']
+    autocomplete_fields = ['variation']
+    ordering = ['-pick_date', 'campaign', 'position']
+
+
 # ----------------------
 # BOARD ADMIN
 # ----------------------
@@ -1053,20 +1031,62 @@ class BoardAdmin(admin.ModelAdmin):
 # SCHEDULED PIN ADMIN (with export + mark posted actions)
 # ----------------------
 @admin.register(ScheduledPin)
-class ScheduledPinAdmin(admin.ModelAdmin):
+class ScheduledPinAdmin(LabelledChoicesMixin, admin.ModelAdmin):
     change_list_template = "admin/scheduled_pins_changelist.html"
-    list_display = ['pin', 'board', 'campaign', 'publish_date', 'campaign_day', 'slot_number', 'status']
+    list_display = ['pin', 'board', 'campaign', 'publish_date', 'publish_at', 'campaign_day', 'slot_number', 'status']
     list_filter = ['campaign', 'board', 'publish_date', 'status']
-    list_select_related = ['campaign', 'pin', 'board']
-    actions = ['mark_as_posted']
+    list_select_related = ['campaign', 'pin__headline', 'board']
+    # Pins are picked through PinTemplateVariationAdmin's search, 20 per page.
+    form = ScheduledPinForm
+    autocomplete_fields = ['pin']
+    actions = ['mark_as_posted', 'requeue_exported']
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path("export-today/", self.admin_site.admin_view(self.export_today_csv), name="export_today_csv"),
+            path("preview/", self.admin_site.admin_view(self.schedule_preview), name="schedule_preview"),
         ]
         return custom_urls + urls
 
+    def schedule_preview(self, request):
+        """The day's schedule as a paginated table (one query per page, no session messages).
+
+        Read-only: pins not given a time yet are listed as unallocated; they
+        get one when the day is exported or allocated.
+        """
+        try:
+            target_date = get_target_date(request)
+        except ValueError:
+            self.message_user(request, "❌ Invalid date format. Use YYYY-MM-DD.", level=messages.ERROR)
+            return redirect("..")
+
+        per_page = request.GET.get("per_page", "")
+        per_page = min(int(per_page), 500) if per_page.isdigit() and int(per_page) else PREVIEW_PAGE_SIZE
+        paginator = Paginator(get_filtered_pins(request, target_date), per_page)
+        page = paginator.get_page(request.GET.get("page"))
+
+        filters = request.GET.copy()
+        filters.pop("page", None)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f"🧪 Schedule preview for {target_date}",
+            'opts': self.model._meta,
+            'target_date': target_date,
+            'page_obj': page,
+            'boards': cached_boards(),
+            'campaigns': cached_value(
+                'campaign_filter_lookups',
+                [Campaign],
+                lambda: list(Campaign.objects.values_list('id', 'name')),
+            ),
+            'selected_board': request.GET.get("board", ""),
+            'selected_campaign': request.GET.get("campaign", ""),
+            'filter_query': filters.urlencode(),
+        }
+        return TemplateResponse(request, "admin/schedule_preview.html", context)
+
     def export_today_csv(self, request):
         target_date = request.GET.get("date")
         dry_run = request.GET.get("dry_run") == "1"
@@ -1084,28 +1104,38 @@ class ScheduledPinAdmin(admin.ModelAdmin):
 
         queryset = ScheduledPin.objects.filter(publish_date=target_date).select_related(
             'pin__headline__pillar', 'board', 'campaign'
-        )
+        ).order_by('publish_at', 'id')
 
         if board_slug:
             queryset = queryset.filter(board__slug=board_slug)
         if campaign_id:
             queryset = queryset.filter(campaign_id=campaign_id)
+        # Only what hasn't gone out yet; ?all=1 re-exports the whole day.
+        reexport = request.GET.get("all") == "1"
+        statuses = ('scheduled', 'exported') if reexport else ('scheduled',)
 
-        if not queryset.exists():
+        if not queryset.filter(status__in=statuses).exists():
             self.message_user(request, f"⚠️ No scheduled pins found for {target_date}.", level=messages.WARNING)
             return HttpResponse(status=204)
 
         if dry_run:
-            for pin in queryset:
-                title = pin.pin.title or pin.pin.headline.text
-                self.message_user(
-                    request,
-                    f"{pin.publish_date} | {pin.board.name} | {title}",
-                    level=messages.INFO
-                )
-            self.message_user(request, f"✅ Dry run complete for {target_date}.", level=messages.SUCCESS)
-            return HttpResponse("Dry run complete")
+            params = {'date': target_date.isoformat()}
+            if board_slug:
+                params['board'] = board_slug
+            if campaign_id:
+                params['campaign'] = campaign_id
+            return redirect(f"{reverse('admin:schedule_preview')}?{urlencode(params)}")
+
+        ensure_allocated([target_date])
+        with transaction.atomic():
+            # Claim first, then write only what this export claimed (rolled back if it fails).
+            queryset = claim_export(queryset, reexport, source='admin-export')
+            response = self._export_response(request, queryset, target_date, include_zip)
+            if response.status_code >= 400:
+                transaction.set_rollback(True)
+        return response
 
+    def _export_response(self, request, queryset, target_date, include_zip):
         # Build CSV
         csv_buffer = io.StringIO()
         writer = csv.writer(csv_buffer)
@@ -1154,9 +1184,89 @@ class ScheduledPinAdmin(admin.ModelAdmin):
 
         return response
 
+    def save_model(self, request, obj, form, change):
+        # A pin moved to another day needs a slot there, unless a time was entered too.
+        if change and 'publish_date' in form.changed_data and 'publish_at' not in form.changed_data:
+            obj.publish_at = None
+        super().save_model(request, obj, form, change)
+        if not obj.publish_at:
+            allocate_days([obj.publish_date], pin_ids=[obj.pk])
+
     @admin.action(description="✅ Mark selected pins as posted")
     def mark_as_posted(self, request, queryset):
-        queryset.update(status='posted')
+        moved = mark_posted(queryset, source='admin')
+        self.message_user(request, f"✅ {moved} pins marked as posted.", level=messages.SUCCESS)
+
+    @admin.action(description="↩️ Re-queue exported / stuck publishing pins (→ scheduled)")
+    def requeue_exported(self, request, queryset):
+        moved = transition(queryset, 'scheduled', source='admin-requeue')
+        self.message_user(request, f"↩️ {moved} pins back in the queue.", level=messages.SUCCESS)
+
+@admin.register(ScheduledPinLog)
+class ScheduledPinLogAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'scheduled_pin_id', 'from_status', 'to_status', 'source', 'batch']
+    list_filter = ['to_status', 'source']
+    search_fields = ['=scheduled_pin__id', '=batch']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+# ----------------------
+# STAGED SCHEDULE ADMIN (review SmartLoop output, then promote the diff)
+# ----------------------
+# Another user may promote or discard the same staged schedule first.
+STAGED_GONE = "nothing staged any more (already promoted or discarded)."
+
+
+@admin.register(StagedScheduledPin)
+class StagedScheduledPinAdmin(admin.ModelAdmin):
+    list_display = ['pin', 'board', 'campaign', 'publish_date', 'campaign_day', 'slot_number', 'created_at']
+    list_filter = ['campaign', 'board', 'publish_date']
+    list_select_related = ['campaign', 'pin__headline', 'board']
+    actions = ['show_diff', 'promote', 'discard']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def _campaigns(self, queryset):
+        # Actions work on whole staged schedules: every campaign with a selected row.
+        return Campaign.objects.filter(pk__in=queryset.values('campaign_id')).only('id', 'name')
+
+    @admin.action(description="🔍 Diff against the live schedule")
+    def show_diff(self, request, queryset):
+        for campaign in self._campaigns(queryset):
+            diff = diff_staged(campaign.id)
+            if diff is None:
+                self.message_user(request, f"⚠️ {campaign.name}: {STAGED_GONE}", level=messages.WARNING)
+                continue
+            self.message_user(request, f"{campaign.name}: {summarize_diff(diff)}", level=messages.INFO)
+
+    @admin.action(description="🚀 Promote staged schedule (apply the diff)")
+    def promote(self, request, queryset):
+        for campaign in self._campaigns(queryset):
+            try:
+                diff = promote_staged(campaign.id, nowait=True)
+            except CampaignLocked as e:
+                self.message_user(request, f"⏳ {e}; try again once it finishes.", level=messages.ERROR)
+                continue
+            if diff is None:
+                self.message_user(request, f"⚠️ {campaign.name}: {STAGED_GONE}", level=messages.WARNING)
+                continue
+            self.message_user(request, f"✅ {campaign.name} promoted: {summarize_diff(diff)}", level=messages.SUCCESS)
+
+    @admin.action(description="🗑️ Discard staged schedule")
+    def discard(self, request, queryset):
+        for campaign in self._campaigns(queryset):
+            self.message_user(request, f"🗑️ {campaign.name}: {discard_staged(campaign.id)} staged pins discarded.")
 
 class PillarInline(admin.TabularInline):
     model = Pillar
@@ -1169,6 +1279,14 @@ class CampaignAdmin(admin.ModelAdmin):
     inlines = [PillarInline]
     search_fields = ['name']
     ordering = ['start_date']
+    actions = ['check_schedule_constraints']
+
+    @admin.action(description="🩺 Check schedule constraints")
+    def check_schedule_constraints(self, request, queryset):
+        for campaign in queryset:
+            report = check_schedule(load_schedule(campaign.id))
+            level = messages.SUCCESS if report['ok'] else messages.WARNING
+            self.message_user(request, f"{campaign.name}: {summarize(report)}", level=level)
 
     def get_urls(self):
         urls = super().get_urls()
@@ -1199,12 +1317,9 @@ class CampaignAdmin(admin.ModelAdmin):
         return redirect(f"/admin/pinterest_scheduler/pintemplatevariation/repurpose/random/?campaign={campaign_id}")
 
     def repurpose_summary(self, obj):
-        total = obj.pillars.prefetch_related('headlines__variations').aggregate(
-            count=Count('headlines__variations')
-        )['count'] or 0
-
-        repurposed = RepurposedPostStatus.objects.filter(campaign=obj).values('variation').distinct().count()
-        percent = int((repurposed / (total * 3)) * 100) if total > 0 else 0
+        total = obj.variation_count
+        repurposed = obj.repurpose_count
+        percent = min(int((repurposed / (total * 3)) * 100), 100) if total > 0 else 0
 
         color = "green" if percent == 100 else "orange" if percent >= 50 else "red"
         return mark_safe(f'<b style="color:{color}">{percent}% repurposed</b>')
@@ -1258,9 +1373,15 @@ class KeywordAdmin(admin.ModelAdmin):
         except Exception:
             return 0.0
         
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            used_in_pins_count=Count('pin_variations', distinct=True)
+        )
+
     def used_in_pins(self, obj):
-        return obj.pin_variations.count()
+        return obj.used_in_pins_count
     used_in_pins.short_description = 'Used In Pins'
+    used_in_pins.admin_order_field = 'used_in_pins_count'
 
     def process_csv_upload(self, request):
         if request.method == 'POST':
@@ -1341,49 +1462,65 @@ def get_filtered_pins(request, target_date):
 
     queryset = ScheduledPin.objects.filter(
         publish_date=target_date
-    ).select_related('pin__headline__pillar', 'board', 'campaign')
+    ).select_related('pin__headline__pillar', 'board', 'campaign').order_by('publish_at', 'id')
 
     if board_slug:
         queryset = queryset.filter(board__slug=urlunquote(board_slug))
 
     if campaign_slug:
-        queryset = queryset.filter(campaign__name__iexact=urlunquote(campaign_slug))
+        if campaign_slug.isdigit():
+            queryset = queryset.filter(campaign_id=campaign_slug)
+        else:
+            queryset = queryset.filter(campaign__name__iexact=urlunquote(campaign_slug))
 
     return queryset
 
-@admin.site.admin_view
-def export_today_csv(request):
+
+def claim_export(pins, reexport=False, source='admin-export'):
+    """Move the 'scheduled' pins among ``pins`` to 'exported' and return the ones to write.
+
+    The guarded UPDATE runs before anything is written, and only the pins it
+    moved are returned (plus, with ``reexport``, those already exported), so a
+    pin a publisher claimed in the meantime is never in the file as well.
+    Posted and 'publishing' pins are never returned. Run it in the transaction
+    that builds the file, so a failed export leaves the pins scheduled.
+    """
+    written = Q(id__in=claim_for_export(pins.filter(status='scheduled'), source=source))
+    if reexport:
+        written |= Q(status='exported')
+    return pins.filter(written)
+
+
+def claim_export_pins(request, target_date, source='admin-export'):
+    """``claim_export`` over the day's filtered pins; ``?all=1`` re-exports the already exported ones too."""
+    return claim_export(get_filtered_pins(request, target_date), request.GET.get("all") == "1", source=source)
+
+
+def get_target_date(request):
     date_str = request.GET.get("date")
-    interval_minutes = int(request.GET.get("interval", 60))  # default 1 hour
-    start_str = request.GET.get("start")
-    allow_all_hours = request.GET.get("all_hours") == "1"
+    return datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else now().date()
 
-    # Parse target date
-    target_date = datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else now().date()
-    current_time = localtime(now())
 
-    # Determine staggered start time
-    if start_str:
-        try:
-            hour, minute = map(int, start_str.split(":"))
-            start_time = datetime.combine(target_date, datetime.min.time()).replace(hour=hour, minute=minute)
-            start_time = make_aware(start_time)
-            start_time = localtime(start_time)
-        except ValueError:
-            messages.warning(request, "⚠️ Invalid start time format. Use HH:MM.")
-            return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
-    else:
-        start_time = current_time.replace(hour=current_time.hour, minute=0, second=0, microsecond=0)
+def format_publish_time(pin, fmt=None):
+    if not pin.publish_at:
+        return ""
+    moment = localtime(pin.publish_at)
+    return moment.strftime(fmt) if fmt else moment.isoformat()
 
-    # Ensure timezone-aware start_time
-    start_time = localtime(start_time)
 
-    # Smart gap window (9:00–21:00)
-    smart_start = start_time.replace(hour=9, minute=0)
-    smart_end = start_time.replace(hour=21, minute=0)
+# Publish times are allocated and stored on ScheduledPin.publish_at (services.slots),
+# so the exports below only read them; days scheduled before that get allocated on first export.
+# Each export view runs in one transaction: pins are claimed ('exported') before
+# the file is built, and an error while building it rolls the claim back.
 
-    pins = get_filtered_pins(request, target_date)
-    if not pins.exists():
+@admin.site.admin_view
+@transaction.atomic
+def export_today_csv(request):
+    target_date = get_target_date(request)
+    ensure_allocated([target_date])
+
+    pins = list(claim_export_pins(request, target_date).prefetch_related('pin__keywords'))
+    if not pins:
         messages.warning(request, f"⚠️ No scheduled pins found for {target_date}")
         return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
 
@@ -1403,17 +1540,7 @@ def export_today_csv(request):
         "Keywords"
     ])
 
-
-    for i, pin in enumerate(pins):
-        publish_time = start_time + timedelta(minutes=i * interval_minutes)
-
-        if not allow_all_hours:
-            if publish_time.time() < smart_start.time():
-                continue
-            if publish_time.time() > smart_end.time():
-                messages.warning(request, f"⛔ Export stopped at {publish_time.strftime('%H:%M')} – exceeds 21:00")
-                break
-
+    for pin in pins:
         hook = (getattr(pin.pin, 'repurpose_hook', '') or '').strip()
 
         title = (pin.pin.title or '')[:100]
@@ -1425,73 +1552,27 @@ def export_today_csv(request):
             "",  # Thumbnail
             pin.pin.description or "",
             pin.pin.link or "",
-            publish_time.isoformat(),
+            format_publish_time(pin),
             ", ".join([kw.phrase for kw in pin.pin.keywords.all()])
         ])
 
-
     return response
 
 
 @admin.site.admin_view
 def dry_run_preview(request):
-    date_str = request.GET.get("date")
-    interval_minutes = int(request.GET.get("interval", 60))
-    start_str = request.GET.get("start")
-    allow_all_hours = request.GET.get("all_hours") == "1"
-
-    target_date = datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else now().date()
-    current_time = localtime(now())
-
-    if start_str:
-        try:
-            hour, minute = map(int, start_str.split(":"))
-            start_time = datetime.combine(target_date, datetime.min.time()).replace(hour=hour, minute=minute)
-            start_time = make_aware(start_time)
-            start_time = localtime(start_time)
-        except ValueError:
-            messages.warning(request, "⚠️ Invalid start time format. Use HH:MM.")
-            return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
-    else:
-        start_time = current_time.replace(hour=current_time.hour, minute=0, second=0, microsecond=0)
-
-    # Make timezone-aware
-    start_time = localtime(start_time)
-
-    # Smart hours: 09:00–21:00
-    smart_start = start_time.replace(hour=9, minute=0)
-    smart_end = start_time.replace(hour=21, minute=0)
-
-    pins = get_filtered_pins(request, target_date)
-    if not pins.exists():
-        messages.warning(request, f"⚠️ No scheduled pins found for {target_date}")
-        return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
-
-    messages.info(request, f"📅 Dry run for {target_date} | {pins.count()} pins")
-
-    for i, pin in enumerate(pins):
-        publish_time = start_time + timedelta(minutes=i * interval_minutes)
-
-        if not allow_all_hours:
-            if publish_time.time() < smart_start.time():
-                continue
-            if publish_time.time() > smart_end.time():
-                messages.warning(request, f"⛔ Preview stopped at {publish_time.strftime('%H:%M')} – exceeds 21:00")
-                break
-
-        title = pin.pin.title or pin.pin.headline.text[:60]
-        messages.info(request, f"🕒 {publish_time.strftime('%H:%M')} | {pin.board.name} | {title}")
-
-    return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
+    # Kept for old links; the preview is a paginated page now rather than one message per pin.
+    return redirect(f"{reverse('admin:schedule_preview')}?{request.GET.urlencode()}")
 
 @admin.site.admin_view
+@transaction.atomic
 def bundle_export(request):
-    date_str = request.GET.get("date")
-    target_date = datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else now().date()
+    target_date = get_target_date(request)
+    ensure_allocated([target_date])
 
-    pins = get_filtered_pins(request, target_date)
+    pins = list(claim_export_pins(request, target_date, source='admin-bundle').prefetch_related('pin__keywords'))
 
-    if not pins.exists():
+    if not pins:
         messages.warning(request, f"No pins scheduled for {target_date}")
         return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
 
@@ -1519,7 +1600,7 @@ def bundle_export(request):
                 "",  # Only required for video
                 pin.pin.description or "",
                 pin.pin.link or "",
-                target_date.isoformat(),
+                format_publish_time(pin),
                 ", ".join([kw.phrase for kw in pin.pin.keywords.all()])
             ])
         zip_file.writestr("scheduled_pins.csv", csv_io.getvalue())
@@ -1535,31 +1616,22 @@ def bundle_export(request):
 
 @admin.site.admin_view
 def repurpose_summary_dashboard(request):
-    from pinterest_scheduler.models import Campaign, RepurposedPostStatus
-
-    platforms = ['tiktok', 'instagram', 'youtube']
-    rows = []
-
-    for campaign in Campaign.objects.all().order_by('start_date'):
-        total = PinTemplateVariation.objects.filter(
-            headline__pillar__campaign=campaign
-        ).count()
-
-        platform_counts = {}
-        for platform in platforms:
-            repurposed = RepurposedPostStatus.objects.filter(
-                campaign=campaign,
-                platform=platform
-            ).count()
-            platform_counts[platform] = repurposed
-
-        rows.append({
-            'campaign': campaign,
-            'total': total,
-            'platform_counts': platform_counts,
-        })
+    selected_campaign = request.GET.get('campaign')
+    rows = repurpose_rollup()
 
     return TemplateResponse(request, 'admin/repurpose_summary_dashboard.html', {
         'rows': rows,
-        'platforms': platforms,
-    })
\ No newline at end of file
+        'platforms': REPURPOSE_PLATFORMS,
+        'selected_campaign': int(selected_campaign) if (selected_campaign or '').isdigit() else None,
+    })
+
+
+@admin.site.admin_view
+def db_pool_stats(request):
+    """Connection acquire latency / reuse counts for the worker serving this request.
+
+    Also reports how many log records this worker has dropped on a full log queue.
+    """
+    stats = pool_stats()
+    stats['log_records_dropped'] = dropped_records()
+    return JsonResponse(stats)
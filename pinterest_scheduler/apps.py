@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PinterestSchedulerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pinterest_scheduler'
+
+    def ready(self):
+        from . import signals  # noqa: F401
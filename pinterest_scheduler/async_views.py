@@ -0,0 +1,207 @@
+import csv
+import io
+import logging
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import DatabaseError, transaction
+from django.db.models import aprefetch_related_objects
+from django.http import HttpResponseRedirect, HttpResponse, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.timezone import now
+
+from .admin import claim_export_pins, format_publish_time, get_target_date
+from .models import Campaign, PinTemplateVariation
+from .services.slots import ensure_allocated
+from .services.daily_picks import DAILY_PICK_COUNT, afill_missing_hooks, aget_daily_picks, precompute_daily_picks
+from .services.summary import arepurpose_rollup, REPURPOSE_PLATFORMS
+
+# Async twins of the read-heavy admin tools (dashboard, exports, Daily 4).
+# The schedule preview is a paginated sync page (ScheduledPinAdmin.schedule_preview).
+#
+# Served under /admin-tools/async/ and only worth using behind an ASGI server
+# (see ruoth_pins/asgi.py): there a slow export or a page waiting on OpenAI
+# doesn't tie up a worker. Under WSGI they still work, one request at a time.
+# Writes (POST actions) stay on the sync admin views.
+
+logger = logging.getLogger(__name__)
+
+staff_required = staff_member_required(login_url='admin:login')
+
+
+def _back(request):
+    return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/admin/"))
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line, for streaming csv rows."""
+
+    def write(self, value):
+        return value
+
+
+@staff_required
+async def repurpose_summary_dashboard(request):
+    selected_campaign = request.GET.get('campaign')
+    rows = await arepurpose_rollup()
+
+    return TemplateResponse(request, 'admin/repurpose_summary_dashboard.html', {
+        'rows': rows,
+        'platforms': REPURPOSE_PLATFORMS,
+        'selected_campaign': int(selected_campaign) if (selected_campaign or '').isdigit() else None,
+    })
+
+
+@staff_required
+async def export_today_csv(request):
+    """Stream the day's CSV as rows are fetched, instead of building it in memory.
+
+    The pins are claimed ('exported') before the first row is sent, so a pin
+    the publisher picks up meanwhile is never in the file too. A download cut
+    short therefore leaves them exported: re-export the day (``?all=1``) or
+    re-queue them from the ScheduledPin admin.
+    """
+    target_date = get_target_date(request)
+    await sync_to_async(ensure_allocated)([target_date])
+
+    pins = (await sync_to_async(claim_export_pins)(request, target_date)).prefetch_related('pin__keywords')
+    if not await pins.aexists():
+        messages.warning(request, f"⚠️ No scheduled pins found for {target_date}")
+        return _back(request)
+
+    async def rows():
+        writer = csv.writer(_Echo())
+        yield writer.writerow([
+            "Title",
+            "Hook",
+            "Media URL",
+            "Pinterest board",
+            "Thumbnail",
+            "Description",
+            "Link",
+            "Publish date",
+            "Keywords"
+        ])
+        async for pin in pins.aiterator(chunk_size=500):
+            yield writer.writerow([
+                (pin.pin.title or '')[:100],
+                (getattr(pin.pin, 'repurpose_hook', '') or '').strip(),
+                pin.pin.image_url,
+                pin.board.name,
+                "",  # Thumbnail
+                pin.pin.description or "",
+                pin.pin.link or "",
+                format_publish_time(pin),
+                ", ".join(kw.phrase for kw in pin.pin.keywords.all()),
+            ])
+
+    response = StreamingHttpResponse(rows(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="scheduled_pins_{target_date}.csv"'
+    return response
+
+
+def _build_bundle(pins, target_date):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        csv_io = io.StringIO()
+        csv_writer = csv.writer(csv_io)
+        csv_writer.writerow([
+            "Pinterest board",
+            "Title",
+            "Media URL",
+            "Thumbnail",
+            "Description",
+            "Link",
+            "Publish date",
+            "Keywords"
+        ])
+        for pin in pins:
+            csv_writer.writerow([
+                pin.board.name,
+                pin.pin.title or pin.pin.headline.text[:100],
+                pin.pin.image_url,
+                "",  # Only required for video
+                pin.pin.description or "",
+                pin.pin.link or "",
+                format_publish_time(pin),
+                ", ".join(kw.phrase for kw in pin.pin.keywords.all()),
+            ])
+        zip_file.writestr("scheduled_pins.csv", csv_io.getvalue())
+        zip_file.writestr("image_urls.txt", "\n".join(pin.pin.image_url for pin in pins))
+    return buffer.getvalue()
+
+
+@transaction.atomic
+def _claim_and_build_bundle(request, target_date):
+    """Claim the day's pins and zip them in one transaction (None when there are none).
+
+    Zipping happens inside it so a failure rolls the claim back.
+    """
+    pins = list(
+        claim_export_pins(request, target_date, source='admin-bundle')
+        .select_related('pin__headline').prefetch_related('pin__keywords')
+    )
+    return _build_bundle(pins, target_date) if pins else None
+
+
+@staff_required
+async def bundle_export(request):
+    target_date = get_target_date(request)
+    await sync_to_async(ensure_allocated)([target_date])
+    payload = await sync_to_async(_claim_and_build_bundle)(request, target_date)
+    if payload is None:
+        messages.warning(request, f"No pins scheduled for {target_date}")
+        return _back(request)
+
+    response = HttpResponse(payload, content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="scheduled_pins_bundle_{target_date}.zip"'
+    return response
+
+
+@staff_required
+async def random_repurpose_view(request):
+    """Daily 4 page. Missing hooks are generated concurrently with the async OpenAI client."""
+    campaign_id = request.GET.get('campaign')
+    platform = request.GET.get("platform", "all")
+    sync_url = reverse('admin:random_repurpose_view')
+
+    if not campaign_id or not campaign_id.isdigit():
+        messages.error(request, "❌ Campaign ID is required in query params.")
+        return HttpResponseRedirect(reverse('admin:pinterest_scheduler_pintemplatevariation_changelist'))
+
+    today = now().date()
+    selected = await aget_daily_picks(campaign_id, today)
+    if len(selected) < DAILY_PICK_COUNT:
+        campaign = await Campaign.objects.filter(pk=campaign_id).afirst()
+        if campaign is None:
+            messages.error(request, f"❌ Campaign {campaign_id} not found.")
+            return HttpResponseRedirect(reverse('admin:pinterest_scheduler_pintemplatevariation_changelist'))
+        selected, _hooks = await sync_to_async(precompute_daily_picks)(campaign, today, generate_hooks=False)
+
+    await aprefetch_related_objects(selected, "keywords", "repurposed_statuses")
+
+    if len(selected) < DAILY_PICK_COUNT:
+        messages.warning(request, f"⚠️ Only {len(selected)} eligible unique variations found.")
+
+    try:
+        auto_updated = await afill_missing_hooks(selected)
+        if auto_updated:
+            messages.success(request, f"✅ Auto-generated {auto_updated} hooks for today.")
+    except DatabaseError as e:
+        # OpenAI failures are handled per pin in agenerate_hook_for_pin; only saving can fail here.
+        logger.exception("repurpose_random async auto-gen exception: %s", e)
+
+    context = {
+        **await sync_to_async(admin.site.each_context)(request),
+        'title': "🎯 Daily 4 Repurpose Picks (Unique Pillars & Headlines)",
+        'pins': selected,
+        'platform': platform,
+        'opts': PinTemplateVariation._meta,
+        # Actions and export are handled by the sync admin view.
+        'form_action': f"{sync_url}?campaign={campaign_id}&platform={platform}",
+        'export_url': f"{sync_url}?campaign={campaign_id}&platform={platform}&export=1",
+    }
+    return TemplateResponse(request, "admin/repurpose_random_list.html", context)
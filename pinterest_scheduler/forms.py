@@ -3,7 +3,15 @@ from django.utils.html import format_html, format_html_join
 from django.utils import timezone
 from datetime import timedelta
 from django.utils.timezone import now
-from .models import PinTemplateVariation, ScheduledPin, Board, Headline, Campaign
+from .models import PinTemplateVariation, ScheduledPin, Headline, Campaign
+from .services.caching import cached_boards
+
+def _selected_id(form, name):
+    """The id chosen for ``name`` (initial or submitted), or None if it isn't one."""
+    value = form.data.get(name) or form.initial.get(name)
+    value = getattr(value, 'pk', value)
+    return int(value) if str(value or '').isdigit() else None
+
 
 class PinTemplateVariationForm(forms.ModelForm):
     class Meta:
@@ -13,66 +21,72 @@ class PinTemplateVariationForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        headline_id = self.initial.get('headline') or self.data.get('headline')
+        headline_id = _selected_id(self, 'headline')
 
         if headline_id:
-            try:
-                headline = Headline.objects.get(pk=headline_id)
-                pillar_name = headline.pillar.name
-                variation_count = headline.variations.count()
-                
-                colour = "#33cc33" if variation_count < 4 else "#cc3333"
-                emoji = "🟢" if variation_count < 4 else "❌"
+            # Pillar, progress and limit in one query (variation_count is a stored counter).
+            headline = Headline.objects.filter(pk=headline_id).values(
+                'pillar__name', 'variation_count', 'pillar__campaign__max_variations_per_headline'
+            ).first()
+            if headline:
+                pillar_name = headline['pillar__name']
+                variation_count = headline['variation_count']
+                max_allowed = headline['pillar__campaign__max_variations_per_headline'] or 4
+
+                colour = "#33cc33" if variation_count < max_allowed else "#cc3333"
+                emoji = "🟢" if variation_count < max_allowed else "❌"
 
                 self.fields['headline'].help_text = format_html(
                     '<div style="margin-top:5px;">'
                     '{} <strong style="color:{};">Pillar:</strong> {} &nbsp;|&nbsp; '
-                    '<strong style="color:{};">Variations:</strong> {}/4 created'
+                    '<strong style="color:{};">Variations:</strong> {}/{} created'
                     '</div>',
-                    emoji, colour, pillar_name, colour, variation_count
+                    emoji, colour, pillar_name, colour, variation_count, max_allowed
                 )
 
-            except Headline.DoesNotExist:
-                pass
-
 
 class ScheduledPinForm(forms.ModelForm):
     class Meta:
         model = ScheduledPin
-        fields = ['pin', 'board']  # Only user-facing fields
+        # Only user-facing fields: campaign follows the pin (ScheduledPin.save) and
+        # remote_pin_id is written by the publisher.
+        fields = ['pin', 'board', 'publish_date', 'campaign_day', 'slot_number', 'publish_at', 'status']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # ScheduledPinAdmin renders pin as an autocomplete (server-side search); the
+        # selected option's label reads the variation's headline, so load it with the option.
+        self.fields['pin'].queryset = PinTemplateVariation.objects.select_related('headline')
 
-        pin_id = self.initial.get('pin') or self.data.get('pin')
+        pin_id = _selected_id(self, 'pin')
 
         if pin_id:
-            try:
-                pin = PinTemplateVariation.objects.get(pk=pin_id)
-                scheduled = ScheduledPin.objects.filter(pin=pin).select_related('board').order_by('campaign_day')
-
-                # Show summary of where the pin is already scheduled
-                rows = format_html_join(
-                    '\n',
-                    '<li><b>Board:</b> {} | <b>Day:</b> {} | <b>Date:</b> {}</li>',
-                    [(s.board.name, s.campaign_day, s.publish_date) for s in scheduled]
-                )
-                self.fields['pin'].help_text = format_html(
-                    "<div style='margin-top:10px;padding:10px;background:#f9f9f9;border:1px solid #ddd;'>"
-                    "<b>📋 Already scheduled to:</b><ul>{}</ul></div>",
-                    rows or "<li>No schedules yet.</li>"
-                )
-
-                # Suggest next board only (we no longer need to touch day/date/slot)
-                used_board_ids = {s.board.id for s in scheduled}
-                available_boards = Board.objects.exclude(id__in=used_board_ids)
-                if available_boards.exists():
-                    self.fields['board'].initial = available_boards.first()
-                else:
-                    self.fields['board'].help_text = "⚠️ All boards already used for this pin."
-
-            except PinTemplateVariation.DoesNotExist:
-                pass
+            # Everywhere the pin is already scheduled, with board names, in one query.
+            scheduled = list(
+                ScheduledPin.objects.filter(pin_id=pin_id)
+                .order_by('campaign_day')
+                .values_list('board_id', 'board__name', 'campaign_day', 'publish_date')
+            )
+
+            # Show summary of where the pin is already scheduled
+            rows = format_html_join(
+                '\n',
+                '<li><b>Board:</b> {} | <b>Day:</b> {} | <b>Date:</b> {}</li>',
+                [(board_name, day, date) for _board_id, board_name, day, date in scheduled]
+            )
+            self.fields['pin'].help_text = format_html(
+                "<div style='margin-top:10px;padding:10px;background:#f9f9f9;border:1px solid #ddd;'>"
+                "<b>📋 Already scheduled to:</b><ul>{}</ul></div>",
+                rows or "<li>No schedules yet.</li>"
+            )
+
+            # Suggest next board only (we no longer need to touch day/date/slot)
+            used_board_ids = {board_id for board_id, *_ in scheduled}
+            available_boards = [b for b in cached_boards() if b.id not in used_board_ids]
+            if available_boards:
+                self.fields['board'].initial = available_boards[0]
+            else:
+                self.fields['board'].help_text = "⚠️ All boards already used for this pin."
 
 class KeywordCSVUploadForm(forms.Form):
     csv_file = forms.FileField(label="Upload Google Keyword CSV")
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localtime, now
+from pinterest_scheduler.models import ScheduledPin
+from pinterest_scheduler.services.slots import allocate_days, parse_windows, pins_due, posting_windows
+
+class Command(BaseCommand):
+    help = "Assign publish times (publish_at) to scheduled pins within the configured posting windows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='First day to allocate (YYYY-MM-DD, default: today)')
+        parser.add_argument('--days', type=int, default=1, help='Number of days from --date')
+        parser.add_argument('--all', action='store_true', help='Re-allocate every day that has scheduled pins')
+        parser.add_argument('--windows', type=str, help='Override POSTING_WINDOWS, e.g. "09:00-12:00,17:00-21:00"')
+        parser.add_argument('--respread', action='store_true',
+                            help='Re-time every scheduled pin on each day, not just pins without a time')
+        parser.add_argument('--next-hour', action='store_true', help='Just list the pins due in the next hour')
+
+    def handle(self, *args, **options):
+        if options['next_hour']:
+            start = now()
+            for pin in pins_due(start, start + timedelta(hours=1)).select_related('board', 'pin'):
+                self.stdout.write(f"🕒 {localtime(pin.publish_at):%H:%M} | {pin.board.name} | {pin.pin}")
+            return
+
+        try:
+            windows = parse_windows(options['windows']) if options['windows'] else posting_windows()
+            first = datetime.strptime(options['date'], "%Y-%m-%d").date() if options['date'] else now().date()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['all']:
+            dates = list(ScheduledPin.objects.values_list('publish_date', flat=True).order_by('publish_date').distinct())
+        else:
+            dates = [first + timedelta(days=i) for i in range(options['days'])]
+
+        updated = allocate_days(dates, windows=windows, respread=options['respread'])
+        spans = ", ".join(f"{start:%H:%M}-{end:%H:%M}" for start, end in windows)
+        self.stdout.write(self.style.SUCCESS(f"✅ {updated} pins allocated across {len(dates)} days ({spans})."))
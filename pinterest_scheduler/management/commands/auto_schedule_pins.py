@@ -1,7 +1,11 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from collections import defaultdict
 from datetime import timedelta
-from pinterest_scheduler.models import PinTemplateVariation, ScheduledPin, Board
+from pinterest_scheduler.models import PinTemplateVariation, ScheduledPin
+from pinterest_scheduler.services.caching import cached_boards
+from pinterest_scheduler.services.scheduling import BATCH_SIZE, REPLACEABLE_STATUSES, after_schedule_write, campaign_lock
+from pinterest_scheduler.services.schedule_checks import check_schedule, load_schedule, summarize
 from django.db import transaction
 
 class Command(BaseCommand):
@@ -15,8 +19,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        boards = list(Board.objects.all())[:5]
-        pins = list(PinTemplateVariation.objects.all().order_by('id'))
+        boards = cached_boards()[:5]
+        pins = list(PinTemplateVariation.objects.select_related('headline__pillar').order_by('id'))
 
         if len(boards) < 5:
             self.stderr.write("❌ You need at least 5 boards.")
@@ -25,10 +29,6 @@ class Command(BaseCommand):
         if len(pins) != 120:
             self.stdout.write(f"⚠️ You currently have {len(pins)} pins. Expected 120.")
 
-        if options['reset']:
-            deleted = ScheduledPin.objects.filter(status__in=['scheduled', 'exported']).delete()
-            self.stdout.write(f"♻️ Reset: {deleted[0]} scheduled/exported pins deleted.")
-
         # 👇 Build the full set: 120 variations × 5 boards = 600 pins
         full_pinset = [(pin, board) for pin in pins for board in boards]
 
@@ -40,32 +40,55 @@ class Command(BaseCommand):
         today = timezone.now().date()
         days_until_monday = (7 - today.weekday()) % 7 or 7
         next_monday = today + timedelta(days=days_until_monday)
+        last_day = next_monday + timedelta(days=29)
+
+        # Plan every slot, then write campaign by campaign (see services.scheduling).
+        planned = defaultdict(list)
+        for day_offset in range(30):
+            chunk = full_pinset[day_offset * 20 : (day_offset + 1) * 20]
+            publish_date = next_monday + timedelta(days=day_offset)
+            for slot_number, (pin, board) in enumerate(chunk, start=1):
+                campaign_id = pin.headline.pillar.campaign_id
+                planned[campaign_id].append(ScheduledPin(
+                    campaign_id=campaign_id,
+                    pin_id=pin.id,
+                    board_id=board.id,
+                    publish_date=publish_date,
+                    campaign_day=day_offset + 1,
+                    slot_number=slot_number,
+                    status='scheduled'
+                ))
 
         scheduled_count = 0
+        for campaign_id, rows in planned.items():
+            # Pins outside any campaign have no row to lock; a plain transaction will do.
+            lock = campaign_lock(campaign_id) if campaign_id else transaction.atomic()
+            with lock:
+                campaign_pins = ScheduledPin.objects.filter(campaign_id=campaign_id) if campaign_id \
+                    else ScheduledPin.objects.filter(campaign__isnull=True)
+
+                if options['reset']:
+                    # Pins a publisher is sending right now are left for it to settle.
+                    deleted = campaign_pins.filter(status__in=REPLACEABLE_STATUSES).exclude(status='publishing').delete()
+                    self.stdout.write(f"♻️ Reset campaign {campaign_id}: {deleted[0]} scheduled/exported pins deleted.")
 
-        with transaction.atomic():
-            for day_offset in range(30):
-                chunk = full_pinset[day_offset * 20 : (day_offset + 1) * 20]
-                publish_date = next_monday + timedelta(days=day_offset)
-                campaign_day = day_offset + 1
+                existing = set(
+                    campaign_pins.filter(publish_date__range=(next_monday, last_day))
+                    .values_list('pin_id', 'board_id', 'publish_date')
+                )
+                new_rows = [
+                    row for row in rows
+                    if (row.pin_id, row.board_id, row.publish_date) not in existing
+                ]
+                ScheduledPin.objects.bulk_create(new_rows, batch_size=BATCH_SIZE)
+                scheduled_count += len(new_rows)
 
-                for slot_number, (pin, board) in enumerate(chunk, start=1):
-                    exists = ScheduledPin.objects.filter(
-                        pin=pin,
-                        board=board,
-                        publish_date=publish_date
-                    ).exists()
-                    if not exists:
-                        ScheduledPin.objects.create(
-                            pin=pin,
-                            board=board,
-                            publish_date=publish_date,
-                            campaign_day=campaign_day,
-                            slot_number=slot_number,
-                            status='scheduled'
-                        )
-                        scheduled_count += 1
+        after_schedule_write(next_monday + timedelta(days=d) for d in range(30))
 
         self.stdout.write(self.style.SUCCESS(
             f"✅ {scheduled_count} SmartLoop pins scheduled — 20/day for 30 days starting {next_monday}"
-        ))
\ No newline at end of file
+        ))
+        report = check_schedule(load_schedule(queryset=ScheduledPin.objects.filter(
+            publish_date__range=(next_monday, last_day)
+        )))
+        self.stdout.write(summarize(report))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from pinterest_scheduler.models import ScheduledPin
+from pinterest_scheduler.services.scheduling import fill_missing_campaigns
+
+class Command(BaseCommand):
+    help = "Fill in the campaign of ScheduledPins created without one (one UPDATE, campaign taken from the pin's pillar)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='🔍 Only count the rows missing a campaign'
+        )
+
+    def handle(self, *args, **options):
+        missing = ScheduledPin.objects.filter(campaign__isnull=True)
+        total = missing.count()
+        if options['dry_run'] or not total:
+            self.stdout.write(f"🔍 {total} scheduled pins without a campaign.")
+            return
+
+        updated = fill_missing_campaigns(missing)
+        self.stdout.write(self.style.SUCCESS(f"✅ Campaign set on {updated} of {total} scheduled pins."))
+        if updated < total:
+            self.stdout.write(f"⚠️ {total - updated} pins belong to a pillar without a campaign; left empty.")
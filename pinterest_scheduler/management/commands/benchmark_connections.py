@@ -0,0 +1,94 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client, override_settings
+from django.utils.timezone import now
+from pinterest_scheduler.services.db_pool import pool_stats, reset_stats
+
+DEFAULT_URLS = [
+    "/admin/pinterest_scheduler/scheduledpin/",
+    "/admin/pinterest_scheduler/pintemplatevariation/",
+    "/admin-tools/export_today_csv/?date={today}&all_hours=1",
+    "/admin-tools/bundle_export/?date={today}",
+]
+
+# CONN_MAX_AGE / health-check settings to compare. 'pool' can't be switched at
+# runtime, so it's only measured when it's the configured DB_POOL_MODE.
+MODES = {
+    'none': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+}
+
+class Command(BaseCommand):
+    help = "Compare per-request time and connection-acquire latency with and without connection reuse"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per URL per mode')
+        parser.add_argument('--url', action='append', dest='urls', help='URL to hit (repeatable); defaults to export + changelist views')
+        parser.add_argument('--user', type=str, help='Superuser to log in as (default: first superuser)')
+        parser.add_argument('--host', type=str, help='Host header (default: first ALLOWED_HOSTS entry)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(is_superuser=True)
+        if options['user']:
+            users = users.filter(username=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError("No superuser found to run the benchmark as.")
+
+        host = options['host'] or next((h for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        today = now().date().isoformat()
+        urls = [u.format(today=today) for u in (options['urls'] or DEFAULT_URLS)]
+
+        conn = connections['default']
+        original = {key: conn.settings_dict.get(key) for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+
+        modes = dict(MODES)
+        if getattr(settings, 'DB_POOL_MODE', 'none') == 'pool':
+            modes = {'pool': original}
+
+        results = {}
+        # The clients below build their middleware under this, so telemetry is on for them only.
+        telemetry = override_settings(DB_POOL_TELEMETRY=True)
+        telemetry.enable()
+        try:
+            for mode, overrides in modes.items():
+                conn.close()
+                conn.settings_dict.update(overrides)
+                client = Client(SERVER_NAME=host)
+                client.force_login(user)
+                reset_stats()
+
+                timings = []
+                for url in urls:
+                    for _ in range(options['requests']):
+                        # The test client skips Django's request_started/finished connection
+                        # handling, so apply it here like a real request would.
+                        start = time.perf_counter()
+                        close_old_connections()
+                        client.get(url)
+                        close_old_connections()
+                        timings.append((time.perf_counter() - start) * 1000)
+
+                results[mode] = (timings, pool_stats())
+        finally:
+            telemetry.disable()
+            conn.close()
+            conn.settings_dict.update(original)
+
+        for mode, (timings, stats) in results.items():
+            self.stdout.write(
+                f"{mode:<11} requests={len(timings)} "
+                f"median={statistics.median(timings):.2f}ms mean={statistics.mean(timings):.2f}ms | "
+                f"opened={stats['opened']} ({stats['request_ms_opened_avg']:.2f}ms avg) "
+                f"reused={stats['reused']} ({stats['request_ms_reused_avg']:.2f}ms avg)"
+            )
+
+        if 'none' in results and 'persistent' in results:
+            saving = statistics.mean(results['none'][0]) - statistics.mean(results['persistent'][0])
+            self.stdout.write(self.style.SUCCESS(f"✅ Per-request saving with connection reuse: {saving:.2f}ms"))
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from pinterest_scheduler.models import Campaign
+from pinterest_scheduler.services.schedule_checks import (
+    BOARD_TOLERANCE,
+    DAY_LOAD_TOLERANCE,
+    MIN_REPEAT_SPACING_DAYS,
+    PILLAR_TOLERANCE,
+    check_schedule,
+    load_schedule,
+    summarize,
+)
+
+class Command(BaseCommand):
+    help = "Validate saved schedules: repeat spacing, pin/board repeats, daily load and pillar/board balance"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', type=int, action='append', help='Campaign id (repeatable; default: all)')
+        parser.add_argument('--min-spacing', type=int, default=MIN_REPEAT_SPACING_DAYS, help='Minimum days between repeats of a pin')
+        parser.add_argument('--pillar-tolerance', type=int, default=PILLAR_TOLERANCE)
+        parser.add_argument('--board-tolerance', type=int, default=BOARD_TOLERANCE)
+        parser.add_argument('--day-tolerance', type=int, default=DAY_LOAD_TOLERANCE)
+        parser.add_argument('--format', choices=['text', 'json'], default='text')
+        parser.add_argument('--fail', action='store_true', help='Exit non-zero when any violation is found')
+
+    def handle(self, *args, **options):
+        campaigns = Campaign.objects.order_by('start_date', 'id')
+        if options['campaign']:
+            campaigns = campaigns.filter(id__in=options['campaign'])
+
+        reports = {}
+        for campaign in campaigns:
+            reports[campaign.id] = (campaign, check_schedule(
+                load_schedule(campaign.id),
+                min_spacing_days=options['min_spacing'],
+                pillar_tolerance=options['pillar_tolerance'],
+                board_tolerance=options['board_tolerance'],
+                day_load_tolerance=options['day_tolerance'],
+            ))
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(
+                [{'campaign_id': cid, 'campaign': c.name, **report} for cid, (c, report) in reports.items()],
+                indent=2,
+            ))
+        else:
+            for campaign, report in reports.values():
+                self.stdout.write(f"{campaign.name}: {summarize(report)}")
+                for name, items in report['violations'].items():
+                    for item in items[:5]:
+                        self.stdout.write(f"   {name}: {item}")
+
+        if options['fail'] and any(not report['ok'] for _c, report in reports.values()):
+            raise SystemExit(1)
@@ -3,7 +3,7 @@ from django.utils.timezone import now
 from pinterest_scheduler.services.exporter import export_scheduled_pins_to_csv
 
 class Command(BaseCommand):
-    help = "Export all ScheduledPins for today into a Pinterest bulk upload CSV."
+    help = "Export today's not-yet-exported ScheduledPins into a Pinterest bulk upload CSV and mark them exported."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -22,11 +22,11 @@ class Command(BaseCommand):
         today = now().date()
         dry_run = options.get("dry_run", False)
 
-        output_file = export_scheduled_pins_to_csv(
+        output_file, count = export_scheduled_pins_to_csv(
             target_date=today,
             output_path=options["output"],
             dry_run=dry_run
         )
 
         status = "PREVIEW ONLY" if dry_run else "Export complete"
-        self.stdout.write(self.style.SUCCESS(f"✅ {status}! CSV saved to: {output_file}"))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f"✅ {status}! {count} pins, CSV saved to: {output_file}"))
\ No newline at end of file
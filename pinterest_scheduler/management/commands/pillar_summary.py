@@ -1,15 +1,38 @@
+import json
+
 from django.core.management.base import BaseCommand
-from pinterest_scheduler.models import Pillar
+from pinterest_scheduler.services.summary import pillar_completion_summary, campaign_completion_summary
 
 class Command(BaseCommand):
     help = 'Show a summary of headlines and template variations per pillar'
 
-    def handle(self, *args, **kwargs):
-        for pillar in Pillar.objects.all():
-            headlines = pillar.headlines.count()
-            variations = sum(h.variations.count() for h in pillar.headlines.all())
-            pct = int((variations / (headlines * 4)) * 100) if headlines else 0
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campaign',
+            type=int,
+            help='Only summarise pillars for this campaign ID'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['text', 'json'],
+            default='text',
+            help='Output format (json is meant for automation)'
+        )
+
+    def handle(self, *args, **options):
+        pillars = pillar_completion_summary(campaign_id=options.get('campaign'))
+
+        if options['format'] == 'json':
+            payload = {
+                'campaigns': campaign_completion_summary(pillars),
+                'pillars': pillars,
+            }
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        for row in pillars:
             self.stdout.write(
-                f"{pillar.name}: {headlines} headlines — {variations}/"
-                f"{headlines * 4} variations — {pct}% complete"
-            )
\ No newline at end of file
+                f"{row['campaign']} / {row['pillar']}: {row['headline_count']} headlines — "
+                f"{row['variation_count']}/{row['variation_target']} variations — "
+                f"{row['percent_complete']}% complete"
+            )
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from pinterest_scheduler.services.pinterest_stub import API_PREFIX, make_stub_server
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the Pinterest API (POST /v5/pins) to publish against"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--rate', type=float, help='Server-side limit in requests/second (429 beyond it)')
+        parser.add_argument('--burst', type=int, default=10, help='Requests allowed in a burst with --rate')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with 503')
+
+    def handle(self, *args, **options):
+        server = make_stub_server(
+            options['host'], options['port'],
+            token=settings.PINTEREST_ACCESS_TOKEN,
+            rate=options['rate'], burst=options['burst'], fail_rate=options['fail_rate'],
+        )
+        base_url = f"http://{options['host']}:{server.server_address[1]}{API_PREFIX}"
+        self.stdout.write(self.style.SUCCESS(f"🧪 Pinterest stub listening on {base_url}"))
+        self.stdout.write(f"   PINTEREST_API_BASE={base_url}  (stats: /_stub/stats, Ctrl-C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"🛑 Stopped. {server.state.stats}")
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from pinterest_scheduler.models import Campaign
+from pinterest_scheduler.services.daily_picks import active_campaigns, precompute_daily_picks
+from pinterest_scheduler.services.hook_generator import get_openai_client
+
+class Command(BaseCommand):
+    help = "Precompute the Daily 4 repurpose picks (and their hooks) for every active campaign"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Day to pick for (YYYY-MM-DD, default: today)'
+        )
+        parser.add_argument(
+            '--campaign',
+            type=int,
+            help='Only precompute for this campaign ID (active or not)'
+        )
+        parser.add_argument(
+            '--no-hooks',
+            action='store_true',
+            help='Store the picks without generating hooks'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-pick even if picks already exist for the day'
+        )
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                pick_date = datetime.strptime(options['date'], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError(f"Invalid date format: {options['date']}")
+        else:
+            pick_date = now().date()
+
+        if options['campaign']:
+            campaigns = Campaign.objects.filter(pk=options['campaign'])
+        else:
+            campaigns = active_campaigns(pick_date)
+
+        generate_hooks = not options['no_hooks']
+        client = get_openai_client() if generate_hooks else None
+        if generate_hooks and client is None:
+            self.stderr.write("⚠️ OpenAI not configured — storing picks without hooks.")
+            generate_hooks = False
+
+        for campaign in campaigns:
+            picks, hooks = precompute_daily_picks(
+                campaign,
+                pick_date,
+                generate_hooks=generate_hooks,
+                force=options['force'],
+                client=client,
+            )
+            self.stdout.write(f"{campaign.name}: {len(picks)} picks, {hooks} hooks generated")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Daily picks ready for {pick_date}"))
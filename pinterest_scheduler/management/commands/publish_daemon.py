@@ -0,0 +1,52 @@
+import logging
+import signal
+import threading
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from pinterest_scheduler.models import ScheduledPin
+from pinterest_scheduler.services.publishing import (
+    CATCH_UP, CHECK_EVERY, HORIZON, RETRY_DELAY, PublishQueue, get_publisher, run_daemon,
+)
+
+class Command(BaseCommand):
+    help = "Long-running publisher: sleeps until the next ScheduledPin is due, publishes it and marks it posted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--publisher', type=str, help="'api', 'file' or a dotted Publisher path (default: PUBLISH_DAEMON_PUBLISHER)")
+        parser.add_argument('--sink', type=str, help='Output file for the file publisher (JSON lines)')
+        parser.add_argument('--horizon', type=float, default=HORIZON.total_seconds() / 3600, help='Hours of schedule kept in memory')
+        parser.add_argument('--catch-up', type=float, default=CATCH_UP.total_seconds() / 60, help='Minutes overdue a pin may be and still go out')
+        parser.add_argument('--check-every', type=float, default=CHECK_EVERY, help='Seconds between checks for schedule changes')
+        parser.add_argument('--retry-delay', type=float, default=RETRY_DELAY.total_seconds(), help='Seconds before a failed pin is retried')
+        parser.add_argument('--once', action='store_true', help='Publish what is due now and exit')
+
+    def handle(self, *args, **options):
+        logging.getLogger('pinterest_scheduler.services.publishing').setLevel(logging.INFO)
+        publisher = get_publisher(options['publisher'], **({'path': options['sink']} if options['sink'] else {}))
+        queue = PublishQueue(horizon=timedelta(hours=options['horizon']), catch_up=timedelta(minutes=options['catch_up']))
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        self.stdout.write(f"🚀 Publishing with '{publisher.name}' ({options['horizon']:g}h horizon). Ctrl-C to stop.")
+        if not queue.watch_generation:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ The cache isn't shared between hosts (set REDIS_URL), so schedule changes can't be "
+                f"signalled: reloading the queue every {options['check_every']:g}s instead."
+            ))
+        stuck = ScheduledPin.objects.filter(status='publishing').count()
+        if stuck:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {stuck} pins are stuck in 'publishing' from an interrupted run. They may already be live: "
+                "check Pinterest, then re-queue or mark them posted in the admin."
+            ))
+        try:
+            posted = run_daemon(
+                publisher, queue=queue, check_every=options['check_every'],
+                retry_delay=timedelta(seconds=options['retry_delay']), once=options['once'], stop=stop,
+            )
+        finally:
+            publisher.close()
+        self.stdout.write(self.style.SUCCESS(f"✅ Stopped. {posted} pins posted."))
@@ -0,0 +1,57 @@
+import json
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from pinterest_scheduler.models import ScheduledPin
+from pinterest_scheduler.services.api_client import PinterestApiClient, pin_payload, publish_scheduled_pins
+
+class Command(BaseCommand):
+    help = "Publish a day's scheduled pins through the Pinterest API as one throttled batch and mark them posted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='Day to publish (YYYY-MM-DD, default: today)')
+        parser.add_argument('--campaign', type=int, help='Only this campaign id')
+        parser.add_argument('--base-url', type=str, help='Override PINTEREST_API_BASE, e.g. a local pinterest_stub')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='🔍 Show what would be sent without calling the API'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            day = datetime.strptime(options['date'], "%Y-%m-%d").date() if options['date'] else now().date()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Exported pins went out through the bulk CSV already; only 'scheduled' ones are published here.
+        pins = ScheduledPin.objects.filter(publish_date=day, status='scheduled').select_related('pin__headline', 'board')
+        if options['campaign']:
+            pins = pins.filter(campaign_id=options['campaign'])
+        pins = list(pins.order_by('publish_at', 'slot_number'))
+        if not pins:
+            self.stdout.write(f"📭 Nothing scheduled to publish on {day}.")
+            return
+
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {len(pins)} pins would be published on {day}. First payload:")
+            self.stdout.write(json.dumps(pin_payload(pins[0]), indent=2))
+            return
+
+        started = time.monotonic()
+        with PinterestApiClient(base_url=options['base_url']) as client:
+            posted, failures = publish_scheduled_pins(pins, client=client)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {posted} of {len(pins)} pins published for {day} in {elapsed:.1f}s."
+        ))
+        skipped = len(pins) - posted - len(failures)
+        if skipped:
+            self.stdout.write(f"⏭️ {skipped} pins were taken by another export or publisher first.")
+        for scheduled, result in failures:
+            self.stdout.write(self.style.ERROR(f"❌ #{scheduled.pk} {scheduled.pin}: {result.error}"))
+        if failures:
+            self.stdout.write("⚠️ Failed pins are back to 'scheduled'; re-run to retry them.")
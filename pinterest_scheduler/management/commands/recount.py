@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from pinterest_scheduler.services.counters import recount_all
+
+class Command(BaseCommand):
+    help = "Recompute the denormalised headline/variation/repurpose progress counters"
+
+    def handle(self, *args, **options):
+        updated = recount_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Counters rebuilt — {updated['campaigns']} campaigns, "
+            f"{updated['pillars']} pillars, {updated['headlines']} headlines."
+        ))
@@ -0,0 +1,77 @@
+import json
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils.timezone import now
+from pinterest_scheduler.models import Campaign
+from pinterest_scheduler.services.benchmark import (
+    COMMANDS,
+    URLS,
+    build_report,
+    compare_reports,
+    fetch,
+    load_report,
+    run_command,
+    run_scenarios,
+)
+
+class Command(BaseCommand):
+    help = "Time management commands, admin changelists, dashboards and exports (wall time, queries, peak memory)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Measured runs per scenario (median is reported)')
+        parser.add_argument('--warmup', type=int, default=1, help='Unmeasured runs per scenario first')
+        parser.add_argument('--only', action='append', help='Only run scenarios whose name starts with this (repeatable)')
+        parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+        parser.add_argument('--compare', type=str, help='Previous JSON report to compare against')
+        parser.add_argument('--label', type=str, help='Free-form label stored in the report')
+        parser.add_argument('--campaign', type=int, help='Campaign used for the Daily 4 page (default: first)')
+        parser.add_argument('--user', type=str, help='Superuser to log in as (default: first superuser)')
+        parser.add_argument('--host', type=str, help='Host header (default: first ALLOWED_HOSTS entry)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(is_superuser=True)
+        if options['user']:
+            users = users.filter(username=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError("No superuser found to run the benchmark as.")
+
+        campaign_id = options['campaign'] or Campaign.objects.order_by('id').values_list('id', flat=True).first()
+        host = options['host'] or next((h for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        client = Client(SERVER_NAME=host)
+        client.force_login(user)
+
+        with tempfile.TemporaryDirectory(prefix='ruoth-bench-') as tmpdir:
+            context = {'today': now().date().isoformat(), 'campaign': campaign_id or '', 'tmpdir': tmpdir}
+            scenarios = [(name, run_command([arg.format(**context) for arg in args])) for name, args in COMMANDS]
+            scenarios += [(name, fetch(client, url.format(**context))) for name, url in URLS]
+            if options['only']:
+                scenarios = [s for s in scenarios if s[0].startswith(tuple(options['only']))]
+
+            results = run_scenarios(scenarios, repeat=options['repeat'], warmup=options['warmup'])
+        report = build_report(results, label=options['label'])
+
+        self.stdout.write(f"📦 Dataset: {report['dataset']}")
+        for name, row in results.items():
+            line = (
+                f"{name:<30} median={row['wall_ms_median']:>9.1f}ms "
+                f"queries={row['queries']:>5} peak={row['peak_kb_max']:>9.1f}KB"
+            )
+            if row['error']:
+                line += f"  ❌ {row['error']}"
+            self.stdout.write(line)
+
+        if options['compare']:
+            self.stdout.write(f"\n🔍 Compared with {options['compare']}:")
+            for name, metric, old, new, change in compare_reports(load_report(options['compare']), report):
+                self.stdout.write(f"{name:<30} {metric:<15} {old:>10} → {new:<10} ({change:+.1f}%)")
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Report written to {options['output']}"))
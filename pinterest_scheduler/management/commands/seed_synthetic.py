@@ -0,0 +1,189 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from pinterest_scheduler.models import (
+    Board,
+    Campaign,
+    Headline,
+    Keyword,
+    Pillar,
+    PinKeywordAssignment,
+    PinTemplateVariation,
+    RepurposedPostStatus,
+    ScheduledPin,
+)
+from pinterest_scheduler.services.counters import bulk_changes
+from pinterest_scheduler.services.slots import allocate_days
+
+BATCH_SIZE = 2000
+PLATFORMS = [code for code, _label in RepurposedPostStatus.PLATFORM_CHOICES]
+TIERS = ['high', 'mid', 'niche']
+
+class Command(BaseCommand):
+    help = "Generate synthetic campaigns/pins/keywords/schedules in bulk for benchmarking (1× ≈ one real campaign)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Multiply the campaign count (10 = 10× today)')
+        parser.add_argument('--campaigns', type=int, default=1, help='Campaigns per 1× scale')
+        parser.add_argument('--pillars', type=int, default=6, help='Pillars per campaign')
+        parser.add_argument('--headlines', type=int, default=5, help='Headlines per pillar')
+        parser.add_argument('--variations', type=int, default=4, help='Variations per headline')
+        parser.add_argument('--keywords', type=int, default=500, help='Keywords per 1× scale')
+        parser.add_argument('--keywords-per-pin', type=int, default=6)
+        parser.add_argument('--boards', type=int, default=5)
+        parser.add_argument('--repeats', type=int, default=5, help='Times each pin is scheduled')
+        parser.add_argument('--days', type=int, default=30, help='Length of each campaign schedule')
+        parser.add_argument('--repurposed', type=float, default=0.3, help='Share of variations marked repurposed per platform')
+        parser.add_argument('--prefix', type=str, default='synth', help='Name prefix used to find/clear synthetic rows')
+        parser.add_argument('--clear', action='store_true', help='Delete existing synthetic rows with this prefix first')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        prefix = options['prefix']
+        started = timezone.now()
+
+        with bulk_changes():
+            if options['clear']:
+                self.clear(prefix)
+
+            with transaction.atomic():
+                counts = self.generate(rng, prefix, options)
+
+        elapsed = (timezone.now() - started).total_seconds()
+        summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"✅ Seeded {summary} in {elapsed:.1f}s"))
+
+    def clear(self, prefix):
+        deleted, _ = Campaign.objects.filter(name__startswith=f"{prefix} ").delete()
+        deleted += Keyword.objects.filter(phrase__startswith=f"{prefix} ").delete()[0]
+        deleted += Board.objects.filter(slug__startswith=f"{prefix}-").delete()[0]
+        self.stdout.write(f"♻️ Cleared {deleted} synthetic rows.")
+
+    def generate(self, rng, prefix, options):
+        run = timezone.now().strftime('%Y%m%d%H%M%S')
+        campaign_total = options['campaigns'] * options['scale']
+        today = timezone.now().date()
+
+        boards = Board.objects.bulk_create([
+            Board(name=f"{prefix} board {run}-{i}", slug=f"{prefix}-{run}-{i}")
+            for i in range(options['boards'])
+        ])
+
+        campaigns = Campaign.objects.bulk_create([
+            Campaign(
+                name=f"{prefix} {run} #{c}",
+                start_date=today - timedelta(days=c % options['days']),
+                end_date=today - timedelta(days=c % options['days']) + timedelta(days=options['days'] - 1),
+                max_variations_per_headline=options['variations'],
+            )
+            for c in range(campaign_total)
+        ], batch_size=BATCH_SIZE)
+
+        pillars = Pillar.objects.bulk_create([
+            Pillar(campaign=campaign, name=f"Pillar {p}", tagline=f"Tagline {p}", number_of_boards=options['boards'])
+            for campaign in campaigns
+            for p in range(options['pillars'])
+        ], batch_size=BATCH_SIZE)
+
+        headlines = Headline.objects.bulk_create([
+            Headline(pillar=pillar, text=f"{prefix} headline {pillar.pk}-{h}: what most bakers get wrong?")
+            for pillar in pillars
+            for h in range(options['headlines'])
+        ], batch_size=BATCH_SIZE)
+
+        variations = PinTemplateVariation.objects.bulk_create([
+            PinTemplateVariation(
+                headline=headline,
+                variation_number=v,
+                title=f"Variation {v} – {headline.text[:60]}",
+                image_url=f"https://example.com/{prefix}/{headline.pk}/{v}.png",
+                cta=rng.choice(['Save this', 'Try it', 'Learn more']),
+                background_style=rng.choice(['light', 'dark', 'texture']),
+                mockup_name=f"mockup-{v}",
+                badge_icon=rng.choice(['star', 'chef', 'none']),
+                description=f"Synthetic description for headline {headline.pk} variation {v}.",
+                link="https://example.com/",
+            )
+            for headline in headlines
+            for v in range(1, options['variations'] + 1)
+        ], batch_size=BATCH_SIZE)
+
+        keywords = Keyword.objects.bulk_create([
+            Keyword(
+                phrase=f"{prefix} {run} keyword {k}",
+                currency='USD',
+                avg_monthly_searches=rng.randint(10, 5000),
+                tier=TIERS[k % len(TIERS)],
+                three_month_change='0%',
+                yoy_change='0%',
+                competition=rng.choice(['Low', 'Medium', 'High']),
+                competition_index=rng.random() * 100,
+                bid_low=rng.random(),
+                bid_high=rng.random() * 3,
+            )
+            for k in range(options['keywords'] * options['scale'])
+        ], batch_size=BATCH_SIZE)
+
+        per_pin = min(options['keywords_per_pin'], len(keywords))
+        assignments = [
+            PinKeywordAssignment(pin=variation, keyword=keyword)
+            for variation in variations
+            for keyword in rng.sample(keywords, per_pin)
+        ]
+        PinKeywordAssignment.objects.bulk_create(assignments, batch_size=BATCH_SIZE)
+
+        variations_by_campaign = {}
+        campaign_by_pillar = {pillar.pk: pillar.campaign for pillar in pillars}
+        pillar_by_headline = {headline.pk: headline.pillar_id for headline in headlines}
+        for variation in variations:
+            campaign = campaign_by_pillar[pillar_by_headline[variation.headline_id]]
+            variations_by_campaign.setdefault(campaign, []).append(variation)
+
+        scheduled = []
+        days, repeats = options['days'], options['repeats']
+        spacing = max(days // max(repeats, 1), 1)
+        for campaign, pins in variations_by_campaign.items():
+            slots = {}
+            for i, pin in enumerate(pins):
+                for rot in range(repeats):
+                    day_index = (i + rot * spacing) % days
+                    slot_number = slots[day_index] = slots.get(day_index, 0) + 1
+                    scheduled.append(ScheduledPin(
+                        campaign=campaign,
+                        pin=pin,
+                        board=boards[rot % len(boards)],
+                        publish_date=campaign.start_date + timedelta(days=day_index),
+                        campaign_day=day_index + 1,
+                        slot_number=slot_number,
+                    ))
+        ScheduledPin.objects.bulk_create(scheduled, batch_size=BATCH_SIZE)
+        # Time only the synthetic rows, in the slots real pins on those days leave free.
+        allocate_days({pin.publish_date for pin in scheduled}, pin_ids=[pin.pk for pin in scheduled])
+
+        statuses = [
+            RepurposedPostStatus(
+                variation=variation,
+                platform=platform,
+                campaign=campaign,
+            )
+            for campaign, pins in variations_by_campaign.items()
+            for variation in pins
+            for platform in PLATFORMS
+            if rng.random() < options['repurposed']
+        ]
+        RepurposedPostStatus.objects.bulk_create(statuses, batch_size=BATCH_SIZE)
+
+        return {
+            'campaigns': len(campaigns),
+            'pillars': len(pillars),
+            'headlines': len(headlines),
+            'variations': len(variations),
+            'keywords': len(keywords),
+            'keyword assignments': len(assignments),
+            'scheduled pins': len(scheduled),
+            'repurpose rows': len(statuses),
+        }
@@ -0,0 +1,187 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .services.db_pool import RequestTelemetry, note_connection_created, request_connects
+
+sql_budget_logger = logging.getLogger('pinterest_scheduler.sql_budget')
+
+
+class ConnectionTelemetryMiddleware:
+    """Count requests that opened a DB connection vs reused one, and their timings.
+
+    Off unless DB_POOL_TELEMETRY is set; never connects on its own, so requests
+    that don't query stay off the database. Sits after WhiteNoise so static
+    files are never counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'DB_POOL_TELEMETRY', False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        if self.enabled:
+            connection_created.connect(note_connection_created, dispatch_uid='db_pool_telemetry')
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        telemetry = RequestTelemetry()
+        token = request_connects.set(telemetry.connects)
+        start = time.perf_counter()
+        try:
+            with connections[telemetry.alias].execute_wrapper(telemetry):
+                response = self.get_response(request)
+        finally:
+            request_connects.reset(token)
+        telemetry.record((time.perf_counter() - start) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        telemetry = RequestTelemetry()
+        token = request_connects.set(telemetry.connects)
+        start = time.perf_counter()
+        await sync_to_async(telemetry.watch)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(telemetry.unwatch)()
+            request_connects.reset(token)
+        telemetry.record((time.perf_counter() - start) * 1000)
+        return response
+
+
+class SQLBudgetMiddleware:
+    """Record query count, SQL time and repeated statements per request.
+
+    Active when DEBUG is on, or for a random SQL_BUDGET_SAMPLE_RATE share of
+    requests in production. Requests over budget, or running the same statement
+    shape SQL_BUDGET_REPEAT_THRESHOLD+ times (the usual N+1 signature), are
+    logged with their view name. SQL_BUDGET_HEADER adds X-SQL-* response headers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.always = getattr(settings, 'SQL_BUDGET_ENABLED', settings.DEBUG)
+        self.sample_rate = getattr(settings, 'SQL_BUDGET_SAMPLE_RATE', 0.0)
+        self.max_queries = getattr(settings, 'SQL_BUDGET_MAX_QUERIES', 50)
+        self.max_time_ms = getattr(settings, 'SQL_BUDGET_MAX_TIME_MS', 500)
+        self.repeat_threshold = getattr(settings, 'SQL_BUDGET_REPEAT_THRESHOLD', 5)
+        self.add_header = getattr(settings, 'SQL_BUDGET_HEADER', settings.DEBUG)
+
+    def sampled(self):
+        return self.always or (self.sample_rate and random.random() < self.sample_rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            recorder.watch(stack)
+            response = self.get_response(request)
+
+        self.report(request, response, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        # Connections are per thread: watch the ones in the thread that runs the request's queries.
+        recorder = QueryRecorder()
+        stack = ExitStack()
+        await sync_to_async(recorder.watch)(stack)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        self.report(request, response, recorder)
+        return response
+
+    def report(self, request, response, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name or match._func_path) if match else request.path
+        repeated = recorder.repeated(self.repeat_threshold)
+
+        if self.add_header:
+            response['X-SQL-Queries'] = str(recorder.count)
+            response['X-SQL-Time-ms'] = f"{recorder.total_ms:.1f}"
+            if repeated:
+                response['X-SQL-Repeated'] = str(len(repeated))
+
+        if recorder.count > self.max_queries or recorder.total_ms > self.max_time_ms or repeated:
+            sql_budget_logger.warning(
+                "SQL budget view=%s path=%s queries=%s sql_ms=%.1f repeated=%s",
+                view_name,
+                request.path,
+                recorder.count,
+                recorder.total_ms,
+                len(repeated),
+            )
+            for fingerprint, times in repeated[:5]:
+                sql_budget_logger.warning("  %s× %s", times, fingerprint[:300])
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` callable that tallies queries by fingerprint."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints = Counter()
+
+    def watch(self, stack):
+        for conn in connections.all(initialized_only=True) or [connections['default']]:
+            stack.enter_context(conn.execute_wrapper(self))
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.total_ms += (time.perf_counter() - start) * 1000
+            self.fingerprints[sql_fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+_IN_LIST_RE = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+def sql_fingerprint(sql):
+    """Collapse literals and IN-lists so statements differing only by values match."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return " ".join(sql.split())
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:05
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, fk_path):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk_path: OuterRef('pk')})
+            .order_by()
+            .values(fk_path)
+            .annotate(n=Count('pk'))
+            .values('n')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Campaign = apps.get_model('pinterest_scheduler', 'Campaign')
+    Pillar = apps.get_model('pinterest_scheduler', 'Pillar')
+    Headline = apps.get_model('pinterest_scheduler', 'Headline')
+    Variation = apps.get_model('pinterest_scheduler', 'PinTemplateVariation')
+    Repurposed = apps.get_model('pinterest_scheduler', 'RepurposedPostStatus')
+
+    Headline.objects.update(variation_count=count_subquery(Variation, 'headline'))
+    Pillar.objects.update(
+        headline_count=count_subquery(Headline, 'pillar'),
+        variation_count=count_subquery(Variation, 'headline__pillar'),
+    )
+    Campaign.objects.update(
+        variation_count=count_subquery(Variation, 'headline__pillar__campaign'),
+        repurpose_count=count_subquery(Repurposed, 'variation__headline__pillar__campaign'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0008_alter_pintemplatevariation_repurpose_hook'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='repurpose_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='variation_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='headline',
+            name='variation_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='pillar',
+            name='headline_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='pillar',
+            name='variation_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0009_progress_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRepurposePick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pick_date', models.DateField()),
+                ('position', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_picks', to='pinterest_scheduler.campaign')),
+                ('variation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_picks', to='pinterest_scheduler.pintemplatevariation')),
+            ],
+            options={
+                'ordering': ['-pick_date', 'campaign', 'position'],
+                'unique_together': {('campaign', 'pick_date', 'position')},
+            },
+        ),
+    ]
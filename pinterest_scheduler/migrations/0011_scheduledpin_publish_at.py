@@ -0,0 +1,83 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:18
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.timezone import make_aware
+
+
+def posting_spans(publish_date):
+    spans = []
+    for part in getattr(settings, 'POSTING_WINDOWS', '09:00-21:00').split(','):
+        if part.strip():
+            start, _, end = part.strip().partition('-')
+            spans.append((
+                datetime.combine(publish_date, time.fromisoformat(start.strip())),
+                datetime.combine(publish_date, time.fromisoformat(end.strip())),
+            ))
+    return sorted(spans)
+
+
+def slot_times(publish_date, count):
+    """``count`` times spread evenly across the day's posting windows."""
+    spans = posting_spans(publish_date)
+    step = sum((end - start).total_seconds() for start, end in spans) / count
+    times = []
+    for k in range(count):
+        offset = k * step
+        for start, end in spans:
+            length = (end - start).total_seconds()
+            if offset < length:
+                break
+            offset -= length
+        times.append(make_aware((start + timedelta(seconds=int(offset))).replace(second=0)))
+    return times
+
+
+def interleave_by_board(pins):
+    queues = {}
+    for pin in pins:
+        queues.setdefault(pin.board_id, []).append(pin)
+    queues = list(queues.values())
+    ordered = []
+    while queues:
+        for queue in list(queues):
+            ordered.append(queue.pop(0))
+            if not queue:
+                queues.remove(queue)
+    return ordered
+
+
+def allocate_existing(apps, schema_editor):
+    """Time every unposted pin, each day spread over the posting windows and interleaved by board."""
+    ScheduledPin = apps.get_model('pinterest_scheduler', 'ScheduledPin')
+    dates = ScheduledPin.objects.values_list('publish_date', flat=True).order_by('publish_date').distinct()
+    for publish_date in dates:
+        pins = interleave_by_board(
+            ScheduledPin.objects.filter(publish_date=publish_date)
+            .exclude(status='posted')
+            .only('id', 'board_id', 'slot_number')
+            .order_by('slot_number', 'id')
+        )
+        if not pins:
+            continue
+        for pin, moment in zip(pins, slot_times(publish_date, len(pins))):
+            pin.publish_at = moment
+        ScheduledPin.objects.bulk_update(pins, ['publish_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0010_dailyrepurposepick'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpin',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Allocated posting time (see services.slots); set automatically', null=True),
+        ),
+        migrations.RunPython(allocate_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0011_scheduledpin_publish_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StagedScheduledPin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publish_date', models.DateField()),
+                ('campaign_day', models.PositiveSmallIntegerField(help_text='Campaign day from 1 to 30')),
+                ('slot_number', models.PositiveSmallIntegerField(help_text='Slot position for the day')),
+                ('window_start', models.DateField(help_text="Promoting replaces the campaign's unposted pins from this day…")),
+                ('window_end', models.DateField(help_text='…through this day')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pinterest_scheduler.board')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_pins', to='pinterest_scheduler.campaign')),
+                ('pin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pinterest_scheduler.pintemplatevariation')),
+            ],
+            options={
+                'verbose_name': 'staged scheduled pin',
+                'ordering': ['campaign', 'publish_date', 'slot_number'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0012_stagedscheduledpin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledPinLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('scheduled', 'Scheduled'), ('exported', 'Exported'), ('posted', 'Posted')], max_length=20)),
+                ('to_status', models.CharField(choices=[('scheduled', 'Scheduled'), ('exported', 'Exported'), ('posted', 'Posted')], max_length=20)),
+                ('batch', models.UUIDField(db_index=True, help_text='Shared by every pin moved in the same export/action')),
+                ('source', models.CharField(blank=True, help_text='What made the change, e.g. admin-export', max_length=30)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('scheduled_pin', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='log', to='pinterest_scheduler.scheduledpin')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pinterest_scheduler', '0013_scheduledpinlog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpin',
+            name='remote_pin_id',
+            field=models.CharField(blank=True, default='', help_text="Pinterest's id for the pin once published through the API", max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='scheduledpin',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('exported', 'Exported'), ('publishing', 'Publishing'), ('posted', 'Posted')], default='scheduled', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='scheduledpinlog',
+            name='from_status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('exported', 'Exported'), ('publishing', 'Publishing'), ('posted', 'Posted')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='scheduledpinlog',
+            name='to_status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('exported', 'Exported'), ('publishing', 'Publishing'), ('posted', 'Posted')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+# Trigram indexes for the admin searches behind the pin and headline
+# autocompletes (PinTemplateVariationAdmin / HeadlineAdmin.search_fields),
+# declared on the models (trigram_index in models.py). Django's icontains on
+# PostgreSQL is `UPPER("col"::text) LIKE UPPER('%term%')`, which no btree
+# index can serve; a pg_trgm GIN index on that same expression can.
+#
+# PostgreSQL only: other databases (SQLite in development) record the indexes
+# in the migration state but don't build them. Built CONCURRENTLY so existing
+# tables stay writable, hence non-atomic.
+
+
+class TrigramExtensionOnPostgres(TrigramExtension):
+    # CreateExtension skips other databases going forwards but not backwards.
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def trigram_index(field, name):
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('pinterest_scheduler', '0014_scheduledpin_publishing'),
+    ]
+
+    operations = [
+        TrigramExtensionOnPostgres(),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pintemplatevariation',
+            index=trigram_index('title', 'variation_title_trgm'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pintemplatevariation',
+            index=trigram_index('cta', 'variation_cta_trgm'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pintemplatevariation',
+            index=trigram_index('mockup_name', 'variation_mockup_trgm'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pintemplatevariation',
+            index=trigram_index('badge_icon', 'variation_badge_trgm'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='headline',
+            index=trigram_index('text', 'headline_text_trgm'),
+        ),
+    ]
@@ -1,8 +1,18 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db import IntegrityError
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+def trigram_index(field, name):
+    """pg_trgm GIN index on ``UPPER(field)``: the expression admin search's icontains compares on PostgreSQL.
+
+    Created by migrations on PostgreSQL only (see migration 0015).
+    """
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
 class Campaign(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -10,6 +20,10 @@ class Campaign(models.Model):
     end_date = models.DateField()
     max_variations_per_headline = models.PositiveIntegerField(default=4, help_text="Maximum variations allowed per headline for this campaign") #maximum variations allowed per headline for this campaign
 
+    # Denormalised counters kept current by signals (see signals.py); `manage.py recount` repairs drift.
+    variation_count = models.PositiveIntegerField(default=0, editable=False)
+    repurpose_count = models.PositiveIntegerField(default=0, editable=False)
+
 
     class Meta:
         ordering = ['start_date', 'name']
@@ -24,6 +38,8 @@ class Pillar(models.Model):
     tagline = models.CharField(max_length=255)
     daily_pin_quota = models.PositiveSmallIntegerField(default=20, help_text="Total number of pins to post per day across all boards")
     number_of_boards = models.PositiveSmallIntegerField(default=5, help_text="Number of boards used in this campaign")
+    headline_count = models.PositiveIntegerField(default=0, editable=False)
+    variation_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['campaign__start_date', 'name']
@@ -34,9 +50,11 @@ class Pillar(models.Model):
 class Headline(models.Model):
     pillar = models.ForeignKey(Pillar, on_delete=models.CASCADE, related_name='headlines')
     text = models.TextField()
+    variation_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['pillar__campaign__start_date', 'pillar__name', 'id']
+        indexes = [trigram_index('text', 'headline_text_trgm')]
 
     def __str__(self):
         return f"{self.pillar.name} – {self.text[:40]}"
@@ -68,26 +86,19 @@ class PinTemplateVariation(models.Model):
     class Meta:
         unique_together = ('headline', 'variation_number')  # prevent dupes
         ordering = ['headline__pillar__name', 'variation_number']
+        # One per PinTemplateVariationAdmin.search_fields column: admin search ORs
+        # them, and one unindexed column would mean a full scan again.
+        indexes = [
+            trigram_index('title', 'variation_title_trgm'),
+            trigram_index('cta', 'variation_cta_trgm'),
+            trigram_index('mockup_name', 'variation_mockup_trgm'),
+            trigram_index('badge_icon', 'variation_badge_trgm'),
+        ]
 
     def __str__(self):
-        number = self.variation_number
-
-        # Dynamically suggest a variation number even before save
-        if not number and self.pk is None and self.headline_id:
-            existing = self.headline.variations.values_list('variation_number', flat=True)
-            campaign_limit = (
-                self.headline.pillar.campaign.max_variations_per_headline
-                if self.headline and self.headline.pillar and self.headline.pillar.campaign
-                else 4
-            )
-            for i in range(1, campaign_limit + 1):
-                if i not in existing:
-                    number = i
-                    break
-            else:
-                number = "⚠️ Max reached"
-
-        return f"Variation {number or '—'} of: {self.headline.text[:40]}"
+        # Reads only the headline: list variations with select_related('headline')
+        # (see LABEL_RELATED in admin.py) and labels cost no queries.
+        return f"Variation {self.variation_number or '—'} of: {self.headline.text[:40]}"
 
 
 class Board(models.Model):
@@ -107,9 +118,14 @@ class ScheduledPin(models.Model):
     publish_date = models.DateField()
     campaign_day = models.PositiveSmallIntegerField(help_text="Campaign day from 1 to 30")
     slot_number = models.PositiveSmallIntegerField(help_text="Slot position for the day")
+    publish_at = models.DateTimeField(
+        null=True, blank=True, db_index=True,
+        help_text="Allocated posting time (see services.slots); set automatically",
+    )
     STATUS_CHOICES = [
         ('scheduled', 'Scheduled'),
         ('exported', 'Exported'),
+        ('publishing', 'Publishing'),  # claimed by an API publisher, request in flight
         ('posted', 'Posted'),
     ]
 
@@ -118,6 +134,10 @@ class ScheduledPin(models.Model):
         choices=STATUS_CHOICES,
         default='scheduled'
     )
+    remote_pin_id = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text="Pinterest's id for the pin once published through the API",
+    )
 
     class Meta:
         ordering = ['publish_date', 'campaign_day', 'slot_number']
@@ -125,10 +145,62 @@ class ScheduledPin(models.Model):
     def __str__(self):
         return f"{self.pin} → {self.board.name} on {self.publish_date}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The pin as loaded, so save() can tell the pin was changed (the form has no campaign field).
+        instance._loaded_pin_id = instance.__dict__.get('pin_id')
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.campaign:
-            self.campaign = self.pin.headline.pillar.campaign
+        # One query for the id instead of loading pin → headline → pillar → campaign.
+        # Bulk paths set campaign_id themselves (or run services.scheduling.fill_missing_campaigns).
+        pin_changed = self.pin_id != getattr(self, '_loaded_pin_id', self.pin_id)
+        if self.pin_id is not None and (self.campaign_id is None or pin_changed):
+            self.campaign_id = (
+                PinTemplateVariation.objects.filter(pk=self.pin_id)
+                .values_list('headline__pillar__campaign_id', flat=True)
+                .first()
+            )
         super().save(*args, **kwargs)
+        self._loaded_pin_id = self.pin_id
+
+class ScheduledPinLog(models.Model):
+    """Append-only history of ScheduledPin status changes, written in bulk (services.transitions)."""
+    # No FK constraint or cascade: history outlives re-scheduled rows, and deleting pins stays a plain DELETE.
+    scheduled_pin = models.ForeignKey(
+        ScheduledPin, on_delete=models.DO_NOTHING, db_constraint=False, related_name='log'
+    )
+    from_status = models.CharField(max_length=20, choices=ScheduledPin.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=ScheduledPin.STATUS_CHOICES)
+    batch = models.UUIDField(db_index=True, help_text="Shared by every pin moved in the same export/action")
+    source = models.CharField(max_length=30, blank=True, help_text="What made the change, e.g. admin-export")
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+
+    def __str__(self):
+        return f"#{self.scheduled_pin_id}: {self.from_status} → {self.to_status}"
+
+class StagedScheduledPin(models.Model):
+    """A SmartLoop slot awaiting review; promoting applies the campaign's diff to ScheduledPin (services.scheduling)."""
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='staged_pins')
+    pin = models.ForeignKey(PinTemplateVariation, on_delete=models.CASCADE, related_name='+')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='+')
+    publish_date = models.DateField()
+    campaign_day = models.PositiveSmallIntegerField(help_text="Campaign day from 1 to 30")
+    slot_number = models.PositiveSmallIntegerField(help_text="Slot position for the day")
+    window_start = models.DateField(help_text="Promoting replaces the campaign's unposted pins from this day…")
+    window_end = models.DateField(help_text="…through this day")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['campaign', 'publish_date', 'slot_number']
+        verbose_name = "staged scheduled pin"
+
+    def __str__(self):
+        return f"{self.pin_id} → board {self.board_id} on {self.publish_date} (staged)"
 
 class Keyword(models.Model):
     phrase = models.CharField(max_length=255, unique=True)
@@ -201,4 +273,19 @@ class RepurposedPostStatus(models.Model):
         ordering = ['-repurposed_at']
 
     def __str__(self):
-        return f"{self.variation} → {self.platform.upper()} ✅"
\ No newline at end of file
+        return f"{self.variation} → {self.platform.upper()} ✅"
+
+class DailyRepurposePick(models.Model):
+    """A precomputed "Daily 4" repurpose pick (see `manage.py precompute_daily_picks`)."""
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='daily_picks')
+    pick_date = models.DateField()
+    position = models.PositiveSmallIntegerField()
+    variation = models.ForeignKey(PinTemplateVariation, on_delete=models.CASCADE, related_name='daily_picks')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('campaign', 'pick_date', 'position')
+        ordering = ['-pick_date', 'campaign', 'position']
+
+    def __str__(self):
+        return f"{self.campaign} – {self.pick_date} #{self.position}"
@@ -1,11 +1,258 @@
-# api_client.py
-# Placeholder for Pinterest API integration logic
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from django.conf import settings
+
+from pinterest_scheduler.services.transitions import claim_for_publishing, finish_publishing
+
+# Pinterest API v5 client.
+#
+# One pooled httpx.Client per process (keep-alive connections shared by every
+# call), a token bucket so bursts stay inside the API quota, and pin creates
+# sent in batches over a small thread pool. 429s, 5xx and connection errors
+# retry with exponential backoff and jitter, honouring Retry-After.
+#
+# Pinterest's v5 API doesn't deduplicate creates, so retries can't be made
+# safe on the wire: publish_scheduled_pins() claims the rows first (status
+# 'publishing', see transitions.py) so each slot is sent by one job only, and
+# stores the returned pin id. Each create still carries an Idempotency-Key
+# per slot for gateways that honour one (the local stub does).
+#
+# `manage.py pinterest_stub` serves a local stand-in for the API (see
+# services/pinterest_stub.py); point PINTEREST_API_BASE at it to try a run.
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5  # seconds; doubles per attempt
+BACKOFF_CAP = 30.0
+
+# One create call's outcome. `key` is the idempotency key (one per ScheduledPin).
+PinResult = namedtuple('PinResult', 'key ok status remote_id error')
+
+
+class PinterestApiError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, at most ``burst`` saved up."""
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate, self.burst = float(rate), float(burst)
+        self._clock, self._sleep = clock, sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take one token if there is one: returns ``None``, else the seconds until one is due."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now >= self._blocked_until and self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+
+    def acquire(self):
+        """Take one token, sleeping until one is free. Returns the seconds waited."""
+        waited = 0.0
+        delay = self.try_acquire()
+        while delay is not None:
+            self._sleep(delay)
+            waited += delay
+            delay = self.try_acquire()
+        return waited
+
+    def pause(self, seconds):
+        """Hold every caller for ``seconds`` (the API said 429) and drop saved-up tokens."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            self._tokens = 0.0
+
 
 class PinterestApiClient:
-    def __init__(self):
-        # Placeholder for initialization logic
-        pass
+    def __init__(self, base_url=None, access_token=None, rate=None, burst=None,
+                 max_connections=None, max_retries=None, timeout=10.0, transport=None):
+        self.base_url = (base_url or settings.PINTEREST_API_BASE).rstrip('/')
+        self.max_connections = max_connections or settings.PINTEREST_MAX_CONNECTIONS
+        self.max_retries = settings.PINTEREST_MAX_RETRIES if max_retries is None else max_retries
+        self.bucket = TokenBucket(rate or settings.PINTEREST_RATE_PER_SECOND, burst or settings.PINTEREST_RATE_BURST)
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            headers={'Authorization': f"Bearer {access_token or settings.PINTEREST_ACCESS_TOKEN}"},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------
+    # Requests
+    # ----------------------
+
+    def _backoff(self, attempt, response=None):
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def request(self, method, path, json=None, idempotency_key=None):
+        """Send one throttled request, retrying transient failures. Returns the decoded JSON body."""
+        headers = {'Idempotency-Key': idempotency_key} if idempotency_key else None
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self._http.request(method, path, json=json, headers=headers)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise PinterestApiError(f"{method} {path}: {e}") from e
+                delay = self._backoff(attempt)
+                logger.warning("Pinterest %s %s failed (%s); retry %s in %.1fs", method, path, e, attempt + 1, delay)
+                time.sleep(delay)
+                continue
+
+            if response.status_code < 400:
+                return response.json() if response.content else {}
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                raise PinterestApiError(f"{method} {path}: HTTP {response.status_code} {response.text[:200]}",
+                                        status=response.status_code)
+            delay = self._backoff(attempt, response)
+            if response.status_code == 429:
+                self.bucket.pause(delay)  # every worker backs off, not just this one
+            logger.warning("Pinterest %s %s → %s; retry %s in %.1fs",
+                           method, path, response.status_code, attempt + 1, delay)
+            time.sleep(delay)
+
+    def create_pin(self, payload, idempotency_key=None):
+        return self.request('POST', '/pins', json=payload, idempotency_key=idempotency_key)
+
+    def _create_one(self, item):
+        key, payload = item
+        try:
+            body = self.create_pin(payload, idempotency_key=key)
+        except PinterestApiError as e:
+            return PinResult(key, False, e.status, None, str(e))
+        return PinResult(key, True, 201, str(body.get('id', '')), None)
+
+    def create_pins(self, items, batch_size=None):
+        """Create pins from ``(idempotency_key, payload)`` pairs; returns PinResults in order.
+
+        Batches of ``batch_size`` run over ``max_connections`` threads sharing
+        the pooled connections and the rate limiter. A failed pin doesn't stop the rest.
+        """
+        items = list(items)
+        batch_size = batch_size or settings.PINTEREST_BATCH_SIZE
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_connections, thread_name_prefix='pinterest')
+        results = []
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            results.extend(self._executor.map(self._create_one, batch))
+            logger.info("Pinterest batch %s–%s: %s ok", start + 1, start + len(batch),
+                        sum(r.ok for r in results[start:]))
+        return results
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_pinterest_client():
+    """The process-wide client (one connection pool and one rate limiter per worker)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not settings.PINTEREST_ACCESS_TOKEN:
+                logger.warning("PINTEREST_ACCESS_TOKEN is empty; requests will be rejected")
+            _client = PinterestApiClient()
+        return _client
+
+
+# ----------------------
+# ScheduledPin → API
+# ----------------------
+
+def idempotency_key(scheduled):
+    """Stable per slot: the same ScheduledPin on the same day always sends the same key.
+
+    Only a gateway that honours Idempotency-Key dedupes on it; Pinterest itself doesn't.
+    """
+    raw = f"{scheduled.pk}:{scheduled.pin_id}:{scheduled.board_id}:{scheduled.publish_date}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def pin_payload(scheduled):
+    """Create-pin body for a ScheduledPin (with ``pin__headline`` and ``board`` loaded).
+
+    Boards are addressed by slug, so keep each Board.slug equal to its Pinterest board id.
+    """
+    pin = scheduled.pin
+    payload = {
+        'board_id': scheduled.board.slug,
+        'title': (pin.title or pin.headline.text)[:100],
+        'description': (pin.description or '')[:500],
+        'link': pin.link,
+        'media_source': {'source_type': 'image_url', 'url': pin.image_url},
+    }
+    return {key: value for key, value in payload.items() if value}
+
+
+def create_scheduled_pins(scheduled_pins, client=None):
+    """Create ``scheduled_pins`` on Pinterest without touching their status.
+
+    Returns ``(created, failures)``: ``created`` maps ScheduledPin id → Pinterest
+    pin id, ``failures`` is a list of ``(ScheduledPin, PinResult)``.
+    """
+    scheduled_pins = list(scheduled_pins)
+    client = client or get_pinterest_client()
+    results = client.create_pins((idempotency_key(sp), pin_payload(sp)) for sp in scheduled_pins)
+
+    created = {sp.pk: result.remote_id for sp, result in zip(scheduled_pins, results) if result.ok}
+    failures = [(sp, result) for sp, result in zip(scheduled_pins, results) if not result.ok]
+    for sp, result in failures:
+        logger.error("Publishing scheduled pin %s failed: %s", sp.pk, result.error)
+    return created, failures
+
+
+def publish_scheduled_pins(scheduled_pins, client=None, source='api'):
+    """Claim, create and settle ``scheduled_pins``; returns ``(posted, failures)``.
 
-    def some_api_method(self):
-        # Placeholder for API method logic
-        pass
+    Only pins still 'scheduled' are claimed and sent, so a concurrent export or
+    publisher never sends the same slot. Successes are stored with their
+    Pinterest id and marked posted; failures go back to 'scheduled'.
+    """
+    scheduled_pins = list(scheduled_pins)
+    claimed = set(claim_for_publishing([sp.pk for sp in scheduled_pins], source=source))
+    created, failures = create_scheduled_pins([sp for sp in scheduled_pins if sp.pk in claimed], client=client)
+    posted = finish_publishing(created, [sp.pk for sp, _result in failures], source=source)
+    return posted, failures
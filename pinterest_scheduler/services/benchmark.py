@@ -0,0 +1,160 @@
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.utils.timezone import now
+
+from pinterest_scheduler.middleware import QueryRecorder
+
+# Scenarios run against whatever data is in the database (see `seed_synthetic`).
+# `{today}` and `{campaign}` are filled in at run time, and `{tmpdir}` is a
+# temporary directory removed after the run, so file-writing commands don't
+# leave output in the working directory. Commands run inside a rolled-back
+# transaction so destructive ones (auto_schedule_pins --reset) leave the data
+# set unchanged between runs.
+COMMANDS = [
+    ('cmd:pillar_summary', ['pillar_summary']),
+    ('cmd:recount', ['recount']),
+    ('cmd:update_keyword_tiers', ['update_keyword_tiers']),
+    ('cmd:precompute_daily_picks', ['precompute_daily_picks', '--no-hooks', '--force']),
+    ('cmd:auto_schedule_pins', ['auto_schedule_pins']),
+    ('cmd:export_today_pins', ['export_today_pins', '--output', '{tmpdir}/scheduled_pins_export.csv']),
+]
+
+URLS = [
+    ('changelist:campaign', '/admin/pinterest_scheduler/campaign/'),
+    ('changelist:pillar', '/admin/pinterest_scheduler/pillar/'),
+    ('changelist:headline', '/admin/pinterest_scheduler/headline/'),
+    ('changelist:variation', '/admin/pinterest_scheduler/pintemplatevariation/'),
+    ('changelist:keyword', '/admin/pinterest_scheduler/keyword/'),
+    ('changelist:scheduledpin', '/admin/pinterest_scheduler/scheduledpin/'),
+    ('dashboard:repurpose', '/admin-tools/repurpose-dashboard/'),
+    ('daily4', '/admin/pinterest_scheduler/pintemplatevariation/repurpose/random/?campaign={campaign}'),
+    ('export:today_csv', '/admin-tools/export_today_csv/?date={today}&all_hours=1'),
+    ('export:dry_run', '/admin-tools/dry_run_preview/?date={today}'),
+    ('export:bundle', '/admin-tools/bundle_export/?date={today}'),
+]
+
+
+def measure(func, alias='default'):
+    """Run ``func`` once and return wall time, query count and peak traced memory.
+
+    tracemalloc slows Python-heavy code down noticeably, so compare wall times
+    between reports from this runner rather than against production timings.
+    """
+    recorder = QueryRecorder()
+    tracemalloc.start()
+    start = time.perf_counter()
+    error = None
+    try:
+        with connections[alias].execute_wrapper(recorder):
+            result = func()
+    except Exception as exc:
+        result, error = None, f"{type(exc).__name__}: {exc}"
+    wall_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'wall_ms': round(wall_ms, 3),
+        'queries': recorder.count,
+        'sql_ms': round(recorder.total_ms, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'error': error,
+    }, result
+
+
+def run_command(args):
+    """Run a management command with its output captured, then roll it back."""
+    def run():
+        out = io.StringIO()
+        with transaction.atomic():
+            call_command(*args, stdout=out, stderr=out)
+            transaction.set_rollback(True)
+        return out.getvalue()
+    return run
+
+
+def fetch(client, url):
+    def run():
+        response = client.get(url)
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        if getattr(response, 'streaming', False):
+            b"".join(response.streaming_content)
+        return response.status_code
+    return run
+
+
+def summarise(runs):
+    walls = [r['wall_ms'] for r in runs]
+    return {
+        'runs': len(runs),
+        'wall_ms_min': min(walls),
+        'wall_ms_median': round(statistics.median(walls), 3),
+        'wall_ms_max': max(walls),
+        'queries': runs[-1]['queries'],
+        'sql_ms_median': round(statistics.median(r['sql_ms'] for r in runs), 3),
+        'peak_kb_max': max(r['peak_kb'] for r in runs),
+        'error': next((r['error'] for r in runs if r['error']), None),
+    }
+
+
+def run_scenarios(scenarios, repeat=3, warmup=1):
+    """``scenarios`` is a list of ``(name, callable)``; returns ``{name: summary}``."""
+    results = {}
+    for name, func in scenarios:
+        for _ in range(warmup):
+            measure(func)
+        runs = [measure(func)[0] for _ in range(repeat)]
+        results[name] = summarise(runs)
+    return results
+
+
+def dataset_size():
+    from pinterest_scheduler.models import (
+        Campaign, Headline, Keyword, Pillar, PinKeywordAssignment,
+        PinTemplateVariation, RepurposedPostStatus, ScheduledPin,
+    )
+    models = {
+        'campaigns': Campaign, 'pillars': Pillar, 'headlines': Headline,
+        'variations': PinTemplateVariation, 'keywords': Keyword,
+        'assignments': PinKeywordAssignment, 'scheduled_pins': ScheduledPin,
+        'repurpose_rows': RepurposedPostStatus,
+    }
+    return {name: model.objects.count() for name, model in models.items()}
+
+
+def build_report(results, label=None):
+    conn = connections['default']
+    return {
+        'label': label,
+        'created_at': now().isoformat(),
+        'python': platform.python_version(),
+        'database': conn.vendor,
+        'dataset': dataset_size(),
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current):
+    """Yield ``(name, metric, before, after, change_pct)`` for scenarios present in both."""
+    for name, after in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        for metric in ('wall_ms_median', 'queries', 'peak_kb_max'):
+            old, new = before.get(metric), after.get(metric)
+            if old is None or new is None:
+                continue
+            change = ((new - old) / old * 100) if old else (0.0 if new == old else float('inf'))
+            yield name, metric, old, new, change
+
+
+def load_report(path):
+    with open(path) as fh:
+        return json.load(fh)
@@ -0,0 +1,128 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Generation-keyed caching for admin lookups and aggregates.
+#
+# Each namespace (usually a model name) has a generation counter stored in the
+# shared cache. Cached values embed the generations they depend on in their key,
+# so bumping a counter on save/delete invalidates every dependent value in every
+# gunicorn worker at once; stale entries simply age out.
+
+DEFAULT_TIMEOUT = 60 * 10
+_MISSING = object()
+
+
+def _generation_key(namespace):
+    return f"gen:{namespace}"
+
+
+def _fresh_generation():
+    # Seeded from the clock so a counter that was evicted comes back higher
+    # than any value an old cache key could have embedded.
+    return int(time.time() * 1000)
+
+
+def get_generations(namespaces):
+    keys = {_generation_key(ns): ns for ns in namespaces}
+    found = cache.get_many(list(keys))
+    generations = {}
+    for key, ns in keys.items():
+        if key not in found:
+            cache.add(key, _fresh_generation(), None)
+            found[key] = cache.get(key)
+        generations[ns] = found[key]
+    return generations
+
+
+def bump_generation(namespace):
+    key = _generation_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_generation(), None)
+
+
+def bump_generation_on_commit(namespace, using=None):
+    """Bump ``namespace`` once the current transaction commits (at once outside one).
+
+    Bumping mid-transaction would let another worker cache the pre-commit rows
+    under the new generation, where they'd stay until the entry times out.
+    """
+    transaction.on_commit(lambda: bump_generation(namespace), using=using)
+
+
+# Backends kept in one process or on one host's disk: a generation bumped by a
+# web dyno never reaches a worker dyno through them.
+HOST_LOCAL_BACKENDS = ('LocMemCache', 'FileBasedCache', 'DummyCache')
+
+
+def cache_is_shared(alias='default'):
+    """Whether every host sees the same ``alias`` cache (Redis, Memcached, database)."""
+    return settings.CACHES[alias]['BACKEND'].rsplit('.', 1)[-1] not in HOST_LOCAL_BACKENDS
+
+
+def model_namespace(model):
+    return model._meta.model_name
+
+
+def _namespaces(depends_on):
+    return sorted(ns if isinstance(ns, str) else model_namespace(ns) for ns in depends_on)
+
+
+def _versioned_key(name, namespaces, generations):
+    return name + ":" + ":".join(f"{ns}.{generations[ns]}" for ns in namespaces)
+
+
+def cached_value(name, depends_on, compute, timeout=DEFAULT_TIMEOUT):
+    """Return ``compute()``, cached under ``name`` until any ``depends_on`` generation moves.
+
+    ``depends_on`` accepts namespace strings or model classes.
+    """
+    namespaces = _namespaces(depends_on)
+    generations = get_generations(namespaces)
+    key = _versioned_key(name, namespaces, generations)
+
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def aget_generations(namespaces):
+    keys = {_generation_key(ns): ns for ns in namespaces}
+    found = await cache.aget_many(list(keys))
+    generations = {}
+    for key, ns in keys.items():
+        if key not in found:
+            await cache.aadd(key, _fresh_generation(), None)
+            found[key] = await cache.aget(key)
+        generations[ns] = found[key]
+    return generations
+
+
+async def acached_value(name, depends_on, acompute, timeout=DEFAULT_TIMEOUT):
+    """Async ``cached_value``; ``acompute`` is a coroutine function. Shares keys with the sync version."""
+    namespaces = _namespaces(depends_on)
+    generations = await aget_generations(namespaces)
+    key = _versioned_key(name, namespaces, generations)
+
+    value = await cache.aget(key, _MISSING)
+    if value is _MISSING:
+        value = await acompute()
+        await cache.aset(key, value, timeout)
+    return value
+
+
+# ----------------------
+# Shared cached lookups
+# ----------------------
+
+def cached_boards():
+    """All boards (ordered by name), cached until a board is saved or deleted."""
+    from pinterest_scheduler.models import Board
+
+    return cached_value('boards', [Board], lambda: list(Board.objects.all()))
@@ -0,0 +1,155 @@
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from pinterest_scheduler.services.caching import bump_generation_on_commit, model_namespace
+
+# Progress counters live on Campaign / Pillar / Headline so admin columns are a plain
+# field read. Signals keep them current for single-row saves, deletes and moves to
+# another parent (recount_parents on the old and new one); bulk paths
+# (bulk_create, queryset.update) must call the bump_* helpers themselves.
+
+
+_local = threading.local()
+
+
+def signals_suspended():
+    return getattr(_local, 'suspended', False)
+
+
+@contextmanager
+def bulk_changes():
+    """Suspend signal-driven counter and cache upkeep for a large bulk operation.
+
+    Per-row signal work is skipped inside the block; on exit every counter is
+    rebuilt once with ``recount_all()`` and all cache generations are bumped
+    when the surrounding transaction commits.
+    """
+    from pinterest_scheduler.services.summary import invalidate_repurpose_rollup
+
+    previous = signals_suspended()
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = previous
+    if not previous:
+        recount_all()
+        for model in django_apps.get_app_config('pinterest_scheduler').get_models():
+            bump_generation_on_commit(model_namespace(model))
+        invalidate_repurpose_rollup()
+
+
+def _bump(queryset, field, delta):
+    if not delta:
+        return
+    # Greatest() keeps a drifted counter from trying to go negative on a PositiveIntegerField.
+    queryset.update(**{field: Greatest(F(field) + delta, Value(0))})
+    # update() sends no post_save, so drop cached aggregates that read these counters
+    # (once the caller's transaction commits, or readers could re-cache the old values).
+    bump_generation_on_commit(model_namespace(queryset.model))
+
+
+def bump_headline_counters(pillar_id, delta):
+    from pinterest_scheduler.models import Pillar
+
+    _bump(Pillar.objects.filter(pk=pillar_id), 'headline_count', delta)
+
+
+def bump_variation_counters(headline_id, delta):
+    """Adjust headline, pillar and campaign variation counters for ``headline_id``."""
+    from pinterest_scheduler.models import Campaign, Headline, Pillar
+
+    with transaction.atomic():
+        _bump(Headline.objects.filter(pk=headline_id), 'variation_count', delta)
+        _bump(Pillar.objects.filter(headlines=headline_id), 'variation_count', delta)
+        _bump(Campaign.objects.filter(pillars__headlines=headline_id), 'variation_count', delta)
+
+
+def bump_repurpose_counters(campaign_id, delta):
+    from pinterest_scheduler.models import Campaign
+
+    _bump(Campaign.objects.filter(pk=campaign_id), 'repurpose_count', delta)
+
+
+def bump_repurpose_counters_for_variation(variation_id, delta):
+    from pinterest_scheduler.models import Campaign
+
+    _bump(Campaign.objects.filter(pillars__headlines__variations=variation_id), 'repurpose_count', delta)
+
+
+def _count_subquery(model, fk_path):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk_path: OuterRef('pk')})
+            .order_by()
+            .values(fk_path)
+            .annotate(n=Count('pk'))
+            .values('n')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def _recount_columns():
+    """``(name, model, {counter: subquery})`` for every counter column, children first."""
+    from pinterest_scheduler.models import Campaign, Headline, Pillar, PinTemplateVariation, RepurposedPostStatus
+
+    return [
+        ('headlines', Headline, {
+            'variation_count': _count_subquery(PinTemplateVariation, 'headline'),
+        }),
+        ('pillars', Pillar, {
+            'headline_count': _count_subquery(Headline, 'pillar'),
+            'variation_count': _count_subquery(PinTemplateVariation, 'headline__pillar'),
+        }),
+        ('campaigns', Campaign, {
+            'variation_count': _count_subquery(PinTemplateVariation, 'headline__pillar__campaign'),
+            'repurpose_count': _count_subquery(RepurposedPostStatus, 'variation__headline__pillar__campaign'),
+        }),
+    ]
+
+
+def recount_all():
+    """Recompute every counter from scratch with one UPDATE per column."""
+    columns = _recount_columns()
+    with transaction.atomic():
+        updated = {name: model.objects.update(**counters) for name, model, counters in columns}
+    for _name, model, _counters in columns:
+        bump_generation_on_commit(model_namespace(model))
+    return updated
+
+
+def recount_parents(variation_ids=(), headline_ids=(), pillar_ids=(), campaign_ids=()):
+    """Recompute the counters of these rows and of every pillar / campaign above them.
+
+    Signals call this with both the old and the new parent when a row is moved
+    to another parent (a variation to another headline, a headline to another
+    pillar, ...), since the moved row's totals leave one and join the other.
+    """
+    from pinterest_scheduler.models import Headline, Pillar, PinTemplateVariation
+
+    def ids(values):
+        return {pk for pk in values if pk is not None}
+
+    headline_ids = ids(headline_ids) | ids(
+        PinTemplateVariation.objects.filter(pk__in=ids(variation_ids)).values_list('headline_id', flat=True)
+    )
+    pillar_ids = ids(pillar_ids) | ids(
+        Headline.objects.filter(pk__in=headline_ids).values_list('pillar_id', flat=True)
+    )
+    campaign_ids = ids(campaign_ids) | ids(
+        Pillar.objects.filter(pk__in=pillar_ids).values_list('campaign_id', flat=True)
+    )
+    targets = {'headlines': headline_ids, 'pillars': pillar_ids, 'campaigns': campaign_ids}
+
+    with transaction.atomic():
+        for name, model, counters in _recount_columns():
+            if targets[name]:
+                model.objects.filter(pk__in=targets[name]).update(**counters)
+                bump_generation_on_commit(model_namespace(model))
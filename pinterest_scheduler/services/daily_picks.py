@@ -0,0 +1,160 @@
+import asyncio
+import logging
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from pinterest_scheduler.models import Campaign, DailyRepurposePick, PinTemplateVariation, RepurposedPostStatus
+from pinterest_scheduler.services.hook_generator import (
+    agenerate_hook_for_pin,
+    generate_hook_for_pin,
+    get_async_openai_client,
+    get_openai_client,
+    looks_like_real_hook,
+)
+from pinterest_scheduler.services.repurpose import pick_daily_candidates, repurposed_count_subquery
+
+logger = logging.getLogger(__name__)
+
+DAILY_PICK_COUNT = 4
+# Concurrent OpenAI calls per request when filling hooks asynchronously.
+ASYNC_HOOK_CONCURRENCY = 4
+
+
+def daily_pick_seed(campaign_id, pick_date):
+    return f"{campaign_id}:{pick_date.isoformat()}"
+
+
+def _daily_picks_queryset(campaign_id, pick_date):
+    # A pick repurposed to every platform since it was stored drops off the
+    # page; precompute_daily_picks tops the set back up.
+    return (
+        DailyRepurposePick.objects
+        .filter(campaign_id=campaign_id, pick_date=pick_date)
+        .annotate(repurposed_count=repurposed_count_subquery('variation_id'))
+        .filter(repurposed_count__lt=len(RepurposedPostStatus.PLATFORM_CHOICES))
+        .select_related('variation__headline__pillar__campaign')
+        .order_by('position')
+    )
+
+
+def get_daily_picks(campaign_id, pick_date):
+    """Return the stored picks for a campaign/day that still need repurposing, in pick order (one query)."""
+    return [pick.variation for pick in _daily_picks_queryset(campaign_id, pick_date)]
+
+
+async def aget_daily_picks(campaign_id, pick_date):
+    return [pick.variation async for pick in _daily_picks_queryset(campaign_id, pick_date)]
+
+
+def store_daily_picks(campaign_id, pick_date, variations):
+    with transaction.atomic():
+        DailyRepurposePick.objects.filter(campaign_id=campaign_id, pick_date=pick_date).delete()
+        DailyRepurposePick.objects.bulk_create([
+            DailyRepurposePick(campaign_id=campaign_id, pick_date=pick_date, position=position, variation=variation)
+            for position, variation in enumerate(variations, start=1)
+        ])
+
+
+def fill_missing_hooks(pins, client=None, force=False):
+    """Generate and save hooks for pins that don't have a real one yet.
+
+    Returns the number of pins updated. Failures leave the hook empty rather
+    than saving a placeholder.
+    """
+    missing = [p for p in pins if force or not looks_like_real_hook(p.repurpose_hook)]
+    if not missing:
+        return 0
+
+    client = client or get_openai_client()
+    if client is None:
+        return 0
+
+    recent_hooks = list(_recent_hooks())
+
+    updated = 0
+    for pin in missing:
+        hook = (generate_hook_for_pin(pin, client=client, recent_hooks=recent_hooks, max_chars=50) or '').strip()
+        if not hook:
+            logger.error("daily picks hook gen failed pin=%s (empty hook)", pin.id)
+            continue
+
+        pin.repurpose_hook = hook
+        pin.repurpose_hook_generated_at = now()
+        pin.save(update_fields=['repurpose_hook', 'repurpose_hook_generated_at'])
+        recent_hooks.append(hook)
+        updated += 1
+    return updated
+
+
+def _recent_hooks(limit=20):
+    return (
+        PinTemplateVariation.objects.exclude(repurpose_hook__isnull=True)
+        .exclude(repurpose_hook='')
+        .order_by('-repurpose_hook_generated_at')
+        .values_list('repurpose_hook', flat=True)[:limit]
+    )
+
+
+async def afill_missing_hooks(pins, client=None, force=False):
+    """Async ``fill_missing_hooks``: the OpenAI calls for all pins run concurrently.
+
+    ``pins`` must have ``keywords`` prefetched and their headline/pillar/campaign
+    selected. Every pin sees the same recent-hook list, since they're generated
+    side by side rather than one after another.
+    """
+    missing = [p for p in pins if force or not looks_like_real_hook(p.repurpose_hook)]
+    if not missing:
+        return 0
+
+    client = client or get_async_openai_client()
+    if client is None:
+        return 0
+
+    recent_hooks = [hook async for hook in _recent_hooks()]
+    semaphore = asyncio.Semaphore(ASYNC_HOOK_CONCURRENCY)
+
+    async def fill(pin):
+        async with semaphore:
+            hook = (await agenerate_hook_for_pin(pin, client=client, recent_hooks=recent_hooks, max_chars=50) or '').strip()
+        if not hook:
+            logger.error("daily picks hook gen failed pin=%s (empty hook)", pin.id)
+            return 0
+        pin.repurpose_hook = hook
+        pin.repurpose_hook_generated_at = now()
+        await pin.asave(update_fields=['repurpose_hook', 'repurpose_hook_generated_at'])
+        return 1
+
+    return sum(await asyncio.gather(*(fill(pin) for pin in missing)))
+
+
+def precompute_daily_picks(campaign, pick_date, generate_hooks=True, force=False, client=None):
+    """Pick, store and (optionally) hook today's repurpose picks for one campaign.
+
+    Existing picks for the day are kept unless ``force`` is set; picks that
+    have since been repurposed everywhere are replaced, up to
+    ``DAILY_PICK_COUNT``, by variations from pillars not already picked.
+    Returns ``(picks, hooks_generated)``.
+    """
+    picks = [] if force else get_daily_picks(campaign.id, pick_date)
+    if len(picks) < DAILY_PICK_COUNT:
+        stored_ids = [] if force else list(
+            DailyRepurposePick.objects.filter(campaign=campaign, pick_date=pick_date).values_list('variation_id', flat=True)
+        )
+        extra = pick_daily_candidates(
+            campaign.id,
+            count=DAILY_PICK_COUNT - len(picks),
+            seed=daily_pick_seed(campaign.id, pick_date),
+            exclude_ids=stored_ids,
+            exclude_pillar_ids={pick.headline.pillar_id for pick in picks},
+        )
+        if extra or force:
+            picks += extra
+            store_daily_picks(campaign.id, pick_date, picks)
+
+    hooks_generated = fill_missing_hooks(picks, client=client) if generate_hooks else 0
+    return picks, hooks_generated
+
+
+def active_campaigns(on_date):
+    return Campaign.objects.filter(start_date__lte=on_date, end_date__gte=on_date)
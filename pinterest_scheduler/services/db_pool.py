@@ -0,0 +1,97 @@
+import contextvars
+import os
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+# Per-worker connection telemetry (DB_POOL_TELEMETRY). Every gunicorn worker has
+# its own copy, so `pool_stats()` reports on the process that served the request
+# (see `pid`).
+#
+# Nothing here touches the database: ConnectionTelemetryMiddleware wraps each
+# request and `connection_created` (sent whenever Django connects) tells it
+# whether the request opened a connection. Requests that queried over one that
+# was already open count as reused, requests that never queried aren't counted,
+# and each kind's average request time shows what connecting costs.
+# In pool mode every request checks a connection out of the pool, which Django
+# reports as a connect, so `opened` counts checkouts there and the pool's own
+# counters (`pool`) say how many real connections it made.
+
+_lock = threading.Lock()
+_stats = {
+    'requests': 0,
+    'reused': 0,
+    'opened': 0,
+    'request_ms_reused': 0.0,
+    'request_ms_opened': 0.0,
+}
+
+# The aliases connected during the current request; set by the middleware.
+request_connects = contextvars.ContextVar('request_connects', default=None)
+
+
+def note_connection_created(sender, connection, **kwargs):
+    """``connection_created`` receiver: attribute the connect to the running request."""
+    connects = request_connects.get()
+    if connects is not None:
+        connects.append(connection.alias)
+
+
+class RequestTelemetry:
+    """One request's connection use: an ``execute_wrapper`` that notes any query, plus its connects."""
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self.connects = []
+        self.queried = False
+        self.wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queried = True
+        return execute(sql, params, many, context)
+
+    # watch/unwatch run in the thread that runs the request's queries (via
+    # sync_to_async under ASGI): Django's connections are per thread.
+    def watch(self):
+        self.wrapper = connections[self.alias].execute_wrapper(self)
+        self.wrapper.__enter__()
+
+    def unwatch(self):
+        self.wrapper.__exit__(None, None, None)
+
+    def record(self, elapsed_ms):
+        if not (self.connects or self.queried):
+            return
+        kind = 'opened' if self.connects else 'reused'
+        with _lock:
+            _stats['requests'] += 1
+            _stats[kind] += 1
+            _stats[f'request_ms_{kind}'] += elapsed_ms
+
+
+def reset_stats():
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0 if isinstance(_stats[key], int) else 0.0
+
+
+def pool_stats(alias='default'):
+    with _lock:
+        stats = dict(_stats)
+    for kind in ('reused', 'opened'):
+        total = stats.pop(f'request_ms_{kind}')
+        stats[f'request_ms_{kind}_avg'] = round(total / stats[kind], 3) if stats[kind] else 0.0
+    stats['pid'] = os.getpid()
+    stats['mode'] = getattr(settings, 'DB_POOL_MODE', 'none')
+    stats['telemetry'] = getattr(settings, 'DB_POOL_TELEMETRY', False)
+
+    db_settings = connections[alias].settings_dict
+    stats['conn_max_age'] = db_settings.get('CONN_MAX_AGE')
+    stats['conn_health_checks'] = db_settings.get('CONN_HEALTH_CHECKS')
+
+    # psycopg 3 pool (DB_POOL_MODE=pool) exposes its own counters.
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is not None and hasattr(pool, 'get_stats'):
+        stats['pool'] = pool.get_stats()
+    return stats
@@ -1,7 +1,10 @@
 import csv
+from django.db import transaction
 from django.utils.timezone import now
 from django.conf import settings
 from pinterest_scheduler.models import ScheduledPin
+from pinterest_scheduler.services.slots import ensure_allocated
+from pinterest_scheduler.services.transitions import claim_for_export
 from pathlib import Path
 
 EXPORT_HEADERS = [
@@ -14,14 +17,35 @@ EXPORT_HEADERS = [
     "Keywords"
 ]
 
-def export_scheduled_pins_to_csv(target_date=None, output_path="scheduled_pins_export.csv"):
+def export_scheduled_pins_to_csv(target_date=None, output_path="scheduled_pins_export.csv", dry_run=False):
+    """Mark the day's not-yet-exported pins exported and write them to ``output_path``.
+
+    The pins are claimed first (services.transitions.claim_for_export) and only
+    those are written, so a pin a publisher takes meanwhile isn't exported as
+    well; a failed write rolls the claim back. With ``dry_run`` the file is
+    written but nothing in the database changes: pins without a publish time
+    yet get their date only. Returns ``(path, count)``.
+    """
     if not target_date:
         target_date = now().date()
 
-    pins = ScheduledPin.objects.filter(publish_date=target_date, posted=False).select_related('pin', 'board')
-    
+    if not dry_run:
+        ensure_allocated([target_date])
+    pins = ScheduledPin.objects.filter(publish_date=target_date, status='scheduled')
     output_file = Path(settings.BASE_DIR) / output_path
 
+    with transaction.atomic():
+        if not dry_run:
+            pins = ScheduledPin.objects.filter(id__in=claim_for_export(pins, source='export-command'))
+        count = _write_csv(
+            output_file,
+            pins.select_related('pin__headline', 'board').prefetch_related('pin__keywords').order_by('publish_at', 'id'),
+        )
+    return output_file, count
+
+
+def _write_csv(output_file, pins):
+    count = 0
     with open(output_file, mode='w', newline='', encoding='utf-8') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=EXPORT_HEADERS)
         writer.writeheader()
@@ -29,13 +53,13 @@ def export_scheduled_pins_to_csv(target_date=None, output_path="scheduled_pins_e
         for scheduled_pin in pins:
             pin = scheduled_pin.pin
             writer.writerow({
-                "Title": pin.headline.text[:100],
-                "Media URL": pin.image_url(),  # Make sure image is hosted and public
+                "Title": (pin.title or pin.headline.text)[:100],
+                "Media URL": pin.image_url,  # Make sure image is hosted and public
                 "Pinterest board": scheduled_pin.board.name,
                 "Description": pin.description[:500],
                 "Link": pin.link or "",
-                "Publish date": scheduled_pin.publish_date.isoformat(),
-                "Keywords": pin.keywords
+                "Publish date": scheduled_pin.publish_at.isoformat() if scheduled_pin.publish_at else scheduled_pin.publish_date.isoformat(),
+                "Keywords": ", ".join(kw.phrase for kw in pin.keywords.all()),
             })
-
-    return output_file
\ No newline at end of file
+            count += 1
+    return count
@@ -3,10 +3,27 @@ import random
 import re
 from typing import Any, Dict, List, Optional, Sequence
 
+from django.conf import settings
+
+try:
+    from openai import AsyncOpenAI, OpenAI
+except Exception:  # pragma: no cover
+    AsyncOpenAI = OpenAI = None
+
 # pinterest_scheduler/services/hook_generator.py
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_HOOKS = {
+    "profit/loss question",
+    "industry stat trivia",
+    "origin of the dish",
+    "ingredient origin or source quiz",
+    "tool-for-task quiz",
+    "hack-or-myth challenge",
+    "flavour pair challenge",
+}
+
 _BAD_END_WORDS = {
     "a", "an", "the", "and", "or", "but",
     "to", "of", "in", "on", "at", "for", "from", "by",
@@ -112,11 +129,16 @@ def build_context(pin) -> Dict[str, Any]:
     campaign_obj = getattr(pillar_obj, "campaign", None) if pillar_obj else None
 
     # Keywords can be missing if relation isn't available.
+    # Uses prefetched keywords when available, so async callers (which can't
+    # run a lazy query here) and the Daily 4 page don't pay a query per pin.
     keywords: List[str] = []
     try:
         kw_qs = getattr(pin, "keywords", None)
         if kw_qs is not None:
-            keywords = list(kw_qs.values_list("phrase", flat=True)[:12])
+            if "keywords" in getattr(pin, "_prefetched_objects_cache", {}):
+                keywords = [kw.phrase for kw in kw_qs.all()][:12]
+            else:
+                keywords = list(kw_qs.values_list("phrase", flat=True)[:12])
     except Exception:
         keywords = []
 
@@ -131,33 +153,17 @@ def build_context(pin) -> Dict[str, Any]:
         "keywords": [k for k in (_one_line(x) for x in keywords) if k],
     }
 
-def generate_hook_openai(
-    context: Dict[str, Any],
-    client,
-    recent_hooks: Optional[Sequence[str]] = None,
-    max_chars: int = 50,
-    model: str = "gpt-4.1-mini",
-    temperature: float = 0.9,
-) -> str:
-    recent_hooks_list = [
-        _one_line(h) for h in (recent_hooks or [])
-        if _one_line(h)
-    ]
-
+def _build_prompt(context: Dict[str, Any], recent_hooks_list: List[str], max_chars: int) -> str:
     pillar = _one_line(context.get("pillar", ""))
     tagline = _one_line(context.get("tagline", ""))
     question = _one_line(context.get("question", ""))
     description = _one_line(context.get("description", ""))
-    keywords = context.get("keywords") or []
-
-    if not isinstance(keywords, list):
-        keywords = [str(keywords)]
-    keywords = [_one_line(k) for k in keywords if _one_line(k)]
+    keywords = _context_keywords(context)
 
     pillar_line = (f"{pillar} — {tagline}" if tagline else pillar).strip()
     recent_block = list(recent_hooks_list[-12:])
 
-    prompt = f"""
+    return f"""
 Write ONE scroll-stopping hook for a short-form culinary trivia video (Ruoth).
 
 Audience: chefs, bakers, culinary pros + serious home bakers.
@@ -187,23 +193,69 @@ Keywords: {", ".join(keywords)}
 Return ONLY the hook text. No quotes. No extra lines.
 """.strip()
 
-    def _fallback_hook() -> str:
-        # Safe fallback that doesn't reveal the answer.
-        if keywords:
-            token = keywords[0]
-            options = [
-                f"Still guessing {token} basics?",
-                f"Ever messed up {token} on a bake?",
-                f"Pro bakers don’t guess {token}.",
-            ]
-            return _clamp_chars(random.choice(options), max_chars=max_chars)
 
-        # If the pillar suggests money/pricing, push that angle.
-        pillar_l = (pillar or "").lower()
-        if any(w in pillar_l for w in ["profit", "cost", "pricing", "business", "margin"]):
-            return _clamp_chars("Still guessing profits by eye?", max_chars=max_chars)
+def _context_keywords(context: Dict[str, Any]) -> List[str]:
+    keywords = context.get("keywords") or []
+    if not isinstance(keywords, list):
+        keywords = [str(keywords)]
+    return [_one_line(k) for k in keywords if _one_line(k)]
+
+
+def _fallback_hook(context: Dict[str, Any], max_chars: int) -> str:
+    # Safe fallback that doesn't reveal the answer.
+    keywords = _context_keywords(context)
+    if keywords:
+        token = keywords[0]
+        options = [
+            f"Still guessing {token} basics?",
+            f"Ever messed up {token} on a bake?",
+            f"Pro bakers don’t guess {token}.",
+        ]
+        return _clamp_chars(random.choice(options), max_chars=max_chars)
+
+    # If the pillar suggests money/pricing, push that angle.
+    pillar_l = _one_line(context.get("pillar", "")).lower()
+    if any(w in pillar_l for w in ["profit", "cost", "pricing", "business", "margin"]):
+        return _clamp_chars("Still guessing profits by eye?", max_chars=max_chars)
+
+    return _clamp_chars("Still guessing this ingredient?", max_chars=max_chars)
+
+
+def _attempts(prompt: str, temperature: float, max_chars: int):
+    return [
+        (prompt, temperature),
+        (prompt + f"\n\nRewrite: complete thought, no dangling ending, <= {max_chars} chars.", temperature * 0.85),
+        (prompt + f"\n\nRewrite: sharp, complete, question OR statement, <= {max_chars} chars.", temperature * 0.7),
+    ]
+
+
+def _recent_list(recent_hooks: Optional[Sequence[str]]) -> List[str]:
+    return [_one_line(h) for h in (recent_hooks or []) if _one_line(h)]
+
+
+def _accept(hook: str, idx: int, max_chars: int, recent_set: set) -> bool:
+    if _is_good_hook(hook, max_chars=max_chars, recent=recent_set):
+        logger.info("hook_generator: accepted hook attempt=%s len=%s", idx, len(hook))
+        return True
+    logger.info(
+        "hook_generator: rejected hook attempt=%s len=%s hook=%r",
+        idx,
+        len(hook or ""),
+        hook,
+    )
+    return False
 
-        return _clamp_chars("Still guessing this ingredient?", max_chars=max_chars)
+
+def generate_hook_openai(
+    context: Dict[str, Any],
+    client,
+    recent_hooks: Optional[Sequence[str]] = None,
+    max_chars: int = 50,
+    model: str = "gpt-4.1-mini",
+    temperature: float = 0.9,
+) -> str:
+    recent_hooks_list = _recent_list(recent_hooks)
+    prompt = _build_prompt(context, recent_hooks_list, max_chars)
 
     def _call(prompt_text: str, temp: float) -> str:
         resp = client.responses.create(
@@ -216,27 +268,171 @@ Return ONLY the hook text. No quotes. No extra lines.
     try:
         recent_set = {h.lower().strip() for h in recent_hooks_list if h}
 
-        attempts = [
-            (prompt, temperature),
-            (prompt + f"\n\nRewrite: complete thought, no dangling ending, <= {max_chars} chars.", temperature * 0.85),
-            (prompt + f"\n\nRewrite: sharp, complete, question OR statement, <= {max_chars} chars.", temperature * 0.7),
-        ]
-
-        for idx, (p, t) in enumerate(attempts, start=1):
+        for idx, (p, t) in enumerate(_attempts(prompt, temperature, max_chars), start=1):
             hook = _call(p, t)
-            if _is_good_hook(hook, max_chars=max_chars, recent=recent_set):
-                logger.info("hook_generator: accepted hook attempt=%s len=%s", idx, len(hook))
+            if _accept(hook, idx, max_chars, recent_set):
                 return hook
-            logger.info(
-                "hook_generator: rejected hook attempt=%s len=%s hook=%r",
-                idx,
-                len(hook or ""),
-                hook,
-            )
 
         # If model keeps failing, use a deterministic safe fallback.
-        return _fallback_hook()
+        return _fallback_hook(context, max_chars)
+
+    except Exception as e:
+        logger.exception("Hook generation failed: %s", e)
+        return _fallback_hook(context, max_chars)
+
+
+async def agenerate_hook_openai(
+    context: Dict[str, Any],
+    client,
+    recent_hooks: Optional[Sequence[str]] = None,
+    max_chars: int = 50,
+    model: str = "gpt-4.1-mini",
+    temperature: float = 0.9,
+) -> str:
+    """Async twin of ``generate_hook_openai`` for an ``AsyncOpenAI`` client."""
+    recent_hooks_list = _recent_list(recent_hooks)
+    prompt = _build_prompt(context, recent_hooks_list, max_chars)
+
+    try:
+        recent_set = {h.lower().strip() for h in recent_hooks_list if h}
+
+        for idx, (p, t) in enumerate(_attempts(prompt, temperature, max_chars), start=1):
+            resp = await client.responses.create(model=model, input=p, temperature=float(t))
+            hook = _clamp_chars(getattr(resp, "output_text", "") or "", max_chars=max_chars)
+            if _accept(hook, idx, max_chars, recent_set):
+                return hook
+
+        return _fallback_hook(context, max_chars)
 
     except Exception as e:
         logger.exception("Hook generation failed: %s", e)
-        return _fallback_hook()
\ No newline at end of file
+        return _fallback_hook(context, max_chars)
+
+
+def get_openai_client():
+    """Return an OpenAI client or None if not configured."""
+    api_key = getattr(settings, 'OPENAI_API_KEY', None)
+    if not api_key:
+        logger.error("OPENAI_API_KEY missing in Django settings")
+        return None
+    if OpenAI is None:
+        logger.error("OpenAI SDK import failed (OpenAI is None)")
+        return None
+    try:
+        logger.info("OpenAI client initialised for hook generation")
+        return OpenAI(api_key=api_key)
+    except Exception as e:
+        logger.exception("Failed to init OpenAI client: %s", e)
+        return None
+
+
+def get_async_openai_client():
+    """Return an AsyncOpenAI client or None if not configured."""
+    api_key = getattr(settings, 'OPENAI_API_KEY', None)
+    if not api_key:
+        logger.error("OPENAI_API_KEY missing in Django settings")
+        return None
+    if AsyncOpenAI is None:
+        logger.error("OpenAI SDK import failed (AsyncOpenAI is None)")
+        return None
+    try:
+        return AsyncOpenAI(api_key=api_key)
+    except Exception as e:
+        logger.exception("Failed to init AsyncOpenAI client: %s", e)
+        return None
+
+
+def looks_like_real_hook(text: str) -> bool:
+    """Heuristic: distinguish a real AI hook from placeholders/labels.
+
+    We treat short labels like "profit/loss question" or "origin of the dish" as NOT a hook.
+    """
+    t = (text or "").strip()
+    if not t:
+        return False
+
+    # Common placeholder labels / buckets that have shown up in DB
+    if t.lower() in _PLACEHOLDER_HOOKS:
+        return False
+
+    # Too short to be a hook
+    if len(t) < 18:
+        return False
+
+    # Hooks usually read like a sentence / question
+    if not any(ch in t for ch in ["?", "!", "."]):
+        return False
+
+    return True
+
+
+def generate_hook_for_pin(pin, client=None, recent_hooks=None, max_chars: int = 50) -> str:
+    """Generate a punchy hook (<= max_chars) for a PinTemplateVariation.
+
+    IMPORTANT:
+    - If OpenAI is not configured or generation fails, return an empty string.
+    - We NEVER fall back to headline/title/tagline because that pollutes the DB/UI.
+    """
+    recent_hooks = recent_hooks or []
+
+    pin_id = getattr(pin, 'id', None)
+    logger.info("Hook gen start pin=%s recent_hooks=%s", pin_id, len(recent_hooks))
+
+    # Build canonical context from the model
+    ctx = build_context(pin)
+
+    # If OpenAI isn't available, do not fabricate a "hook".
+    client = client or get_openai_client()
+    if client is None:
+        logger.error("Hook gen skipped pin=%s (no OpenAI client)", pin_id)
+        return ""
+
+    try:
+        hook = generate_hook_openai(
+            context=ctx,
+            client=client,
+            recent_hooks=recent_hooks,
+            max_chars=max_chars,
+        )
+    except Exception as e:
+        logger.exception("Hook gen failed pin=%s: %s", pin_id, e)
+        return ""
+
+    hook = (hook or "").strip()[:max_chars]
+    if hook:
+        logger.info("Hook gen ok pin=%s len=%s", pin_id, len(hook))
+    else:
+        logger.error("Hook gen empty pin=%s", pin_id)
+    return hook
+
+
+async def agenerate_hook_for_pin(pin, client=None, recent_hooks=None, max_chars: int = 50) -> str:
+    """Async ``generate_hook_for_pin``. Prefetch ``keywords`` and select the
+    headline/pillar/campaign first: lazy relation loads aren't allowed here.
+    """
+    recent_hooks = recent_hooks or []
+    pin_id = getattr(pin, 'id', None)
+    ctx = build_context(pin)
+
+    client = client or get_async_openai_client()
+    if client is None:
+        logger.error("Hook gen skipped pin=%s (no OpenAI client)", pin_id)
+        return ""
+
+    try:
+        hook = await agenerate_hook_openai(
+            context=ctx,
+            client=client,
+            recent_hooks=recent_hooks,
+            max_chars=max_chars,
+        )
+    except Exception as e:
+        logger.exception("Hook gen failed pin=%s: %s", pin_id, e)
+        return ""
+
+    hook = (hook or "").strip()[:max_chars]
+    if hook:
+        logger.info("Hook gen ok pin=%s len=%s", pin_id, len(hook))
+    else:
+        logger.error("Hook gen empty pin=%s", pin_id)
+    return hook
@@ -0,0 +1,133 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pinterest_scheduler.services.api_client import TokenBucket
+
+# A local stand-in for the parts of the Pinterest API v5 the client uses
+# (POST /pins, GET /pins/<id>), for trying publish runs without a real account.
+#
+# It checks the bearer token, answers a repeated Idempotency-Key with the
+# original pin instead of creating another, and can be made to misbehave:
+# its own rate limit (429 + Retry-After), a share of random 503s, or 503s for
+# the next ``fail_next`` requests (handy in tests).
+# GET /_stub/stats reports what it has seen.
+
+API_PREFIX = '/v5'
+
+
+class StubState:
+    def __init__(self, token='', rate=None, burst=10, fail_rate=0.0, fail_next=0):
+        self.token = token
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.fail_rate = fail_rate
+        self.fail_next = fail_next
+        self.pins = {}
+        self.by_key = {}
+        self.stats = {'requests': 0, 'created': 0, 'replayed': 0, 'throttled': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so the client's pool is exercised
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body if body is not None else {}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _gate(self):
+        """Auth, rate limit and injected failures; returns True once a response has been sent."""
+        state = self.state
+        with state.lock:
+            state.stats['requests'] += 1
+        if state.token and self.headers.get('Authorization') != f"Bearer {state.token}":
+            self._send(401, {'code': 2, 'message': 'Authentication failed.'})
+            return True
+        if state.bucket is not None:
+            wait = state.bucket.try_acquire()
+            if wait is not None:
+                with state.lock:
+                    state.stats['throttled'] += 1
+                self._send(429, {'code': 8, 'message': 'Rate limit exceeded.'}, {'Retry-After': f"{wait:.2f}"})
+                return True
+        with state.lock:
+            fail = state.fail_next > 0 or (state.fail_rate and random.random() < state.fail_rate)
+            if fail:
+                state.fail_next = max(state.fail_next - 1, 0)
+                state.stats['failed'] += 1
+        if fail:
+            self._send(503, {'code': 1, 'message': 'Service unavailable (stub).'})
+            return True
+        return False
+
+    def do_GET(self):
+        if self.path == '/_stub/stats':
+            with self.state.lock:
+                return self._send(200, dict(self.state.stats, pins=len(self.state.pins)))
+        if self._gate():
+            return
+        prefix = f"{API_PREFIX}/pins/"
+        pin = self.state.pins.get(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+        if pin is None:
+            return self._send(404, {'code': 50, 'message': 'Pin not found.'})
+        self._send(200, pin)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length)
+        if self._gate():
+            return
+        if self.path != f"{API_PREFIX}/pins":
+            return self._send(404, {'code': 404, 'message': 'Not found.'})
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError:
+            return self._send(400, {'code': 1, 'message': 'Invalid JSON.'})
+        if not body.get('board_id') or not (body.get('media_source') or {}).get('url'):
+            return self._send(400, {'code': 1, 'message': 'board_id and media_source.url are required.'})
+
+        state = self.state
+        key = self.headers.get('Idempotency-Key')
+        with state.lock:
+            replayed = bool(key) and key in state.by_key
+            if replayed:
+                state.stats['replayed'] += 1
+                pin = state.pins[state.by_key[key]]
+            else:
+                pin_id = str(len(state.pins) + 1)
+                pin = dict(body, id=pin_id, created_at=time.strftime('%Y-%m-%dT%H:%M:%S'))
+                state.pins[pin_id] = pin
+                if key:
+                    state.by_key[key] = pin_id
+                state.stats['created'] += 1
+        self._send(201, pin, {'Idempotent-Replayed': 'true'} if replayed else None)
+
+
+def make_stub_server(host='127.0.0.1', port=0, **options):
+    """A ready-to-serve stub; ``port=0`` picks a free port. Options go to :class:`StubState`."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState(**options)
+    return server
+
+
+def start_stub_server(host='127.0.0.1', port=0, **options):
+    """Serve a stub on a background thread; returns ``(server, base_url)``. Stop with ``server.shutdown()``."""
+    server = make_stub_server(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{API_PREFIX}"
@@ -0,0 +1,220 @@
+import heapq
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pinterest_scheduler.services.api_client import create_scheduled_pins, get_pinterest_client, idempotency_key, pin_payload
+from pinterest_scheduler.services.caching import cache_is_shared, get_generations, model_namespace
+from pinterest_scheduler.services.slots import pins_due
+from pinterest_scheduler.services.transitions import claim_for_publishing, finish_publishing
+
+# Publishing daemon (`manage.py publish_daemon`).
+#
+# The next few hours of scheduled pins sit in a min-heap of (publish_at, id)
+# and the daemon sleeps until the head is due, so an idle schedule costs
+# nothing. Due pins are claimed ('publishing', see transitions.py) before the
+# publisher sees them, so a second daemon, `publish_pins` or a CSV export can't
+# send them too; once the publisher returns, accepted pins are marked posted and
+# the rest released in one transaction.
+#
+# The heap is reloaded (one range query on the publish_at index, bounded by the
+# horizon) only when the loaded horizon runs out or the ScheduledPin cache
+# generation moves. Every schedule write bumps that counter once it has
+# committed (signals, bulk scheduling, slot allocation, status transitions), so
+# a reload never files old rows under a new generation, and between writes a
+# wake-up costs one cache read and no SQL.
+#
+# That needs a cache every host shares (REDIS_URL). With a host-local one (the
+# file cache, when the daemon runs as its own dyno) a web dyno's bump never
+# arrives, so the queue reloads on every wake-up instead (at least every
+# CHECK_EVERY seconds): one indexed range query, and a pin scheduled or
+# re-timed inside the horizon is still seen within CHECK_EVERY.
+
+HORIZON = timedelta(hours=6)
+CATCH_UP = timedelta(hours=1)  # on (re)start, still publish pins this overdue; older ones wait for a human
+CHECK_EVERY = 30  # seconds between generation checks while sleeping
+RETRY_DELAY = timedelta(minutes=5)  # before a failed pin is offered to the publisher again
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------
+# Publishers
+# ----------------------
+
+class Publisher:
+    """Sends due ScheduledPins (``pin__headline`` and ``board`` loaded) somewhere.
+
+    ``publish()`` returns ``(published, failures)``: ``published`` maps
+    ScheduledPin id → remote id (or ``''``), ``failures`` is a list of
+    ``(ScheduledPin, reason)``. The daemon marks the published pins posted and
+    retries the failures later.
+    """
+    name = 'publisher'
+
+    def publish(self, scheduled_pins):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ApiPublisher(Publisher):
+    name = 'api'
+
+    def __init__(self, client=None):
+        self.client = client or get_pinterest_client()
+
+    def publish(self, scheduled_pins):
+        return create_scheduled_pins(scheduled_pins, client=self.client)
+
+
+class FileSinkPublisher(Publisher):
+    """Appends one JSON line per pin (the API payload plus its id and idempotency key)."""
+    name = 'file'
+
+    def __init__(self, path='published_pins.jsonl'):
+        self.path = path
+
+    def publish(self, scheduled_pins):
+        with open(self.path, 'a', encoding='utf-8') as sink:
+            for sp in scheduled_pins:
+                record = {
+                    'scheduled_pin': sp.pk,
+                    'publish_at': sp.publish_at.isoformat(),
+                    'idempotency_key': idempotency_key(sp),
+                    **pin_payload(sp),
+                }
+                sink.write(json.dumps(record) + '\n')
+        return {sp.pk: '' for sp in scheduled_pins}, []
+
+
+PUBLISHERS = {'api': ApiPublisher, 'file': FileSinkPublisher}
+
+
+def get_publisher(name=None, **options):
+    """A publisher by short name (``api``, ``file``) or dotted path to a Publisher subclass."""
+    name = name or settings.PUBLISH_DAEMON_PUBLISHER
+    publisher_class = PUBLISHERS.get(name) or import_string(name)
+    return publisher_class(**options)
+
+
+# ----------------------
+# Queue
+# ----------------------
+
+def schedule_generation():
+    from pinterest_scheduler.models import ScheduledPin
+
+    namespace = model_namespace(ScheduledPin)
+    return get_generations([namespace])[namespace]
+
+
+class PublishQueue:
+    """Upcoming scheduled pins as a min-heap of ``(publish_at, id)``."""
+
+    def __init__(self, horizon=HORIZON, catch_up=CATCH_UP, watch_generation=None):
+        self.horizon, self.catch_up = horizon, catch_up
+        # False: reload on every check, for caches other hosts' bumps don't reach.
+        self.watch_generation = cache_is_shared() if watch_generation is None else watch_generation
+        self.heap = []
+        self.loaded_until = None
+        self.generation = None
+        self.held = {}  # id → not before; failed pins survive reloads without being retried at once
+
+    def stale(self, now):
+        if self.loaded_until is None or now >= self.loaded_until or not self.watch_generation:
+            return True
+        return schedule_generation() != self.generation
+
+    def reload(self, now):
+        # Read the generation first: a write landing mid-query bumps it again and triggers another reload.
+        self.generation = schedule_generation()
+        self.loaded_until = now + self.horizon
+        rows = pins_due(now - self.catch_up, self.loaded_until).values_list('publish_at', 'id')
+        self.held = {pk: until for pk, until in self.held.items() if until > now}
+        self.heap = [(max(at, self.held.get(pk, at)), pk) for at, pk in rows]
+        heapq.heapify(self.heap)
+        return len(self.heap)
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        ids = []
+        while self.heap and self.heap[0][0] <= now:
+            ids.append(heapq.heappop(self.heap)[1])
+        return ids
+
+    def hold(self, ids, until):
+        for pk in ids:
+            self.held[pk] = until
+            heapq.heappush(self.heap, (until, pk))
+
+
+# ----------------------
+# Daemon
+# ----------------------
+
+def dispatch(ids, publisher, now):
+    """Claim the still-due pins among ``ids``, publish them and settle the claim.
+
+    Pins re-timed, posted, deleted or claimed elsewhere since the heap was
+    loaded are skipped. Returns ``(posted, failed_ids)``.
+    """
+    from pinterest_scheduler.models import ScheduledPin
+
+    source = f"daemon-{publisher.name}"
+    claimed = claim_for_publishing(
+        ScheduledPin.objects.filter(id__in=ids, status='scheduled', publish_at__lte=now), source=source
+    )
+    if not claimed:
+        return 0, []
+    pins = list(
+        ScheduledPin.objects.filter(id__in=claimed)
+        .select_related('pin__headline', 'board')
+        .order_by('publish_at', 'id')
+    )
+    try:
+        published, failures = publisher.publish(pins)
+    except Exception:
+        logger.exception("Publisher %s failed on %s pins", publisher.name, len(pins))
+        published, failures = {}, [(sp, 'publisher error') for sp in pins]
+    failed = [sp.pk for sp, _reason in failures]
+    return finish_publishing(published, failed, source=source), failed
+
+
+def run_daemon(publisher, queue=None, check_every=CHECK_EVERY, retry_delay=RETRY_DELAY, once=False, stop=None):
+    """Publish pins as they come due until ``stop`` (a threading.Event) is set.
+
+    With ``once=True``, publish whatever is due now and return. Returns the
+    number of pins posted.
+    """
+    queue = queue or PublishQueue()
+    stop = stop or threading.Event()
+    total = 0
+    while not stop.is_set():
+        now = timezone.now()
+        if queue.stale(now):
+            loaded = queue.reload(now)
+            logger.info("Publish queue reloaded: %s pins until %s", loaded, queue.loaded_until)
+
+        due = queue.pop_due(now)
+        if due:
+            posted, failed = dispatch(due, publisher, now)
+            total += posted
+            if failed:
+                queue.hold(failed, now + retry_delay)
+            logger.info("Published %s of %s due pins (%s failed)", posted, len(due), len(failed))
+        if once:
+            break
+
+        # Sleep until the next pin, the end of the horizon or the next generation check.
+        wake = min(filter(None, [queue.next_due(), queue.loaded_until, now + timedelta(seconds=check_every)]))
+        stop.wait(max((wake - timezone.now()).total_seconds(), 0))
+    return total
@@ -0,0 +1,137 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import CharField, Count, F, IntegerField, OuterRef, QuerySet, Subquery, Value, Window
+from django.db.models.functions import MD5, Cast, Coalesce, Concat, Random, RowNumber
+from django.utils import timezone
+
+from pinterest_scheduler.models import PinTemplateVariation, RepurposedPostStatus
+from pinterest_scheduler.services.counters import bump_repurpose_counters
+from pinterest_scheduler.services.summary import invalidate_repurpose_rollup
+
+
+# Rows per INSERT in _insert_new_statuses (5 parameters each; well inside SQLite's limit).
+INSERT_BATCH = 500
+
+
+def _insert_new_statuses(rows):
+    """Insert ``(variation_id, platform, campaign_id)`` rows, skipping ones that already exist.
+
+    Returns the variation id of every row this call inserted. ``bulk_create``
+    with ``ignore_conflicts`` can't say which rows it skipped, so this is one
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` per batch (PostgreSQL,
+    SQLite 3.35+): rows another transaction inserted first are not returned.
+    """
+    opts = RepurposedPostStatus._meta
+    qn = connection.ops.quote_name
+    now = opts.get_field('created_at').get_db_prep_value(timezone.now(), connection)
+    columns = ', '.join(qn(opts.get_field(name).column)
+                        for name in ('variation', 'platform', 'campaign', 'repurposed_at', 'created_at'))
+    conflict = ', '.join(qn(opts.get_field(name).column) for name in ('variation', 'platform'))
+    returning = qn(opts.get_field('variation').column)
+
+    inserted = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), INSERT_BATCH):
+            batch = rows[start:start + INSERT_BATCH]
+            cursor.execute(
+                f"INSERT INTO {qn(opts.db_table)} ({columns}) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT ({conflict}) DO NOTHING RETURNING {returning}",
+                [value for row in batch for value in (*row, now, now)],
+            )
+            inserted.extend(variation_id for (variation_id,) in cursor.fetchall())
+    return inserted
+
+
+def mark_repurposed(variations, platforms):
+    """Record ``variations`` as repurposed to each of ``platforms`` in bulk.
+
+    Idempotent: existing (variation, platform) rows are left alone, and rows a
+    concurrent call inserts first are skipped by the unique constraint and not
+    counted. Returns the number of rows actually inserted.
+    """
+    if not isinstance(variations, QuerySet):
+        variations = PinTemplateVariation.objects.filter(pk__in=variations)
+
+    # One query resolves every variation's campaign instead of walking
+    # headline → pillar → campaign per row.
+    campaign_by_variation = dict(
+        variations.order_by().values_list('id', 'headline__pillar__campaign_id')
+    )
+    if not campaign_by_variation or not platforms:
+        return 0
+
+    with transaction.atomic():
+        existing = set(
+            RepurposedPostStatus.objects.filter(variation_id__in=campaign_by_variation, platform__in=platforms)
+            .values_list('variation_id', 'platform')
+        )
+        new_rows = [
+            (variation_id, platform, campaign_id)
+            for variation_id, campaign_id in campaign_by_variation.items()
+            for platform in platforms
+            if (variation_id, platform) not in existing
+        ]
+        if not new_rows:
+            return 0
+
+        inserted = _insert_new_statuses(new_rows)
+        # Only rows this call inserted move the counters.
+        for campaign_id, delta in Counter(campaign_by_variation[v] for v in inserted).items():
+            if campaign_id is not None:
+                bump_repurpose_counters(campaign_id, delta)
+
+    # The raw insert sends no post_save, so the cached dashboard rollup is dropped here.
+    invalidate_repurpose_rollup()
+    return len(inserted)
+
+
+def repurposed_count_subquery(variation_ref):
+    """Number of platforms the variation at ``OuterRef(variation_ref)`` was repurposed to (0 if none)."""
+    return Coalesce(
+        Subquery(
+            RepurposedPostStatus.objects.filter(variation=OuterRef(variation_ref))
+            .order_by()
+            .values('variation')
+            .annotate(n=Count('pk'))
+            .values('n')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def pick_daily_candidates(campaign_id, count=4, seed=None, exclude_ids=(), exclude_pillar_ids=()):
+    """Pick up to ``count`` not-fully-repurposed variations, one per pillar, in SQL.
+
+    A ROW_NUMBER() window partitioned by pillar keeps a single candidate per
+    pillar (which also keeps headlines unique), so only one row per pillar
+    ever leaves the database. With a ``seed`` the order is an MD5 of the
+    variation id and seed, making picks reproducible; without one it's random.
+    ``exclude_ids``/``exclude_pillar_ids`` leave out picks already made, for
+    topping up a partial set.
+    """
+    platform_total = len(RepurposedPostStatus.PLATFORM_CHOICES)
+    repurposed_count = repurposed_count_subquery('pk')
+
+    if seed is None:
+        shuffle = Random()
+    else:
+        shuffle = MD5(Concat(Cast('pk', CharField()), Value(f':{seed}'), output_field=CharField()))
+
+    return list(
+        PinTemplateVariation.objects
+        .filter(headline__pillar__campaign_id=campaign_id)
+        .exclude(pk__in=exclude_ids)
+        .exclude(headline__pillar_id__in=exclude_pillar_ids)
+        .annotate(repurposed_count=repurposed_count)
+        .filter(repurposed_count__lt=platform_total)
+        .annotate(
+            shuffle_key=shuffle,
+            pillar_rank=Window(RowNumber(), partition_by=F('headline__pillar_id'), order_by=shuffle.asc()),
+        )
+        .filter(pillar_rank=1)
+        .select_related('headline__pillar__campaign')  # hook context reads the campaign name
+        .order_by('shuffle_key')[:count]
+    )
@@ -0,0 +1,175 @@
+import numpy as np
+
+# Vectorised schedule validation.
+#
+# A schedule is four parallel int arrays, one entry per slot: day (date ordinal),
+# board, pin and pillar ids. Every check is a sort/bincount pass over those
+# arrays, so a campaign with hundreds of thousands of slots validates in well
+# under a second. Works on saved schedules (load_schedule) and on schedules
+# still being built in memory (schedule_arrays).
+
+# Matches SmartLoop: 5 repeats over 30 days → 6 days apart.
+MIN_REPEAT_SPACING_DAYS = 6
+# Allowed deviation, in pins, of a day's per-pillar / per-board count from its
+# proportional share (the value's share of the whole schedule × that day's load).
+PILLAR_TOLERANCE = 2
+BOARD_TOLERANCE = 2
+# Allowed excess over the campaign's average pins per day.
+DAY_LOAD_TOLERANCE = 2
+# Violations listed per check; the counts always cover everything.
+DETAIL_LIMIT = 50
+
+
+def schedule_arrays(rows):
+    """Build the arrays from ``(publish_date, board_id, pin_id, pillar_id)`` tuples."""
+    rows = list(rows)
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return {'day': empty, 'board': empty, 'pin': empty, 'pillar': empty}
+    days, boards, pins, pillars = zip(*rows)
+    return {
+        'day': np.fromiter((d.toordinal() for d in days), dtype=np.int64, count=len(rows)),
+        'board': np.asarray(boards, dtype=np.int64),
+        'pin': np.asarray(pins, dtype=np.int64),
+        'pillar': np.asarray([p if p is not None else -1 for p in pillars], dtype=np.int64),
+    }
+
+
+def load_schedule(campaign_id=None, queryset=None):
+    """Load a saved schedule (one campaign, or any ScheduledPin queryset) in one query.
+
+    Check campaigns one at a time: pillar balance compares every pillar present.
+    """
+    from pinterest_scheduler.models import ScheduledPin
+
+    if queryset is None:
+        queryset = ScheduledPin.objects.all()
+        if campaign_id:
+            queryset = queryset.filter(campaign_id=campaign_id)
+    rows = queryset.order_by().values_list('publish_date', 'board_id', 'pin_id', 'pin__headline__pillar_id')
+    return schedule_arrays(rows.iterator(chunk_size=5000))
+
+
+def _ordinal_to_iso(day):
+    from datetime import date
+
+    return date.fromordinal(int(day)).isoformat()
+
+
+def _group_counts(keys_a, keys_b):
+    """Count rows per (a, b) pair. Returns (unique_a, unique_b, counts)."""
+    # Pack both ids into one int64 key: a 1-D unique is much faster than unique(axis=0).
+    a_min, b_min = keys_a.min(), keys_b.min()
+    width = keys_b.max() - b_min + 1
+    packed, counts = np.unique((keys_a - a_min) * width + (keys_b - b_min), return_counts=True)
+    return packed // width + a_min, packed % width + b_min, counts
+
+
+def _duplicates(arrays, key_a, key_b):
+    a, b, counts = _group_counts(arrays[key_a], arrays[key_b])
+    mask = counts > 1
+    return a[mask], b[mask], counts[mask]
+
+
+def _deviation_per_day(arrays, key):
+    """Per day, the largest gap between a value's slot count and its proportional share.
+
+    A value's share of a day is its share of the whole schedule times that day's
+    load, as in schedule_optimizer, so a pillar with half the pins is expected
+    to fill half of each day. Values missing from a day count as zero.
+    """
+    day_values, day_idx = np.unique(arrays['day'], return_inverse=True)
+    key_values, key_idx = np.unique(arrays[key], return_inverse=True)
+    grid = np.bincount(
+        day_idx * len(key_values) + key_idx, minlength=len(day_values) * len(key_values)
+    ).reshape(len(day_values), len(key_values))
+    share = np.bincount(key_idx, minlength=len(key_values)) / len(key_idx)
+    expected = grid.sum(axis=1)[:, None] * share[None, :]
+    return day_values, key_values, grid, expected, np.abs(grid - expected).max(axis=1)
+
+
+def check_schedule(
+    arrays,
+    min_spacing_days=MIN_REPEAT_SPACING_DAYS,
+    pillar_tolerance=PILLAR_TOLERANCE,
+    board_tolerance=BOARD_TOLERANCE,
+    day_load_tolerance=DAY_LOAD_TOLERANCE,
+    detail_limit=DETAIL_LIMIT,
+):
+    """Run every constraint over ``arrays`` and return a violations report.
+
+    Report: ``{'slots', 'days', 'ok', 'counts': {check: n}, 'violations': {check: [...]}}``.
+    """
+    n = len(arrays['day'])
+    violations = {}
+    counts = {}
+
+    def record(name, items, total):
+        counts[name] = int(total)
+        if total:
+            violations[name] = items[:detail_limit]
+
+    if not n:
+        return {'slots': 0, 'days': 0, 'ok': True, 'counts': {}, 'violations': {}}
+
+    # Same pin on the same board more than once.
+    pins, boards, times = _duplicates(arrays, 'pin', 'board')
+    record('pin_board_repeat', [
+        {'pin': int(p), 'board': int(b), 'times': int(t)}
+        for p, b, t in zip(pins[:detail_limit], boards[:detail_limit], times[:detail_limit])
+    ], len(pins))
+
+    # Same pin twice on one day.
+    pins, days, times = _duplicates(arrays, 'pin', 'day')
+    record('pin_same_day', [
+        {'pin': int(p), 'date': _ordinal_to_iso(d), 'times': int(t)}
+        for p, d, t in zip(pins[:detail_limit], days[:detail_limit], times[:detail_limit])
+    ], len(pins))
+
+    # Repeats of a pin closer than min_spacing_days (same-day repeats are reported above).
+    order = np.lexsort((arrays['day'], arrays['pin']))
+    pin_sorted, day_sorted = arrays['pin'][order], arrays['day'][order]
+    gaps = np.diff(day_sorted)
+    close = (pin_sorted[1:] == pin_sorted[:-1]) & (gaps > 0) & (gaps < min_spacing_days)
+    idx = np.flatnonzero(close)
+    record('repeat_spacing', [
+        {'pin': int(pin_sorted[i]), 'date': _ordinal_to_iso(day_sorted[i]),
+         'next': _ordinal_to_iso(day_sorted[i + 1]), 'gap_days': int(gaps[i])}
+        for i in idx[:detail_limit]
+    ], len(idx))
+
+    # Days carrying well over the average load.
+    day_values, day_counts = np.unique(arrays['day'], return_counts=True)
+    limit = int(np.ceil(n / len(day_values))) + day_load_tolerance
+    heavy = np.flatnonzero(day_counts > limit)
+    record('day_overload', [
+        {'date': _ordinal_to_iso(day_values[i]), 'pins': int(day_counts[i]), 'limit': limit}
+        for i in heavy[:detail_limit]
+    ], len(heavy))
+
+    # Pillar and board mix within each day, against each value's proportional share.
+    for key, tolerance in (('pillar', pillar_tolerance), ('board', board_tolerance)):
+        days, values, grid, expected, deviation = _deviation_per_day(arrays, key)
+        bad = np.flatnonzero(deviation > tolerance)
+        record(f'{key}_imbalance', [
+            {'date': _ordinal_to_iso(days[i]), 'deviation': round(float(deviation[i]), 1),
+             'counts': {int(v): int(c) for v, c in zip(values, grid[i])},
+             'expected': {int(v): round(float(e), 1) for v, e in zip(values, expected[i])}}
+            for i in bad[:detail_limit]
+        ], len(bad))
+
+    return {
+        'slots': n,
+        'days': int(len(day_values)),
+        'ok': not violations,
+        'counts': counts,
+        'violations': violations,
+    }
+
+
+def summarize(report):
+    """One-line summary for admin messages and command output."""
+    if report['ok']:
+        return f"✅ {report['slots']} slots over {report['days']} days — no violations"
+    issues = ", ".join(f"{name}: {count}" for name, count in report['counts'].items() if count)
+    return f"⚠️ {report['slots']} slots over {report['days']} days — {issues}"
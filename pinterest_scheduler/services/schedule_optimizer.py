@@ -0,0 +1,210 @@
+import time
+
+import numpy as np
+
+# Pillar/board diversity optimiser for SmartLoop-style schedules.
+#
+# Every pin is posted `repeats` times, `spacing` days apart (wrapping around the
+# window), once on each board. A pin's placement is therefore just two numbers:
+# its first day (offset) and which board its first repeat uses (shift). Spacing
+# and "never the same board twice" hold by construction, so the search only has
+# to balance the per-day mix.
+#
+# Objective (lower is better): squared deviation from the even share, summed
+# over every day × pillar, day × board and day (load) cell.
+
+DEFAULT_TIME_BUDGET = 2.0
+LOAD_WEIGHT = 1.0
+PILLAR_WEIGHT = 1.0
+BOARD_WEIGHT = 1.0
+
+
+class _State:
+    def __init__(self, pillar_idx, n_pillars, days, repeats, spacing, n_boards):
+        self.pillar_idx = pillar_idx
+        self.days, self.repeats, self.n_boards = days, repeats, n_boards
+        n = len(pillar_idx)
+
+        # day_matrix[o, r]: day of repeat r for offset o; board_matrix[s, r]: board for shift s.
+        self.day_matrix = (np.arange(days)[:, None] + np.arange(repeats)[None, :] * spacing) % days
+        self.board_matrix = (np.arange(n_boards)[:, None] + np.arange(repeats)[None, :]) % n_boards
+
+        self.pillar_counts = np.zeros((days, n_pillars))
+        self.board_counts = np.zeros((days, n_boards))
+        self.load = np.zeros(days)
+
+        pillar_sizes = np.bincount(pillar_idx, minlength=n_pillars)
+        self.pillar_target = pillar_sizes * repeats / days  # per pillar, per day
+        self.board_target = n * repeats / (days * n_boards)
+        self.load_target = n * repeats / days
+
+        self.offset = np.full(n, -1)
+        self.shift = np.full(n, -1)
+
+    def apply(self, i, offset, shift, sign):
+        days = self.day_matrix[offset]
+        boards = self.board_matrix[shift]
+        np.add.at(self.pillar_counts, (days, self.pillar_idx[i]), sign)
+        np.add.at(self.board_counts, (days, boards), sign)
+        np.add.at(self.load, days, sign)
+        if sign > 0:
+            self.offset[i], self.shift[i] = offset, shift
+
+    def deltas(self, i):
+        """Cost change of placing pin ``i`` at every (offset, shift); shape (days, boards)."""
+        p = self.pillar_idx[i]
+        dm = self.day_matrix
+        # Adding 1 to a cell at count c with target t changes (c - t)^2 by 2(c - t) + 1.
+        pillar = (2 * (self.pillar_counts[dm, p] - self.pillar_target[p]) + 1).sum(axis=1)
+        load = (2 * (self.load[dm] - self.load_target) + 1).sum(axis=1)
+        board = (
+            2 * (self.board_counts[dm[:, None, :], self.board_matrix[None, :, :]] - self.board_target) + 1
+        ).sum(axis=2)
+        return PILLAR_WEIGHT * pillar[:, None] + LOAD_WEIGHT * load[:, None] + BOARD_WEIGHT * board
+
+    def pillar_cost(self, days, pillars):
+        cells = self.pillar_counts[np.ix_(days, pillars)] - self.pillar_target[pillars][None, :]
+        return float((cells ** 2).sum())
+
+    def try_swap(self, i, j):
+        """Swap two pins' placements if that lowers the cost. Load and board counts don't change."""
+        pillars = np.array([self.pillar_idx[i], self.pillar_idx[j]])
+        if pillars[0] == pillars[1]:
+            return False
+        pi, pj = (self.offset[i], self.shift[i]), (self.offset[j], self.shift[j])
+        days = np.union1d(self.day_matrix[pi[0]], self.day_matrix[pj[0]])
+        before = self.pillar_cost(days, pillars)
+        self.apply(i, *pi, -1)
+        self.apply(j, *pj, -1)
+        self.apply(i, *pj, 1)
+        self.apply(j, *pi, 1)
+        if self.pillar_cost(days, pillars) < before - 1e-9:
+            return True
+        self.apply(i, *pj, -1)
+        self.apply(j, *pi, -1)
+        self.apply(i, *pi, 1)
+        self.apply(j, *pj, 1)
+        return False
+
+    def score(self):
+        return float(
+            PILLAR_WEIGHT * ((self.pillar_counts - self.pillar_target[None, :]) ** 2).sum()
+            + BOARD_WEIGHT * ((self.board_counts - self.board_target) ** 2).sum()
+            + LOAD_WEIGHT * ((self.load - self.load_target) ** 2).sum()
+        )
+
+
+def _seed_round_robin(state, order):
+    """Pin k of ``order`` starts on day k, moving to the next board rotation every ``days`` pins."""
+    for k, i in enumerate(order):
+        state.apply(i, k % state.days, (k // state.days) % state.n_boards, 1)
+
+
+def _seed_greedy(state, order):
+    for i in order:
+        delta = state.deltas(i)
+        offset, shift = np.unravel_index(np.argmin(delta), delta.shape)
+        state.apply(i, offset, shift, 1)
+
+
+def optimize_schedule(pillars, days=30, repeats=5, spacing=None, boards=5, time_budget=DEFAULT_TIME_BUDGET, seed=None):
+    """Place each pin (given by its pillar id, in order) on a day offset and board rotation.
+
+    Greedy seeding places pins one at a time, pillars interleaved, at their
+    cheapest position. Bounded local search (single-pin moves, then pairwise
+    swaps) runs until nothing improves or ``time_budget`` seconds have passed.
+
+    Returns ``(placements, report)``: ``placements[i]`` is a list of
+    ``(day_index, board_index)`` for each repeat of pin ``i``.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    spacing = spacing or max(days // repeats, 1)
+    if repeats > boards:
+        raise ValueError(f"{repeats} repeats need at least as many boards (got {boards})")
+
+    pillar_values, pillar_idx = np.unique(np.asarray(pillars), return_inverse=True)
+    n = len(pillar_idx)
+    if not n:
+        return [], {'pins': 0, 'score': 0.0, 'baseline_score': 0.0, 'iterations': 0, 'moves': 0,
+                    'elapsed_s': 0.0, 'converged': True}
+
+    def new_state():
+        return _State(pillar_idx, len(pillar_values), days, repeats, spacing, boards)
+
+    # What SmartLoop did before: shuffled pins, pin k starting on day k.
+    baseline_state = new_state()
+    _seed_round_robin(baseline_state, rng.permutation(n))
+    baseline = baseline_state.score()
+
+    # Seeds: pillars interleaved (so no pillar grabs all the cheap days first),
+    # then laid out round-robin or placed greedily; keep whichever scores lower.
+    by_pillar = [list(rng.permutation(np.flatnonzero(pillar_idx == p))) for p in range(len(pillar_values))]
+    order = []
+    while any(by_pillar):
+        for queue in by_pillar:
+            if queue:
+                order.append(queue.pop())
+    state = new_state()
+    _seed_round_robin(state, order)
+    greedy = new_state()
+    _seed_greedy(greedy, order)
+    if greedy.score() < state.score():
+        state = greedy
+
+    # Local search within the budget: best-response passes (move one pin to its
+    # cheapest position), then random pairwise swaps once those stop helping.
+    # Converged when a best-response pass and a round of n swaps both change nothing.
+    iterations = moves = 0
+    converged = False
+    deadline = started + time_budget
+
+    def out_of_time():
+        return time.perf_counter() >= deadline
+
+    while not out_of_time():
+        improved = False
+        for i in rng.permutation(n):
+            if out_of_time():
+                break
+            iterations += 1
+            current = (state.offset[i], state.shift[i])
+            state.apply(i, *current, -1)
+            delta = state.deltas(i)
+            best = np.unravel_index(np.argmin(delta), delta.shape)
+            if delta[best] < delta[current] - 1e-9:
+                state.apply(i, best[0], best[1], 1)
+                moves += 1
+                improved = True
+            else:
+                state.apply(i, *current, 1)
+        if improved:
+            continue
+
+        for i, j in rng.integers(0, n, size=(n, 2)):
+            if out_of_time():
+                break
+            iterations += 1
+            if i != j and state.try_swap(i, j):
+                moves += 1
+                improved = True
+        if not improved and not out_of_time():
+            converged = True
+            break
+
+    placements = [
+        list(zip(state.day_matrix[state.offset[i]].tolist(), state.board_matrix[state.shift[i]].tolist()))
+        for i in range(n)
+    ]
+    report = {
+        'pins': n,
+        'score': round(state.score(), 3),
+        'baseline_score': round(baseline, 3),
+        'iterations': iterations,
+        'moves': moves,
+        'elapsed_s': round(time.perf_counter() - started, 3),
+        'converged': converged,
+        'max_pillar_spread': int((state.pillar_counts.max(axis=1) - state.pillar_counts.min(axis=1)).max()),
+        'max_board_spread': int((state.board_counts.max(axis=1) - state.board_counts.min(axis=1)).max()),
+    }
+    return placements, report
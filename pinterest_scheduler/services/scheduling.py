@@ -0,0 +1,319 @@
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import OuterRef, Subquery
+
+from pinterest_scheduler.services.caching import bump_generation, bump_generation_on_commit, model_namespace
+from pinterest_scheduler.services.slots import allocate_days
+
+# Campaign-scoped schedule writes.
+#
+# A campaign's schedule is written inside one transaction holding a lock on the
+# campaign row. Two workers scheduling different campaigns never touch each
+# other's rows and run in parallel; two workers on the same campaign queue up on
+# the lock instead of interleaving their writes.
+#
+# Writes are diffs: a planned month is compared with the campaign's live
+# unposted pins in the window, and only added / removed / moved / renumbered
+# rows are written (one DELETE, two UPDATEs and one INSERT per batch). A plan
+# can also be staged (StagedScheduledPin), reviewed as a diff, then promoted.
+
+BATCH_SIZE = 1000
+# Statuses a re-schedule compares the plan against; posted pins are history and
+# stay put. Only 'scheduled' pins are moved or removed: exported and publishing
+# pins are already with Pinterest and are matched or kept.
+REPLACEABLE_STATUSES = ('scheduled', 'exported', 'publishing')
+
+# One planned slot. Staged rows and SmartLoop plans are both lists of these.
+PlannedRow = namedtuple('PlannedRow', 'pin_id board_id publish_date campaign_day slot_number')
+PLANNED_FIELDS = PlannedRow._fields
+
+
+class CampaignLocked(Exception):
+    """Raised with ``nowait=True`` when another job is scheduling the same campaign."""
+
+
+@contextmanager
+def campaign_lock(campaign_id, nowait=False):
+    """Open a transaction holding an exclusive lock on one campaign.
+
+    The lock is ``SELECT ... FOR UPDATE`` on the Campaign row (PostgreSQL and
+    MySQL). SQLite has no row locks and serialises writers itself, so there
+    the transaction alone is enough. The lock is released on commit/rollback.
+    """
+    from pinterest_scheduler.models import Campaign
+
+    with transaction.atomic():
+        queryset = Campaign.objects.filter(pk=campaign_id)
+        if connection.features.has_select_for_update:
+            queryset = queryset.select_for_update(nowait=nowait and connection.features.has_select_for_update_nowait)
+        try:
+            campaign = queryset.only('id').get()
+        except DatabaseError as e:
+            raise CampaignLocked(f"Campaign {campaign_id} is being scheduled by another job") from e
+        yield campaign
+
+
+def group_by_campaign(pins):
+    """Split variations (with ``headline__pillar`` loaded) by their campaign id."""
+    groups = defaultdict(list)
+    for pin in pins:
+        groups[pin.headline.pillar.campaign_id].append(pin)
+    return groups
+
+
+def fill_missing_campaigns(queryset=None):
+    """Set ``campaign`` on ScheduledPins without one, from pin → headline → pillar, in one UPDATE.
+
+    Pins whose pillar has no campaign are left as they are. Returns the number of rows updated.
+    """
+    from pinterest_scheduler.models import PinTemplateVariation, ScheduledPin
+
+    queryset = ScheduledPin.objects.all() if queryset is None else queryset
+    campaign = PinTemplateVariation.objects.filter(pk=OuterRef('pin_id')).values('headline__pillar__campaign_id')[:1]
+    updated = (
+        queryset.filter(campaign__isnull=True, pin__headline__pillar__campaign__isnull=False)
+        .update(campaign_id=Subquery(campaign))
+    )
+    if updated:
+        bump_generation_on_commit(model_namespace(ScheduledPin))
+    return updated
+
+
+def planned_rows(schedule_by_day, start):
+    """PlannedRows for ``{date: [(pin, board), ...]}``, numbered per day."""
+    rows = []
+    for pub_date, items in sorted(schedule_by_day.items()):
+        campaign_day = (pub_date - start).days + 1
+        for slot_num, (pin, board) in enumerate(items, start=1):
+            rows.append(PlannedRow(pin.id, board.id, pub_date, campaign_day, slot_num))
+    return rows
+
+
+def window_end(start, days):
+    return start + timedelta(days=days - 1)
+
+
+# ----------------------
+# Diff
+# ----------------------
+
+def diff_schedule(campaign_id, rows, start, end):
+    """Compare planned ``rows`` with the campaign's live unposted pins in ``[start, end]``.
+
+    A row matches a live pin on (pin, board, publish_date); a match in another
+    slot is renumbered in place, keeping its status. Left-over 'scheduled' pins
+    then pair with left-over rows on (pin, board) and move date. Exported and
+    publishing pins are already queued on (or being sent to) Pinterest for
+    their day, so they're never moved or removed: unmatched ones are kept. Returns ``{'added': [PlannedRow],
+    'renumbered': [(live_id, PlannedRow)], 'moved': [(live_id, old_date,
+    PlannedRow)], 'removed': [(live_id, old_date)], 'kept': n, 'unchanged': n}``
+    after one query.
+    """
+    from pinterest_scheduler.models import ScheduledPin
+
+    live = (
+        ScheduledPin.objects.filter(
+            campaign_id=campaign_id,
+            publish_date__range=(start, end),
+            status__in=REPLACEABLE_STATUSES,
+        )
+        .order_by('publish_date', 'slot_number', 'id')
+        .values_list('id', 'status', *PLANNED_FIELDS)
+    )
+    by_day = defaultdict(list)
+    for live_id, status, *values in live:
+        old = PlannedRow(*values)
+        by_day[(old.pin_id, old.board_id, old.publish_date)].append((live_id, status, old))
+
+    # Pass 1: the pin is already on that board that day; at most its slot changes.
+    unchanged = 0
+    renumbered, pending = [], []
+    for row in sorted(rows, key=lambda r: (r.publish_date, r.slot_number)):
+        matches = by_day.get((row.pin_id, row.board_id, row.publish_date))
+        if not matches:
+            pending.append(row)
+            continue
+        live_id, _status, old = matches.pop(0)
+        if old == row:
+            unchanged += 1
+        else:
+            renumbered.append((live_id, row))
+
+    # Pass 2: left-over scheduled pins of a (pin, board) pair move; the rest is added/removed.
+    by_pair = defaultdict(list)
+    kept = 0
+    for matches in by_day.values():
+        for live_id, status, old in matches:
+            if status == 'scheduled':
+                by_pair[(old.pin_id, old.board_id)].append((live_id, old.publish_date))
+            else:
+                kept += 1
+    for leftovers in by_pair.values():
+        leftovers.sort(key=lambda item: item[1])
+
+    added, moved = [], []
+    for row in pending:
+        leftovers = by_pair.get((row.pin_id, row.board_id))
+        if leftovers:
+            live_id, old_date = leftovers.pop(0)
+            moved.append((live_id, old_date, row))
+        else:
+            added.append(row)
+    removed = [item for leftovers in by_pair.values() for item in leftovers]
+
+    return {'added': added, 'renumbered': renumbered, 'moved': moved, 'removed': removed,
+            'kept': kept, 'unchanged': unchanged}
+
+
+def summarize_diff(diff):
+    if diff is None:
+        return "nothing staged"
+    summary = (
+        f"+{len(diff['added'])} added, −{len(diff['removed'])} removed, "
+        f"↔{len(diff['moved'])} moved, #{len(diff['renumbered'])} renumbered, ={diff['unchanged']} unchanged"
+    )
+    if diff['kept']:
+        summary += f", {diff['kept']} exported/publishing pins kept"
+    return summary
+
+
+def _apply_diff(campaign_id, diff):
+    """Write ``diff`` (inside the caller's transaction) and return the touched dates."""
+    from pinterest_scheduler.models import ScheduledPin
+
+    dates = set()
+    if diff['removed']:
+        ids = [live_id for live_id, _old_date in diff['removed']]
+        ScheduledPin.objects.filter(id__in=ids).delete()
+        dates.update(old_date for _live_id, old_date in diff['removed'])
+
+    if diff['renumbered']:
+        # Same day, new slot: status is kept, and allocation leaves exported pins' times alone.
+        ScheduledPin.objects.bulk_update(
+            [
+                ScheduledPin(id=live_id, campaign_day=row.campaign_day, slot_number=row.slot_number)
+                for live_id, row in diff['renumbered']
+            ],
+            ['campaign_day', 'slot_number'],
+            batch_size=BATCH_SIZE,
+        )
+        dates.update(row.publish_date for _live_id, row in diff['renumbered'])
+
+    if diff['moved']:
+        # Only 'scheduled' pins move; they're re-timed after commit.
+        ScheduledPin.objects.bulk_update(
+            [
+                ScheduledPin(id=live_id, publish_date=row.publish_date, campaign_day=row.campaign_day,
+                             slot_number=row.slot_number, publish_at=None)
+                for live_id, _old_date, row in diff['moved']
+            ],
+            ['publish_date', 'campaign_day', 'slot_number', 'publish_at'],
+            batch_size=BATCH_SIZE,
+        )
+        for _live_id, old_date, row in diff['moved']:
+            dates.update((old_date, row.publish_date))
+
+    if diff['added']:
+        ScheduledPin.objects.bulk_create(
+            [ScheduledPin(campaign_id=campaign_id, status='scheduled', **row._asdict()) for row in diff['added']],
+            batch_size=BATCH_SIZE,
+        )
+        dates.update(row.publish_date for row in diff['added'])
+    return dates
+
+
+def apply_schedule(campaign_id, rows, start, days=30, nowait=False):
+    """Make the campaign's unposted pins in the window match ``rows``, writing only the diff.
+
+    Runs under :func:`campaign_lock`; publish times for touched days are
+    allocated once the transaction commits. Returns the diff.
+    """
+    with campaign_lock(campaign_id, nowait=nowait):
+        diff = diff_schedule(campaign_id, rows, start, window_end(start, days))
+        dates = _apply_diff(campaign_id, diff)
+        transaction.on_commit(lambda: after_schedule_write(dates))
+    return diff
+
+
+def after_schedule_write(dates):
+    """Allocate publish times for ``dates`` once new rows are committed.
+
+    bulk_create sends no post_save, so the ScheduledPin cache generation is bumped here.
+    """
+    from pinterest_scheduler.models import ScheduledPin
+
+    allocate_days(dates)
+    bump_generation(model_namespace(ScheduledPin))
+
+
+# ----------------------
+# Staging
+# ----------------------
+
+def stage_schedule(campaign_id, rows, start, days=30):
+    """Replace the campaign's staged schedule with ``rows`` (nothing live changes)."""
+    from pinterest_scheduler.models import StagedScheduledPin
+
+    end = window_end(start, days)
+    with campaign_lock(campaign_id):
+        StagedScheduledPin.objects.filter(campaign_id=campaign_id).delete()
+        StagedScheduledPin.objects.bulk_create(
+            [
+                StagedScheduledPin(campaign_id=campaign_id, window_start=start, window_end=end, **row._asdict())
+                for row in rows
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return len(rows)
+
+
+def load_staged(campaign_id):
+    """``(rows, start, end)`` for the campaign's staged schedule; ``rows`` is empty when nothing is staged."""
+    from pinterest_scheduler.models import StagedScheduledPin
+
+    staged = list(
+        StagedScheduledPin.objects.filter(campaign_id=campaign_id)
+        .order_by()
+        .values_list('window_start', 'window_end', *PLANNED_FIELDS)
+    )
+    if not staged:
+        return [], None, None
+    start, end = staged[0][:2]
+    return [PlannedRow(*values[2:]) for values in staged], start, end
+
+
+def diff_staged(campaign_id):
+    """Diff the staged schedule against live pins (two queries). ``None`` when nothing is staged."""
+    rows, start, end = load_staged(campaign_id)
+    if not rows:
+        return None
+    return diff_schedule(campaign_id, rows, start, end)
+
+
+def promote_staged(campaign_id, nowait=False):
+    """Apply the staged schedule's diff to live pins and clear the staging rows, atomically.
+
+    The diff is recomputed under the lock, so anything changed since review is
+    taken into account. Returns the diff, or ``None`` when nothing is staged.
+    """
+    from pinterest_scheduler.models import StagedScheduledPin
+
+    with campaign_lock(campaign_id, nowait=nowait):
+        rows, start, end = load_staged(campaign_id)
+        if not rows:
+            return None
+        diff = diff_schedule(campaign_id, rows, start, end)
+        dates = _apply_diff(campaign_id, diff)
+        StagedScheduledPin.objects.filter(campaign_id=campaign_id).delete()
+        transaction.on_commit(lambda: after_schedule_write(dates))
+    return diff
+
+
+def discard_staged(campaign_id):
+    from pinterest_scheduler.models import StagedScheduledPin
+
+    deleted, _ = StagedScheduledPin.objects.filter(campaign_id=campaign_id).delete()
+    return deleted
@@ -0,0 +1,199 @@
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import localtime, make_aware, now
+
+from pinterest_scheduler.services.caching import bump_generation_on_commit, model_namespace
+
+# Publish-time slot allocation.
+#
+# Each day's scheduled pins get a concrete `publish_at` spread evenly across the
+# posting windows (settings.POSTING_WINDOWS, local time), interleaved by board so
+# consecutive posts go to different boards. Exports, previews and the publisher
+# read the stored time instead of recomputing it from the export's start time.
+# Allocation only times pins that have no time yet (new rows, or rows moved to
+# another day), in the slots left free around every other pin on the day, so
+# scheduling one campaign never re-times another's. Today's slots start after
+# the current time. Only an explicit re-spread (allocate_slots --respread)
+# moves pins that already have a time, and even then pins already handed off
+# (exported, or claimed by a publisher) keep theirs.
+
+DEFAULT_WINDOWS = "09:00-21:00"
+# Statuses whose publish_at is already out in the world and must not move.
+FIXED_STATUSES = ('exported', 'publishing')
+
+
+def parse_windows(spec):
+    """Parse ``"09:00-12:00,17:00-21:00"`` into ``[(time(9), time(12)), (time(17), time(21))]``."""
+    windows = []
+    for part in (spec or DEFAULT_WINDOWS).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start_str, _, end_str = part.partition("-")
+        start = time.fromisoformat(start_str.strip())
+        end = time.fromisoformat(end_str.strip())
+        if end <= start:
+            raise ValueError(f"Posting window {part!r} must end after it starts")
+        windows.append((start, end))
+    return sorted(windows)
+
+
+def posting_windows():
+    return parse_windows(getattr(settings, "POSTING_WINDOWS", DEFAULT_WINDOWS))
+
+
+def slot_times(publish_date, count, windows=None, not_before=None):
+    """``count`` aware datetimes on ``publish_date``, evenly spaced across ``windows``.
+
+    The first slot opens the first window and every slot lands inside a window,
+    however many pins there are (they just sit closer together). With
+    ``not_before`` only the part of the windows after it is used; if none of
+    it is left, the whole day's layout is returned (the pins are simply late).
+    """
+    windows = windows or posting_windows()
+    spans = [
+        (datetime.combine(publish_date, start), datetime.combine(publish_date, end))
+        for start, end in windows
+    ]
+    if not_before is not None:
+        cutoff = localtime(not_before).replace(tzinfo=None)
+        remaining = [(max(start, cutoff), end) for start, end in spans if end > cutoff]
+        spans = remaining or spans
+    total = sum((end - start).total_seconds() for start, end in spans)
+    if not count:
+        return []
+    step = total / count
+
+    times = []
+    for k in range(count):
+        offset = k * step
+        for start, end in spans:
+            length = (end - start).total_seconds()
+            if offset < length:
+                moment = start + timedelta(seconds=int(offset))
+                break
+            offset -= length
+        else:  # pragma: no cover - offset < total by construction
+            moment = spans[-1][1]
+        times.append(make_aware(moment.replace(second=0)))
+    return times
+
+
+def interleave_by_board(pins):
+    """Round-robin pins across boards, keeping each board's own order."""
+    by_board = OrderedDict()
+    for pin in pins:
+        by_board.setdefault(pin.board_id, []).append(pin)
+    queues = list(by_board.values())
+
+    ordered = []
+    while queues:
+        for queue in list(queues):
+            ordered.append(queue.pop(0))
+            if not queue:
+                queues.remove(queue)
+    return ordered
+
+
+def free_slots(times, taken):
+    """``times`` without the slot closest to each of ``taken`` (times already in use)."""
+    free = list(times)
+    for moment in sorted(taken):
+        if not free:
+            break
+        free.pop(min(range(len(free)), key=lambda i: abs(free[i] - moment)))
+    return free
+
+
+def allocate_day(publish_date, windows=None, model=None, pin_ids=None, respread=False):
+    """Assign ``publish_at`` to the scheduled pins on ``publish_date`` that have none.
+
+    ``pin_ids`` narrows that to the caller's own rows. The day is laid out as
+    if every not-yet-posted pin needed a slot (on today, only the rest of the
+    windows after now); pins that keep their time take the slot nearest to it
+    and the pins being timed fill the rest, interleaved by board in slot then
+    id order. ``respread`` re-times every scheduled pin on the day, leaving
+    only exported and publishing pins where they are. Returns the number of
+    pins updated.
+    """
+    if model is None:
+        from pinterest_scheduler.models import ScheduledPin as model
+
+    current = now()
+    not_before = current if publish_date == localtime(current).date() else None
+
+    # Row locks make concurrent allocations of the same day (two campaigns
+    # scheduled at once) take turns instead of overwriting each other's times.
+    with transaction.atomic():
+        pins = list(
+            model.objects.filter(publish_date=publish_date)
+            .exclude(status='posted')
+            .select_for_update()
+            .only('id', 'board_id', 'slot_number', 'publish_date', 'publish_at', 'status')
+            .order_by('slot_number', 'id')
+        )
+
+        def needs_time(pin):
+            if pin.status in FIXED_STATUSES and pin.publish_at:
+                return False
+            if respread:
+                return True
+            return pin.publish_at is None and (pin_ids is None or pin.pk in pin_ids)
+
+        ordered = interleave_by_board(pin for pin in pins if needs_time(pin))
+        if not ordered:
+            return 0
+        taken = [
+            pin.publish_at for pin in pins
+            if pin.publish_at and not needs_time(pin) and (not_before is None or pin.publish_at >= not_before)
+        ]
+        times = slot_times(publish_date, len(ordered) + len(taken), windows, not_before=not_before)
+        for pin, moment in zip(ordered, free_slots(times, taken)):
+            pin.publish_at = moment
+        model.objects.bulk_update(ordered, ['publish_at'], batch_size=1000)
+    return len(ordered)
+
+
+def allocate_days(dates, windows=None, model=None, pin_ids=None, respread=False):
+    if model is None:
+        from pinterest_scheduler.models import ScheduledPin as model
+
+    if pin_ids is not None:
+        pin_ids = set(pin_ids)
+    updated = sum(
+        allocate_day(d, windows=windows, model=model, pin_ids=pin_ids, respread=respread)
+        for d in sorted(set(dates))
+    )
+    if updated:
+        # bulk_update sends no post_save; publish_daemon reloads its queue on this bump,
+        # so it must land after commit or the daemon could reload the old rows under it.
+        bump_generation_on_commit(model_namespace(model))
+    return updated
+
+
+def ensure_allocated(dates, model=None):
+    """Allocate any of ``dates`` that still has pins without a publish time (one query when none do)."""
+    if model is None:
+        from pinterest_scheduler.models import ScheduledPin as model
+
+    missing = (
+        model.objects.filter(publish_date__in=list(dates), publish_at__isnull=True)
+        .exclude(status='posted')
+        .values_list('publish_date', flat=True)
+        .order_by('publish_date')
+        .distinct()
+    )
+    return allocate_days(list(missing), model=model)
+
+
+def pins_due(start, end):
+    """Scheduled pins whose publish time falls in ``[start, end)``, e.g. the next hour."""
+    from pinterest_scheduler.models import ScheduledPin
+
+    return (
+        ScheduledPin.objects.filter(publish_at__gte=start, publish_at__lt=end, status='scheduled')
+        .order_by('publish_at', 'id')
+    )
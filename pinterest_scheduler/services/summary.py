@@ -0,0 +1,187 @@
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Coalesce
+
+from pinterest_scheduler.models import Campaign, Pillar, RepurposedPostStatus
+from pinterest_scheduler.services.caching import acached_value, bump_generation_on_commit, cached_value
+
+# Target number of headlines per pillar (there's no per-campaign field for this yet).
+HEADLINES_PER_PILLAR = 5
+DEFAULT_MAX_VARIATIONS = 4
+
+
+def pillar_completion_summary(campaign_id=None):
+    """Headline/variation completion per pillar, read in one query.
+
+    Counts come from the pillar's progress counters (see services.counters).
+    The variation target for each pillar is ``pillar_variation_target``: every
+    headline it should have (at least HEADLINES_PER_PILLAR) times the pillar's
+    own campaign limit (falls back to 4 for unassigned pillars).
+    Returns a list of plain dicts so it can be rendered, printed or dumped as JSON.
+    Cached until a campaign or pillar (including its counters) changes.
+    """
+    return cached_value(
+        f'pillar_completion_summary:{campaign_id or "all"}',
+        [Campaign, Pillar],
+        lambda: _compute_pillar_completion_summary(campaign_id),
+    )
+
+
+def pillar_variation_target(headline_count, max_per_headline):
+    """Variations a pillar needs to be complete: a pillar short of headlines isn't done yet."""
+    return max(headline_count, HEADLINES_PER_PILLAR) * max_per_headline
+
+
+def _compute_pillar_completion_summary(campaign_id):
+    qs = Pillar.objects.all()
+    if campaign_id:
+        qs = qs.filter(campaign_id=campaign_id)
+
+    rows = (
+        qs.values('id', 'name', 'campaign_id', 'campaign__name', 'headline_count', 'variation_count')
+        .annotate(
+            max_per_headline=Coalesce('campaign__max_variations_per_headline', Value(DEFAULT_MAX_VARIATIONS)),
+        )
+        .order_by('campaign__start_date', 'campaign__name', 'name')
+    )
+
+    summary = []
+    for row in rows:
+        variation_target = pillar_variation_target(row['headline_count'], row['max_per_headline'])
+        percent = int((row['variation_count'] / variation_target) * 100) if variation_target else 0
+        summary.append({
+            'pillar_id': row['id'],
+            'pillar': row['name'],
+            'campaign_id': row['campaign_id'],
+            'campaign': row['campaign__name'] or 'Unassigned',
+            'headline_count': row['headline_count'],
+            'headline_target': HEADLINES_PER_PILLAR,
+            'variation_count': row['variation_count'],
+            'variation_target': variation_target,
+            'max_variations_per_headline': row['max_per_headline'],
+            'percent_complete': min(percent, 100),
+            'complete': bool(variation_target) and row['variation_count'] >= variation_target,
+        })
+    return summary
+
+
+def campaign_completion_summary(pillar_rows):
+    """Roll pillar rows from ``pillar_completion_summary`` up to campaign totals."""
+    campaigns = {}
+    for row in pillar_rows:
+        totals = campaigns.setdefault(row['campaign_id'], {
+            'campaign_id': row['campaign_id'],
+            'campaign': row['campaign'],
+            'pillar_count': 0,
+            'headline_count': 0,
+            'variation_count': 0,
+            'variation_target': 0,
+        })
+        totals['pillar_count'] += 1
+        totals['headline_count'] += row['headline_count']
+        totals['variation_count'] += row['variation_count']
+        totals['variation_target'] += row['variation_target']
+
+    for totals in campaigns.values():
+        target = totals['variation_target']
+        percent = int((totals['variation_count'] / target) * 100) if target else 0
+        totals['percent_complete'] = min(percent, 100)
+        totals['complete'] = bool(target) and totals['variation_count'] >= target
+    return list(campaigns.values())
+
+
+REPURPOSE_PLATFORMS = [code for code, _label in RepurposedPostStatus.PLATFORM_CHOICES]
+# Generation namespace bumped whenever repurpose rows or variations are added/removed.
+REPURPOSE_NAMESPACE = 'repurpose'
+# Safety net only: the rollup is invalidated by signals whenever repurpose rows change.
+REPURPOSE_ROLLUP_TIMEOUT = 60 * 60
+
+
+def _repurpose_rollup_querysets():
+    """The three grouped reads the rollup is folded from (none grows a row per status).
+
+    Campaign totals count status rows by their own ``campaign`` and every
+    campaign is listed, pillars or not. The pillar drill-down can only reach
+    a status through its variation (headline → pillar).
+    """
+    status_path = 'headlines__variations__repurposed_statuses'
+    campaigns = Campaign.objects.values('id', 'name', 'variation_count').order_by('start_date', 'name', 'id')
+    statuses = (
+        RepurposedPostStatus.objects.filter(campaign__isnull=False)
+        .values('campaign_id', 'platform')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    pillars = (
+        Pillar.objects.filter(campaign__isnull=False)
+        .values('id', 'name', 'campaign_id', 'variation_count')
+        .annotate(**{
+            f'{platform}_count': Count(f'{status_path}__id', filter=Q(**{f'{status_path}__platform': platform}))
+            for platform in REPURPOSE_PLATFORMS
+        })
+        .order_by('name')
+    )
+    return campaigns, statuses, pillars
+
+
+def _fold_repurpose_rollup(campaign_rows, status_rows, pillar_rows):
+    campaigns = {
+        row['id']: {
+            'campaign_id': row['id'],
+            'campaign': row['name'],
+            'total': row['variation_count'],
+            'platform_counts': dict.fromkeys(REPURPOSE_PLATFORMS, 0),
+            'pillars': [],
+        }
+        for row in campaign_rows
+    }
+    for row in status_rows:
+        counts = campaigns[row['campaign_id']]['platform_counts']
+        if row['platform'] in counts:
+            counts[row['platform']] = row['n']
+    for row in pillar_rows:
+        campaigns[row['campaign_id']]['pillars'].append({
+            'pillar_id': row['id'],
+            'pillar': row['name'],
+            'total': row['variation_count'],
+            'platform_counts': {p: row[f'{p}_count'] for p in REPURPOSE_PLATFORMS},
+        })
+    return list(campaigns.values())
+
+
+def _compute_repurpose_rollup():
+    return _fold_repurpose_rollup(*_repurpose_rollup_querysets())
+
+
+async def _acompute_repurpose_rollup():
+    return _fold_repurpose_rollup(*[[row async for row in qs] for qs in _repurpose_rollup_querysets()])
+
+
+def repurpose_rollup():
+    """Campaign × pillar × platform repurpose counts, cached until a repurpose row changes.
+
+    Returns a list of campaign dicts, each with per-platform totals and a
+    ``pillars`` list carrying the same breakdown for drill-down. Totals are
+    the stored variation counters (services.counters).
+    """
+    return cached_value(
+        'repurpose_rollup',
+        [REPURPOSE_NAMESPACE, Campaign, Pillar],
+        _compute_repurpose_rollup,
+        REPURPOSE_ROLLUP_TIMEOUT,
+    )
+
+
+async def arepurpose_rollup():
+    """Async ``repurpose_rollup``; reads and fills the same cache entry."""
+    return await acached_value(
+        'repurpose_rollup',
+        [REPURPOSE_NAMESPACE, Campaign, Pillar],
+        _acompute_repurpose_rollup,
+        REPURPOSE_ROLLUP_TIMEOUT,
+    )
+
+
+def invalidate_repurpose_rollup():
+    # After commit: callers are mid-transaction (signals, mark_repurposed), and a
+    # reader must not cache pre-commit rows under the new generation.
+    bump_generation_on_commit(REPURPOSE_NAMESPACE)
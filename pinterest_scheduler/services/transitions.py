@@ -0,0 +1,120 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from pinterest_scheduler.services.caching import bump_generation_on_commit, model_namespace
+
+# ScheduledPin status transitions: scheduled → exported → posted, or
+# scheduled → publishing → posted through the API.
+#
+# A transition moves a whole batch with one UPDATE guarded by the expected
+# previous status, so pins that already moved on (exported twice, posted by
+# someone else) are left alone, and appends one ScheduledPinLog row per pin
+# moved with a single bulk_create.
+#
+# Exports and API publishers both claim pins before anything leaves: an export
+# moves its 'scheduled' pins to 'exported' (claim_for_export) and writes only
+# the ids that moved, a publisher moves them to 'publishing'. Whoever moves a
+# pin first gets it, so a pin goes to one publisher or export only, and
+# re-running an export sends just what hasn't gone out yet. A pin left in 'publishing' by a crash
+# is not retried automatically: it may already be live, so re-queue it by hand.
+
+# Statuses a pin may be in before moving to each target.
+ALLOWED_FROM = {
+    'exported': ('scheduled',),
+    'publishing': ('scheduled',),
+    'posted': ('scheduled', 'exported', 'publishing'),
+    # Re-queue an export that never made it to Pinterest, or release a failed/stuck publish.
+    'scheduled': ('exported', 'publishing'),
+}
+LOG_BATCH_SIZE = 1000
+
+
+def transition(pins, to_status, source='', expected=None):
+    """Move ``pins`` (a ScheduledPin queryset or ids) to ``to_status``.
+
+    Only pins currently in ``expected`` (default: ``ALLOWED_FROM[to_status]``)
+    change. The candidates are locked while the UPDATE and the log INSERT
+    run. Returns the number of pins moved.
+    """
+    return len(_move(pins, to_status, source, expected))
+
+
+def _move(pins, to_status, source, expected):
+    """``transition()``, returning the ids that moved."""
+    from pinterest_scheduler.models import ScheduledPin, ScheduledPinLog
+
+    expected = tuple(expected or ALLOWED_FROM[to_status])
+    if isinstance(pins, QuerySet):
+        candidates = pins.order_by()
+    else:
+        ids = list(pins)
+        if not ids:
+            return []
+        candidates = ScheduledPin.objects.filter(id__in=ids)
+
+    with transaction.atomic():
+        rows = list(
+            candidates.filter(status__in=expected)
+            .select_for_update(of=('self',))
+            .values_list('id', 'status')
+        )
+        if not rows:
+            return []
+        ScheduledPin.objects.filter(id__in=[pk for pk, _status in rows], status__in=expected).update(status=to_status)
+
+        batch, moment = uuid.uuid4(), timezone.now()
+        ScheduledPinLog.objects.bulk_create(
+            [
+                ScheduledPinLog(scheduled_pin_id=pk, from_status=status, to_status=to_status,
+                                batch=batch, source=source, created_at=moment)
+                for pk, status in rows
+            ],
+            batch_size=LOG_BATCH_SIZE,
+        )
+    # update() sends no post_save, so drop cached reads of the schedule (once the caller commits).
+    bump_generation_on_commit(model_namespace(ScheduledPin))
+    return [pk for pk, _status in rows]
+
+
+def claim_for_export(pins, source='export'):
+    """Move 'scheduled' pins to 'exported' and return the ids this caller moved.
+
+    Call it before writing the export and write only these ids: a pin a
+    publisher claimed in the meantime isn't among them.
+    """
+    return _move(pins, 'exported', source, None)
+
+
+def mark_posted(pins, source='posted'):
+    return transition(pins, 'posted', source=source)
+
+
+def claim_for_publishing(pins, source='publish'):
+    """Move 'scheduled' pins to 'publishing' and return the ids this caller claimed.
+
+    Two publishers (or a publisher and a CSV export) racing for the same pins
+    each get a disjoint share; only the claimed ids should be sent.
+    """
+    return _move(pins, 'publishing', source, None)
+
+
+def finish_publishing(published, failed=(), source='publish'):
+    """Settle claimed pins in one transaction and return the number posted.
+
+    ``published`` maps ScheduledPin id → remote pin id (stored, then 'posted');
+    ``failed`` ids go back to 'scheduled' for another attempt.
+    """
+    from pinterest_scheduler.models import ScheduledPin
+
+    with transaction.atomic():
+        ScheduledPin.objects.bulk_update(
+            [ScheduledPin(id=pk, remote_pin_id=remote_id or '') for pk, remote_id in published.items()],
+            ['remote_pin_id'],
+            batch_size=LOG_BATCH_SIZE,
+        )
+        posted = transition(list(published), 'posted', source=source, expected=('publishing',))
+        transition(list(failed), 'scheduled', source=source, expected=('publishing',))
+    return posted
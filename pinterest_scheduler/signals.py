@@ -0,0 +1,118 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Board, Campaign, Headline, Keyword, Pillar, PinTemplateVariation, RepurposedPostStatus, ScheduledPin
+from .services.caching import bump_generation_on_commit, model_namespace
+from .services.counters import (
+    bump_headline_counters,
+    bump_repurpose_counters_for_variation,
+    bump_variation_counters,
+    recount_parents,
+    signals_suspended,
+)
+from .services.summary import invalidate_repurpose_rollup
+
+
+@receiver(post_save, sender=RepurposedPostStatus)
+@receiver(post_delete, sender=RepurposedPostStatus)
+@receiver(post_save, sender=PinTemplateVariation)
+@receiver(post_delete, sender=PinTemplateVariation)
+def repurpose_rollup_changed(sender, instance, created=False, **kwargs):
+    if signals_suspended():
+        return
+    # Hook regeneration saves variations with update_fields; that doesn't move any totals.
+    update_fields = kwargs.get('update_fields')
+    if sender is PinTemplateVariation and update_fields and not created:
+        return
+    invalidate_repurpose_rollup()
+
+
+# ----------------------
+# Progress counters
+# ----------------------
+
+@receiver(post_save, sender=Headline)
+def headline_created(sender, instance, created, **kwargs):
+    if created and not signals_suspended():
+        bump_headline_counters(instance.pillar_id, 1)
+
+
+@receiver(post_delete, sender=Headline)
+def headline_deleted(sender, instance, **kwargs):
+    if not signals_suspended():
+        bump_headline_counters(instance.pillar_id, -1)
+
+
+@receiver(post_save, sender=PinTemplateVariation)
+def variation_created(sender, instance, created, **kwargs):
+    if created and not signals_suspended():
+        bump_variation_counters(instance.headline_id, 1)
+
+
+@receiver(post_delete, sender=PinTemplateVariation)
+def variation_deleted(sender, instance, **kwargs):
+    if not signals_suspended():
+        bump_variation_counters(instance.headline_id, -1)
+
+
+@receiver(post_save, sender=RepurposedPostStatus)
+def repurpose_status_created(sender, instance, created, **kwargs):
+    if created and not signals_suspended():
+        bump_repurpose_counters_for_variation(instance.variation_id, 1)
+
+
+@receiver(post_delete, sender=RepurposedPostStatus)
+def repurpose_status_deleted(sender, instance, **kwargs):
+    if not signals_suspended():
+        bump_repurpose_counters_for_variation(instance.variation_id, -1)
+
+
+# Moving a row to another parent carries its totals from the old parent to the
+# new one. pre_save remembers the parent the row had; post_save recounts both.
+# Model → (parent FK attname, recount_parents() argument for that parent's ids).
+REASSIGNABLE_PARENTS = {
+    PinTemplateVariation: ('headline_id', 'headline_ids'),
+    Headline: ('pillar_id', 'pillar_ids'),
+    Pillar: ('campaign_id', 'campaign_ids'),
+    RepurposedPostStatus: ('variation_id', 'variation_ids'),
+}
+
+
+def remember_parent(sender, instance, raw=False, update_fields=None, **kwargs):
+    attname, _argument = REASSIGNABLE_PARENTS[sender]
+    if raw or instance._state.adding or instance.pk is None or signals_suspended():
+        return
+    if update_fields is not None and not {attname, attname.removesuffix('_id')} & set(update_fields):
+        return
+    instance._previous_parent_id = sender.objects.filter(pk=instance.pk).values_list(attname, flat=True).first()
+
+
+def parent_reassigned(sender, instance, created, **kwargs):
+    if '_previous_parent_id' not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop('_previous_parent_id')
+    attname, argument = REASSIGNABLE_PARENTS[sender]
+    if not created and previous != getattr(instance, attname) and not signals_suspended():
+        recount_parents(**{argument: (previous, getattr(instance, attname))})
+
+
+for _model in REASSIGNABLE_PARENTS:
+    pre_save.connect(remember_parent, sender=_model, dispatch_uid=f'counter_parent_{_model.__name__}')
+    post_save.connect(parent_reassigned, sender=_model, dispatch_uid=f'counter_reassigned_{_model.__name__}')
+
+
+# ----------------------
+# Cache generations
+# ----------------------
+
+CACHED_MODELS = [Campaign, Pillar, Board, Keyword, ScheduledPin]
+
+
+def bump_model_generation(sender, using=None, **kwargs):
+    if not signals_suspended():
+        bump_generation_on_commit(model_namespace(sender), using=using)
+
+
+for _model in CACHED_MODELS:
+    post_save.connect(bump_model_generation, sender=_model, dispatch_uid=f'cache_generation_save_{_model.__name__}')
+    post_delete.connect(bump_model_generation, sender=_model, dispatch_uid=f'cache_generation_delete_{_model.__name__}')
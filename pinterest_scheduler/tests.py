@@ -1,3 +1,866 @@
-from django.test import TestCase
+import io
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.db.models.query import QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from pinterest_scheduler.admin import claim_export_pins
+from pinterest_scheduler.models import (
+    Board,
+    Campaign,
+    Headline,
+    Keyword,
+    Pillar,
+    PinTemplateVariation,
+    RepurposedPostStatus,
+    ScheduledPin,
+    ScheduledPinLog,
+)
+from pinterest_scheduler.services.api_client import PinterestApiClient, TokenBucket
+from pinterest_scheduler.services.caching import cached_value, get_generations
+from pinterest_scheduler.services.daily_picks import DAILY_PICK_COUNT, get_daily_picks, precompute_daily_picks
+from pinterest_scheduler.services.db_pool import pool_stats, reset_stats
+from pinterest_scheduler.services.exporter import export_scheduled_pins_to_csv
+from pinterest_scheduler.services.pinterest_stub import start_stub_server
+from pinterest_scheduler.services.publishing import FileSinkPublisher, PublishQueue, dispatch, run_daemon
+from pinterest_scheduler.services.repurpose import _insert_new_statuses, mark_repurposed
+from pinterest_scheduler.services.schedule_checks import check_schedule, schedule_arrays
+from pinterest_scheduler.services.schedule_optimizer import optimize_schedule
+from pinterest_scheduler.services.scheduling import (
+    PLANNED_FIELDS,
+    CampaignLocked,
+    PlannedRow,
+    apply_schedule,
+    campaign_lock,
+    diff_staged,
+    discard_staged,
+    fill_missing_campaigns,
+    promote_staged,
+    stage_schedule,
+)
+from pinterest_scheduler.services.slots import allocate_day
+from pinterest_scheduler.services.summary import pillar_completion_summary, repurpose_rollup
+from pinterest_scheduler.services.transitions import claim_for_publishing, transition
+from ruoth_pins.log_handlers import QueuedStreamHandler
+
+
+class CachedValueTests(TestCase):
+    # Settings give tests a local-memory cache; start each test from an empty one.
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def board_count(self):
+        self.calls += 1
+        return Board.objects.count()
+
+    def test_value_is_cached_until_a_dependency_changes(self):
+        self.assertEqual(cached_value('board-count', [Board], self.board_count), 0)
+        self.assertEqual(cached_value('board-count', [Board], self.board_count), 0)
+        self.assertEqual(self.calls, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Board.objects.create(name='Board', slug='board')
+        self.assertEqual(cached_value('board-count', [Board], self.board_count), 1)
+        self.assertEqual(self.calls, 2)
+
+    def test_unrelated_save_keeps_the_value(self):
+        cached_value('board-count', [Board], self.board_count)
+        with self.captureOnCommitCallbacks(execute=True):
+            Campaign.objects.create(name='C', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+        cached_value('board-count', [Board], self.board_count)
+        self.assertEqual(self.calls, 1)
+
+    def test_generation_moves_only_after_commit(self):
+        before = get_generations(['board'])['board']
+        with self.captureOnCommitCallbacks() as callbacks:
+            Board.objects.create(name='Board', slug='board')
+            self.assertEqual(get_generations(['board'])['board'], before)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(get_generations(['board'])['board'], before)
+
+    def test_rolled_back_save_does_not_bump(self):
+        before = get_generations(['board'])['board']
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Board.objects.create(name='Board', slug='board')
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_generations(['board'])['board'], before)
+
+
+class CounterTests(TestCase):
+    """Counters follow a row moved to another parent."""
+
+    def setUp(self):
+        self.campaigns, self.pillars, self.headlines = [], [], []
+        for n in range(2):
+            campaign = Campaign.objects.create(name=f'C{n}', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+            pillar = Pillar.objects.create(campaign=campaign, name=f'P{n}', tagline='')
+            self.campaigns.append(campaign)
+            self.pillars.append(pillar)
+            self.headlines.append(Headline.objects.create(pillar=pillar, text=f'H{n}'))
+        self.variation = PinTemplateVariation.objects.create(
+            headline=self.headlines[0], variation_number=1, cta='x', background_style='x',
+            mockup_name='x', badge_icon='x', description='x',
+        )
+        RepurposedPostStatus.objects.create(variation=self.variation, platform='tiktok')
+
+    def counts(self, *rows):
+        for row in rows:
+            row.refresh_from_db()
+        return [
+            (row.variation_count, getattr(row, 'headline_count', None), getattr(row, 'repurpose_count', None))
+            for row in rows
+        ]
+
+    def test_variation_moved_to_another_headline(self):
+        self.variation.headline = self.headlines[1]
+        self.variation.save()
+        self.assertEqual(self.counts(*self.headlines), [(0, None, None), (1, None, None)])
+        self.assertEqual(self.counts(*self.pillars), [(0, 1, None), (1, 1, None)])
+        self.assertEqual(self.counts(*self.campaigns), [(0, None, 0), (1, None, 1)])
+
+    def test_headline_moved_to_another_pillar(self):
+        headline = self.headlines[0]
+        headline.pillar = self.pillars[1]
+        headline.save()
+        self.assertEqual(self.counts(*self.pillars), [(0, 0, None), (1, 2, None)])
+        self.assertEqual(self.counts(*self.campaigns), [(0, None, 0), (1, None, 1)])
+
+    def test_pillar_moved_to_another_campaign(self):
+        pillar = self.pillars[0]
+        pillar.campaign = self.campaigns[1]
+        pillar.save()
+        self.assertEqual(self.counts(*self.campaigns), [(0, None, 0), (1, None, 1)])
+
+    def test_counter_generations_move_only_after_commit(self):
+        before = get_generations(['pillar', 'headline'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            PinTemplateVariation.objects.create(
+                headline=self.headlines[1], variation_number=1, cta='x', background_style='x',
+                mockup_name='x', badge_icon='x', description='x',
+            )
+            self.assertEqual(get_generations(['pillar', 'headline']), before)
+        for callback in callbacks:
+            callback()
+        after = get_generations(['pillar', 'headline'])
+        self.assertNotEqual(after['pillar'], before['pillar'])
+        self.assertNotEqual(after['headline'], before['headline'])
+
+    def test_mark_repurposed_counts_only_its_own_inserts(self):
+        self.assertEqual(mark_repurposed([self.variation.pk], ['tiktok', 'instagram']), 1)
+        self.assertEqual(mark_repurposed([self.variation.pk], ['tiktok', 'instagram']), 0)
+        self.assertEqual(self.counts(self.campaigns[0]), [(1, None, 2)])
+
+    def test_insert_skips_rows_inserted_meanwhile(self):
+        # A row committed by someone else after mark_repurposed read the existing ones.
+        RepurposedPostStatus.objects.create(variation=self.variation, platform='youtube')
+        campaign_id = self.campaigns[0].pk
+        inserted = _insert_new_statuses([(self.variation.pk, 'youtube', campaign_id),
+                                         (self.variation.pk, 'instagram', campaign_id)])
+        self.assertEqual(inserted, [self.variation.pk])
+        self.assertEqual(RepurposedPostStatus.objects.filter(variation=self.variation).count(), 3)
+
+
+class RepurposeRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.campaign = Campaign.objects.create(name='A', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+        self.empty = Campaign.objects.create(name='B', start_date=date(2026, 2, 1), end_date=date(2026, 2, 28))
+        pillar = Pillar.objects.create(campaign=self.campaign, name='P', tagline='')
+        self.variation = PinTemplateVariation.objects.create(
+            headline=Headline.objects.create(pillar=pillar, text='H'), variation_number=1,
+            cta='x', background_style='x', mockup_name='x', badge_icon='x', description='x',
+        )
+
+    def test_campaign_without_pillars_is_listed(self):
+        RepurposedPostStatus.objects.create(variation=self.variation, platform='tiktok', campaign=self.campaign)
+        rows = {row['campaign']: row for row in repurpose_rollup()}
+        self.assertEqual(list(rows), ['A', 'B'])
+        self.assertEqual((rows['A']['total'], rows['A']['platform_counts']['tiktok']), (1, 1))
+        self.assertEqual(rows['A']['pillars'][0]['platform_counts']['tiktok'], 1)
+        self.assertEqual((rows['B']['total'], rows['B']['pillars']), (0, []))
+
+    def test_campaign_totals_follow_the_status_campaign(self):
+        RepurposedPostStatus.objects.create(variation=self.variation, platform='youtube', campaign=self.empty)
+        rows = {row['campaign']: row for row in repurpose_rollup()}
+        self.assertEqual(rows['A']['platform_counts']['youtube'], 0)
+        self.assertEqual(rows['B']['platform_counts']['youtube'], 1)
+
+    def test_rollup_is_refreshed_after_commit(self):
+        self.assertEqual(repurpose_rollup()[0]['platform_counts']['tiktok'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            RepurposedPostStatus.objects.create(variation=self.variation, platform='tiktok', campaign=self.campaign)
+            self.assertEqual(repurpose_rollup()[0]['platform_counts']['tiktok'], 0)
+        self.assertEqual(repurpose_rollup()[0]['platform_counts']['tiktok'], 1)
+
+
+class DailyPickTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.campaign = Campaign.objects.create(name='C', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+        for p in range(5):
+            headline = Headline.objects.create(
+                pillar=Pillar.objects.create(campaign=self.campaign, name=f'P{p}', tagline=''), text=f'H{p}'
+            )
+            for n in range(2):
+                PinTemplateVariation.objects.create(
+                    headline=headline, variation_number=n, cta='x', background_style='x',
+                    mockup_name='x', badge_icon='x', description='x',
+                )
+
+    def test_repurposed_pick_is_replaced_from_another_pillar(self):
+        first, _hooks = precompute_daily_picks(self.campaign, self.day, generate_hooks=False)
+        self.assertEqual(len(first), DAILY_PICK_COUNT)
+        done = first[1]
+        for platform, _label in RepurposedPostStatus.PLATFORM_CHOICES:
+            RepurposedPostStatus.objects.create(variation=done, platform=platform, campaign=self.campaign)
+
+        second, _hooks = precompute_daily_picks(self.campaign, self.day, generate_hooks=False)
+        self.assertEqual(second[:3], [first[0], first[2], first[3]])
+        self.assertEqual(len({pick.headline.pillar_id for pick in second}), DAILY_PICK_COUNT)
+        self.assertNotIn(done, second)
+        self.assertEqual(get_daily_picks(self.campaign.id, self.day), second)
+
+
+class PillarSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        campaign = Campaign.objects.create(
+            name='C', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30), max_variations_per_headline=4,
+        )
+        self.pillar = Pillar.objects.create(campaign=campaign, name='P', tagline='')
+        headline = Headline.objects.create(pillar=self.pillar, text='H')
+        for n in range(4):
+            PinTemplateVariation.objects.create(
+                headline=headline, variation_number=n, cta='x', background_style='x',
+                mockup_name='x', badge_icon='x', description='x',
+            )
+
+    def test_pillar_short_of_headlines_is_not_complete(self):
+        [row] = pillar_completion_summary()
+        self.assertEqual((row['headline_count'], row['variation_count']), (1, 4))
+        self.assertEqual(row['variation_target'], 20)
+        self.assertEqual(row['percent_complete'], 20)
+        self.assertFalse(row['complete'])
+
+
+def make_scheduled_pins(count, day, campaign_name='C', boards=2):
+    """``count`` scheduled pins on ``day``, one variation each, alternating over ``boards`` boards."""
+    campaign = Campaign.objects.create(name=campaign_name, start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+    headline = Headline.objects.create(pillar=Pillar.objects.create(campaign=campaign, name='P', tagline=''), text='H')
+    board_rows = [
+        Board.objects.get_or_create(slug=f'b{n}', defaults={'name': f'B{n}'})[0] for n in range(boards)
+    ]
+    return [
+        ScheduledPin.objects.create(
+            pin=PinTemplateVariation.objects.create(
+                headline=headline, variation_number=n, cta='x', background_style='x',
+                mockup_name='x', badge_icon='x', description='x',
+            ),
+            board=board_rows[n % boards], publish_date=day, campaign_day=day.day, slot_number=n,
+        )
+        for n in range(count)
+    ]
+
+
+class ScheduledPinSaveTests(TestCase):
+    def test_changing_the_pin_moves_the_campaign(self):
+        scheduled = make_scheduled_pins(1, date(2026, 1, 5), campaign_name='A')[0]
+        other = make_scheduled_pins(1, date(2026, 1, 5), campaign_name='B')[0]
+        scheduled = ScheduledPin.objects.get(pk=scheduled.pk)
+        scheduled.pin_id = other.pin_id
+        scheduled.save()
+        self.assertEqual(ScheduledPin.objects.get(pk=scheduled.pk).campaign_id, other.campaign_id)
+
+    def test_fill_missing_campaigns(self):
+        first, second = make_scheduled_pins(2, date(2026, 1, 5), campaign_name='A')
+        orphan = make_scheduled_pins(1, date(2026, 1, 5), campaign_name='B')[0]
+        Pillar.objects.filter(headlines__variations=orphan.pin_id).update(campaign=None)
+        ScheduledPin.objects.update(campaign=None)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(fill_missing_campaigns(ScheduledPin.objects.exclude(pk=second.pk)), 1)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(fill_missing_campaigns(), 1)
+        self.assertEqual(fill_missing_campaigns(), 0)
+        campaigns = dict(ScheduledPin.objects.values_list('pk', 'campaign__name'))
+        self.assertEqual(campaigns, {first.pk: 'A', second.pk: 'A', orphan.pk: None})
+
+
+class AllocateDayTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.pins = make_scheduled_pins(4, self.day)
+
+    def times(self):
+        return {pin.pk: pin.publish_at for pin in ScheduledPin.objects.filter(publish_date=self.day)}
+
+    def test_handed_off_pins_keep_their_time(self):
+        windows = [(time_of_day(9), time_of_day(21))]
+        allocate_day(self.day, windows=windows)
+        first = self.times()
+        exported, publishing = self.pins[0], self.pins[1]
+        ScheduledPin.objects.filter(pk=exported.pk).update(status='exported')
+        ScheduledPin.objects.filter(pk=publishing.pk).update(status='publishing')
+
+        ScheduledPin.objects.filter(pk=self.pins[2].pk).delete()  # the day changes and is re-spread
+        self.assertEqual(allocate_day(self.day, windows=windows, respread=True), 1)
+        second = self.times()
+        self.assertEqual(second[exported.pk], first[exported.pk])
+        self.assertEqual(second[publishing.pk], first[publishing.pk])
+        self.assertEqual(len(set(second.values())), 3)
+
+    def test_new_pins_fill_free_slots_around_existing_times(self):
+        windows = [(time_of_day(9), time_of_day(21))]
+        allocate_day(self.day, windows=windows)
+        first = self.times()
+        others = make_scheduled_pins(4, self.day, campaign_name='D')
+        self.assertEqual(allocate_day(self.day, windows=windows), 4)
+        second = self.times()
+        self.assertEqual({pk: second[pk] for pk in first}, first)
+        self.assertEqual(len(set(second.values())), 8)
+        self.assertFalse({second[pin.pk] for pin in others} & set(first.values()))
+
+    def test_only_the_given_pins_are_timed(self):
+        self.assertEqual(allocate_day(self.day, pin_ids={self.pins[0].pk}), 1)
+        self.assertEqual(sum(1 for moment in self.times().values() if moment), 1)
+
+    def test_todays_slots_start_after_now(self):
+        current = timezone.make_aware(datetime.combine(self.day, time_of_day(15)))
+        with mock.patch('pinterest_scheduler.services.slots.now', return_value=current):
+            allocate_day(self.day, windows=[(time_of_day(9), time_of_day(21))])
+        times = sorted(self.times().values())
+        self.assertEqual(times[0], current)
+        self.assertLess(times[-1], timezone.make_aware(datetime.combine(self.day, time_of_day(21))))
+
+
+class ScheduleDiffTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.pins = make_scheduled_pins(4, self.day)
+        self.campaign_id = self.pins[0].campaign_id
+
+    def live_rows(self):
+        return [
+            PlannedRow(*values)
+            for values in ScheduledPin.objects.filter(campaign_id=self.campaign_id)
+            .order_by('publish_date', 'slot_number', 'id')
+            .values_list(*PLANNED_FIELDS)
+        ]
+
+    def apply(self, rows):
+        with self.captureOnCommitCallbacks(execute=True):
+            return apply_schedule(self.campaign_id, rows, self.day)
+
+    def stage(self, rows):
+        stage_schedule(self.campaign_id, rows, self.day)
+
+    def changes(self, diff):
+        return {key: len(diff[key]) for key in ('added', 'removed', 'moved', 'renumbered')} | {'kept': diff['kept']}
+
+    def test_reapplying_the_same_plan_changes_nothing(self):
+        diff = self.apply(self.live_rows())
+        self.assertEqual(self.changes(diff), {'added': 0, 'removed': 0, 'moved': 0, 'renumbered': 0, 'kept': 0})
+        self.assertEqual(diff['unchanged'], 4)
+
+    def test_moving_a_pin_a_day_moves_it_and_renumbers_the_rest(self):
+        first, *rest = self.live_rows()
+        next_day = self.day + timedelta(days=1)
+        plan = [first._replace(publish_date=next_day, campaign_day=first.campaign_day + 1)]
+        plan += [row._replace(slot_number=slot) for slot, row in enumerate(rest)]
+        diff = self.apply(plan)
+        self.assertEqual(self.changes(diff), {'added': 0, 'removed': 0, 'moved': 1, 'renumbered': 3, 'kept': 0})
+        self.assertEqual(ScheduledPin.objects.get(pk=self.pins[0].pk).publish_date, next_day)
+        self.assertEqual(sorted(self.live_rows()), sorted(plan))
+        self.assertEqual(self.changes(self.apply(plan))['moved'], 0)
+
+    def test_handed_off_pins_are_kept(self):
+        transition([self.pins[0].pk], 'exported')
+        claim_for_publishing([self.pins[1].pk])
+        diff = self.apply([])
+        self.assertEqual(self.changes(diff), {'added': 0, 'removed': 2, 'moved': 0, 'renumbered': 0, 'kept': 2})
+        self.assertEqual(
+            set(ScheduledPin.objects.values_list('pk', flat=True)), {self.pins[0].pk, self.pins[1].pk}
+        )
+
+    def test_publishing_pin_is_matched_not_added_again(self):
+        claim_for_publishing([self.pins[0].pk])
+        diff = self.apply(self.live_rows())
+        self.assertEqual((len(diff['added']), diff['unchanged']), (0, 4))
+
+    def test_promote_diffs_against_the_live_schedule_at_promotion(self):
+        plan = self.live_rows()
+        self.stage(plan[:3])
+        self.assertEqual(self.changes(diff_staged(self.campaign_id))['removed'], 1)
+        ScheduledPin.objects.filter(pk=self.pins[3].pk).delete()  # changed after review
+        ScheduledPin.objects.filter(pk=self.pins[2].pk).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            diff = promote_staged(self.campaign_id)
+        self.assertEqual(self.changes(diff), {'added': 1, 'removed': 0, 'moved': 0, 'renumbered': 0, 'kept': 0})
+        self.assertEqual(sorted(self.live_rows()), sorted(plan[:3]))
+        self.assertIsNone(diff_staged(self.campaign_id))
+
+    def test_promoting_twice_or_after_discard_does_nothing(self):
+        self.stage(self.live_rows())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNotNone(promote_staged(self.campaign_id))
+            self.assertIsNone(promote_staged(self.campaign_id))
+        self.stage(self.live_rows())
+        self.assertEqual(discard_staged(self.campaign_id), 4)
+        self.assertIsNone(promote_staged(self.campaign_id))
+
+
+class CampaignLockTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.first = make_scheduled_pins(3, self.day, campaign_name='A')[0].campaign_id
+        self.second = make_scheduled_pins(3, self.day, campaign_name='B')[0].campaign_id
+
+    def pin_ids(self, campaign_id):
+        return set(ScheduledPin.objects.filter(campaign_id=campaign_id).values_list('pk', flat=True))
+
+    def test_holding_one_campaign_does_not_block_another(self):
+        first_pins = self.pin_ids(self.first)
+        with self.captureOnCommitCallbacks(execute=True):
+            with campaign_lock(self.first, nowait=True):
+                diff = apply_schedule(self.second, [], self.day, nowait=True)
+        self.assertEqual(len(diff['removed']), 3)
+        self.assertEqual(self.pin_ids(self.second), set())
+        self.assertEqual(self.pin_ids(self.first), first_pins)
+
+    def test_one_campaign_leaves_the_other_untouched(self):
+        second_pins = self.pin_ids(self.second)
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_schedule(self.first, [], self.day)
+        self.assertEqual(self.pin_ids(self.first), set())
+        self.assertEqual(self.pin_ids(self.second), second_pins)
+
+    @mock.patch.object(connection.features, 'has_select_for_update_nowait', True)
+    @mock.patch.object(connection.features, 'has_select_for_update', True)
+    def test_nowait_raises_when_the_campaign_is_locked(self):
+        pins = self.pin_ids(self.first)
+        with mock.patch.object(QuerySet, 'get', side_effect=OperationalError('could not obtain lock')):
+            with self.assertRaises(CampaignLocked):
+                apply_schedule(self.first, [], self.day, nowait=True)
+        self.assertEqual(self.pin_ids(self.first), pins)
+
+
+class TransitionTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.pins = make_scheduled_pins(3, self.day)
+        self.ids = [pin.pk for pin in self.pins]
+
+    def statuses(self):
+        return list(ScheduledPin.objects.filter(id__in=self.ids).order_by('id').values_list('status', flat=True))
+
+    def test_transition_skips_pins_already_moved(self):
+        self.assertEqual(transition(self.ids[:1], 'posted', source='first'), 1)
+        self.assertEqual(transition(self.ids, 'exported', source='second'), 2)
+        self.assertEqual(self.statuses(), ['posted', 'exported', 'exported'])
+
+        logs = ScheduledPinLog.objects.filter(source='second')
+        self.assertEqual(sorted(logs.values_list('scheduled_pin_id', flat=True)), self.ids[1:])
+        self.assertEqual(set(logs.values_list('from_status', 'to_status')), {('scheduled', 'exported')})
+        self.assertEqual(logs.values('batch').distinct().count(), 1)
+
+    def test_export_leaves_out_pins_a_publisher_claimed(self):
+        self.assertEqual(claim_for_publishing(self.ids[:1]), self.ids[:1])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path, count = export_scheduled_pins_to_csv(self.day, output_path=f'{tmpdir}/out.csv')
+            with open(path, encoding='utf-8') as fh:
+                self.assertEqual(len(fh.readlines()), 1 + 2)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.statuses(), ['publishing', 'exported', 'exported'])
+        self.assertEqual(claim_for_publishing(self.ids), [])  # the export holds them now
+
+    def test_reexport_never_includes_posted_or_publishing_pins(self):
+        transition(self.ids[:1], 'posted')
+        claim_for_publishing(self.ids[1:2])
+        request = RequestFactory().get('/', {'all': '1'})
+        self.assertEqual([pin.pk for pin in claim_export_pins(request, self.day)], self.ids[2:])
+        self.assertEqual([pin.pk for pin in claim_export_pins(request, self.day)], self.ids[2:])  # already exported
+
+
+class SmartLoopBudgetTests(TestCase):
+    def test_campaigns_share_one_optimiser_budget(self):
+        make_scheduled_pins(6, date(2026, 1, 5), campaign_name='A', boards=5)
+        make_scheduled_pins(6, date(2026, 1, 5), campaign_name='B', boards=5)
+        model_admin = admin.site._registry[PinTemplateVariation]
+        with (
+            override_settings(SCHEDULE_OPTIMIZER_BUDGET=0.2),
+            mock.patch('pinterest_scheduler.admin.optimize_schedule', wraps=optimize_schedule) as optimizer,
+            mock.patch.object(model_admin, 'message_user'),
+        ):
+            model_admin.smartloop_schedule(RequestFactory().post('/'), PinTemplateVariation.objects.all(), dry_run=True)
+        first, second = [call.kwargs['time_budget'] for call in optimizer.call_args_list]
+        self.assertLessEqual(first, 0.1)
+        self.assertLess(second, 0.2)
+
+
+class PreviewTests(TestCase):
+    day = date(2026, 1, 5)
+
+    def setUp(self):
+        self.pins = make_scheduled_pins(3, self.day)
+
+    def assertUntouched(self):
+        self.assertEqual(
+            set(ScheduledPin.objects.values_list('status', 'publish_at')), {('scheduled', None)}
+        )
+
+    def test_schedule_preview_lists_unallocated_pins_without_writing(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get('/admin/pinterest_scheduler/scheduledpin/preview/', {'date': '2026-01-05'})
+        self.assertEqual(response.content.decode().count('<em>unallocated</em>'), 3)
+        self.assertUntouched()
+
+    def test_dry_run_export_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _path, count = export_scheduled_pins_to_csv(self.day, output_path=f'{tmpdir}/out.csv', dry_run=True)
+        self.assertEqual(count, 3)
+        self.assertUntouched()
+
+
+class PublishingTests(TestCase):
+    day = date(2026, 1, 5)
+    now = timezone.make_aware(datetime(2026, 1, 5, 12))
+
+    def setUp(self):
+        cache.clear()
+        self.pins = make_scheduled_pins(4, self.day)
+        self.ids = [pin.pk for pin in self.pins]
+        # Ten minutes overdue, due now, in an hour, beyond the horizon.
+        for pin, minutes in zip(self.pins, (-10, 0, 60, 7 * 60)):
+            ScheduledPin.objects.filter(pk=pin.pk).update(publish_at=self.now + timedelta(minutes=minutes))
+        sink = tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False)
+        sink.close()
+        self.addCleanup(lambda: os.remove(sink.name))
+        self.publisher = FileSinkPublisher(sink.name)
+
+    def statuses(self):
+        return list(ScheduledPin.objects.filter(id__in=self.ids).order_by('id').values_list('status', flat=True))
+
+    def test_queue_loads_the_horizon_and_pops_due_pins(self):
+        queue = PublishQueue(watch_generation=True)
+        self.assertTrue(queue.stale(self.now))
+        self.assertEqual(queue.reload(self.now), 3)
+        self.assertFalse(queue.stale(self.now))
+        self.assertEqual(queue.pop_due(self.now), self.ids[:2])
+        self.assertEqual(queue.next_due(), self.now + timedelta(hours=1))
+        self.assertTrue(queue.stale(queue.loaded_until))
+
+    def test_held_pins_stay_held_across_reloads(self):
+        queue = PublishQueue(watch_generation=True)
+        queue.reload(self.now)
+        due = queue.pop_due(self.now)
+        queue.hold(due, self.now + timedelta(minutes=5))
+        queue.reload(self.now + timedelta(minutes=1))
+        self.assertEqual(queue.pop_due(self.now + timedelta(minutes=1)), [])
+        self.assertEqual(queue.pop_due(self.now + timedelta(minutes=5)), due)
+
+    def test_queue_follows_the_generation_or_reloads_every_check(self):
+        watching, polling = PublishQueue(watch_generation=True), PublishQueue(watch_generation=False)
+        watching.reload(self.now)
+        polling.reload(self.now)
+        self.assertTrue(polling.stale(self.now))
+        with self.captureOnCommitCallbacks(execute=True):
+            ScheduledPin.objects.filter(pk=self.ids[2]).first().save()
+        self.assertTrue(watching.stale(self.now))
+
+    def test_dispatch_posts_only_pins_still_due(self):
+        transition(self.ids[1:2], 'exported')
+        posted, failed = dispatch(self.ids, self.publisher, self.now)
+        self.assertEqual((posted, failed), (1, []))
+        self.assertEqual(self.statuses(), ['posted', 'exported', 'scheduled', 'scheduled'])
+        with open(self.publisher.path, encoding='utf-8') as fh:
+            self.assertEqual(len(fh.readlines()), 1)
+
+    def test_publisher_error_returns_the_pins_to_scheduled(self):
+        with mock.patch.object(self.publisher, 'publish', side_effect=RuntimeError('down')):
+            posted, failed = dispatch(self.ids[:2], self.publisher, self.now)
+        self.assertEqual((posted, failed), (0, self.ids[:2]))
+        self.assertEqual(self.statuses(), ['scheduled'] * 4)
+
+    def test_run_daemon_once_publishes_what_is_due(self):
+        with mock.patch('pinterest_scheduler.services.publishing.timezone.now', return_value=self.now):
+            self.assertEqual(run_daemon(self.publisher, PublishQueue(watch_generation=False), once=True), 2)
+        self.assertEqual(self.statuses(), ['posted', 'posted', 'scheduled', 'scheduled'])
+
+
+@override_settings(DB_POOL_TELEMETRY=True)
+class ConnectionTelemetryTests(TestCase):
+    def setUp(self):
+        reset_stats()
+        self.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def counts(self):
+        stats = pool_stats()
+        return stats['requests'], stats['reused'], stats['opened']
+
+    def test_only_requests_that_query_are_counted(self):
+        self.assertEqual(self.client.get('/admin/').status_code, 302)  # anonymous: no query
+        self.assertEqual(self.counts(), (0, 0, 0))
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/admin/').status_code, 200)
+        self.assertEqual(self.counts(), (1, 1, 0))  # the test connection is already open
+
+    async def test_async_requests_are_counted(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counts(), (1, 1, 0))
+
+
+class QueuedStreamHandlerTests(SimpleTestCase):
+    def record(self, msg):
+        return logging.makeLogRecord({'name': 'test', 'levelno': logging.INFO, 'levelname': 'INFO', 'msg': msg})
+
+    def test_dropped_records_are_reported(self):
+        stream = io.StringIO()
+        handler = QueuedStreamHandler(stream=stream, fmt='text', maxsize=2)
+        handler.listener.stop()  # nothing drains the queue until it is restarted
+        for n in range(5):
+            handler.handle(self.record(f'record {n}'))
+        self.assertEqual((handler.dropped, handler.unreported), (3, 3))
+        handler.listener.start()
+        handler.stop()
+        self.assertIn('Dropped 3 log records (queue full), 3 since start', stream.getvalue())
+        self.assertEqual(handler.unreported, 0)
+
+
+class ChangelistCountTests(TestCase):
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.campaign = Campaign.objects.create(
+            name='C', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30), max_variations_per_headline=2,
+        )
+        self.keywords = [self.add_keyword(f'k{n}') for n in range(2)]
+        self.add_pillar('Small', headlines=1)
+        self.add_pillar('Big', headlines=3)
+
+    def add_keyword(self, phrase):
+        return Keyword.objects.create(
+            phrase=phrase, currency='USD', avg_monthly_searches=10, tier='mid', three_month_change='0%',
+            yoy_change='0%', competition='low', competition_index=0.1, bid_low=0.1, bid_high=0.2,
+        )
+
+    def add_pillar(self, name, headlines):
+        pillar = Pillar.objects.create(campaign=self.campaign, name=name, tagline='')
+        for h in range(headlines):
+            headline = Headline.objects.create(pillar=pillar, text=f'{name} {h}')
+            variation = PinTemplateVariation.objects.create(
+                headline=headline, variation_number=1, cta='x', background_style='x',
+                mockup_name='x', badge_icon='x', description='x',
+            )
+            variation.keywords.add(*self.keywords[:h + 1])
+        return pillar
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode(), len(queries)
+
+    def cells(self, html, field):
+        return re.findall(rf'<td class="field-{field}">([^<]*)</td>', html)
+
+    def test_pillar_progress_columns(self):
+        url = '/admin/pinterest_scheduler/pillar/'
+        self.get(url)  # warm the cached filter choices
+        html, few = self.get(url + '?o=4')
+        self.assertEqual(self.cells(html, 'headline_progress'), ['1 / 5', '3 / 5'])
+        self.assertEqual(self.cells(html, 'variation_progress'), ['1 / 10', '3 / 10'])
+        self.add_pillar('More', headlines=2)
+        html, many = self.get(url + '?o=-4')
+        self.assertEqual(self.cells(html, 'headline_progress'), ['3 / 5', '2 / 5', '1 / 5'])
+        self.assertEqual(many, few)
+
+    def test_keyword_used_in_pins_column(self):
+        url = '/admin/pinterest_scheduler/keyword/'
+        self.get(url)
+        html, few = self.get(url + '?o=1')
+        self.assertEqual(self.cells(html, 'used_in_pins'), ['4', '2'])
+        self.add_keyword('k2')
+        html, many = self.get(url + '?o=1')
+        self.assertEqual(self.cells(html, 'used_in_pins'), ['4', '2', '0'])
+        self.assertEqual(many, few)
+
+
+class VariationChangelistTests(TestCase):
+    url = '/admin/pinterest_scheduler/pintemplatevariation/'
+
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        campaign = Campaign.objects.create(name='C', start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))
+        self.pillar = Pillar.objects.create(campaign=campaign, name='P', tagline='')
+        self.add_variations('H1', 3)
+        RepurposedPostStatus.objects.create(variation=self.variations[1], platform='tiktok', campaign=campaign)
+
+    def add_variations(self, text, count):
+        headline = Headline.objects.create(pillar=self.pillar, text=text)
+        self.variations = [
+            PinTemplateVariation.objects.create(
+                headline=headline, variation_number=n, cta='x', background_style='x',
+                mockup_name='x', badge_icon='x', description='x',
+            )
+            for n in range(count)
+        ]
+
+    def get(self, query=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode(), len(queries)
+
+    def test_columns_cost_no_query_per_row(self):
+        self.get()  # warm the cached filter choices
+        html, few = self.get()
+        self.assertEqual(html.count('<td class="field-repurpose_tiktok">✅</td>'), 1)
+        self.add_variations('H2', 6)
+        html, many = self.get()
+        self.assertEqual(many, few)
+        self.assertIn('Variation 6 of 6', html)
+
+    def test_search_matches_headline_text(self):
+        self.add_variations('Sourdough starter', 2)
+        html, _queries = self.get('?q=sourdough')
+        self.assertIn('2 pin template variations', html)
+
+    def test_position_counts_siblings_hidden_by_search(self):
+        PinTemplateVariation.objects.filter(pk=self.variations[2].pk).update(title='needle')
+        html, _queries = self.get('?q=needle')
+        self.assertIn('Variation 3 of 3', html)
+
+
+@override_settings(SQL_BUDGET_ENABLED=True, SQL_BUDGET_HEADER=True)
+class SQLBudgetTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def test_queries_are_counted(self):
+        self.client.force_login(self.user)
+        self.assertGreater(int(self.client.get('/admin/')['X-SQL-Queries']), 0)
+
+    async def test_async_queries_are_counted(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/admin/')
+        self.assertGreater(int(response['X-SQL-Queries']), 0)
+
+
+class ScheduleCheckTests(SimpleTestCase):
+    def day_rows(self, day, pillar_counts):
+        rows, pin = [], 0
+        for pillar, count in pillar_counts.items():
+            for _ in range(count):
+                pin += 1
+                rows.append((day, pin % 5, day.toordinal() * 100 + pin, pillar))
+        return rows
+
+    def test_uneven_pillars_at_their_share_are_balanced(self):
+        # Pillar 1 has 3/4 of the pins, so 15 of 20 a day is its share, not an imbalance.
+        rows = [row for d in range(1, 4) for row in self.day_rows(date(2026, 1, d), {1: 15, 2: 5})]
+        report = check_schedule(schedule_arrays(rows), min_spacing_days=1)
+        self.assertEqual(report['counts']['pillar_imbalance'], 0)
+
+    def test_day_far_from_the_share_is_reported(self):
+        rows = self.day_rows(date(2026, 1, 1), {1: 10, 2: 10}) + self.day_rows(date(2026, 1, 2), {1: 20})
+        report = check_schedule(schedule_arrays(rows), min_spacing_days=1)
+        self.assertEqual(report['counts']['pillar_imbalance'], 2)
+        self.assertEqual(report['violations']['pillar_imbalance'][0]['expected'], {1: 15.0, 2: 5.0})
+
+
+def pin_item(key, board_id='board-1'):
+    return key, {'board_id': board_id, 'title': key, 'media_source': {'source_type': 'image_url', 'url': 'https://example.com/p.png'}}
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.bucket = TokenBucket(2, 2, clock=lambda: self.now, sleep=self.advance)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def test_burst_then_rate(self):
+        waits = [self.bucket.acquire() for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 0.5])
+
+    def test_pause_holds_every_caller(self):
+        self.bucket.pause(3)
+        self.assertAlmostEqual(self.bucket.try_acquire(), 3)  # tokens saved up don't bypass it
+        self.assertAlmostEqual(self.bucket.acquire(), 3)
+
+
+@mock.patch('pinterest_scheduler.services.api_client.BACKOFF_BASE', 0.01)
+class PinterestApiClientTests(SimpleTestCase):
+    """The client against a local pinterest_stub server."""
+
+    def start(self, **options):
+        server, base_url = start_stub_server(token='test-token', **options)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = PinterestApiClient(base_url=base_url, access_token='test-token', rate=100, burst=100,
+                                    max_connections=4, max_retries=3)
+        self.addCleanup(client.close)
+        return server.state, client
+
+    def test_429_pauses_every_worker_then_succeeds(self):
+        state, client = self.start(rate=4, burst=1)
+        pauses = []
+        pause = client.bucket.pause
+        client.bucket.pause = lambda seconds: (pauses.append(seconds), pause(seconds))
+
+        started = time.monotonic()
+        results = client.create_pins([pin_item(f'k{i}') for i in range(4)])
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertGreater(state.stats['throttled'], 0)
+        self.assertTrue(pauses)  # the shared bucket was paused for Retry-After...
+        self.assertGreaterEqual(time.monotonic() - started, min(pauses))  # ...and the batch waited it out
+
+    def test_503_is_retried(self):
+        state, client = self.start(fail_next=2)
+        results = client.create_pins([pin_item('k1')])
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(state.stats['failed'], 2)
+        self.assertEqual(state.stats['created'], 1)
+
+    def test_repeated_key_replays_the_original_pin(self):
+        state, client = self.start()
+        first = client.create_pins([pin_item('same-key')])[0]
+        second = client.create_pins([pin_item('same-key')])[0]
+
+        self.assertEqual(first.remote_id, second.remote_id)
+        self.assertEqual(state.stats['created'], 1)
+        self.assertEqual(state.stats['replayed'], 1)
+
+    def test_failed_pin_does_not_stop_the_batch(self):
+        state, client = self.start()
+        results = client.create_pins([pin_item('k1'), pin_item('k2', board_id=''), pin_item('k3')])
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertEqual(results[1].status, 400)
+        self.assertEqual(state.stats['created'], 2)
@@ -1,11 +1,19 @@
 from django.urls import path
-from .admin import export_today_csv, dry_run_preview, bundle_export, repurpose_summary_dashboard
+from .admin import export_today_csv, dry_run_preview, bundle_export, repurpose_summary_dashboard, db_pool_stats
+from . import async_views
 
 urlpatterns = [
     path("export_today_csv/", export_today_csv, name="export_today_csv"),
     path("dry_run_preview/", dry_run_preview, name="dry_run_preview"),
     path("bundle_export/", bundle_export, name="bundle_export"),
     path("repurpose-dashboard/", repurpose_summary_dashboard, name="repurpose_dashboard"),  # ✅ Add name
+    path("db-pool-stats/", db_pool_stats, name="db_pool_stats"),
+
+    # Async variants (worth it under ASGI; see async_views.py)
+    path("async/export_today_csv/", async_views.export_today_csv, name="async_export_today_csv"),
+    path("async/bundle_export/", async_views.bundle_export, name="async_bundle_export"),
+    path("async/repurpose-dashboard/", async_views.repurpose_summary_dashboard, name="async_repurpose_dashboard"),
+    path("async/daily4/", async_views.random_repurpose_view, name="async_random_repurpose_view"),
 
 
 ]
\ No newline at end of file
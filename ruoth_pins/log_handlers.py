@@ -0,0 +1,139 @@
+"""
+Logging plumbing referenced from settings.LOGGING.
+
+Records are handed to a bounded queue on the calling thread and written by a
+single QueueListener thread, so request threads never block on stream I/O.
+Messages are rendered on the calling thread (arguments can be mutable or
+lazy objects); the JSON encoding and the write happen on the listener.
+Hot-loop loggers can be sampled with SamplingFilter.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a share of sub-WARNING records from selected loggers.
+
+    ``rates`` maps logger-name prefixes to a keep ratio (0.0–1.0); the longest
+    matching prefix wins. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1.0 or random.random() < rate
+        return True
+
+
+class QueuedStreamHandler(QueueHandler):
+    """QueueHandler that owns its listener and a StreamHandler behind it.
+
+    When the queue is full records are dropped (and counted) rather than
+    blocking the caller. The count is reported as a WARNING once the queue
+    has room again, and at exit for drops nobody has reported yet;
+    ``dropped`` keeps the running total for this process.
+    """
+
+    def __init__(self, stream=None, fmt='json', maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        target = logging.StreamHandler(stream or sys.stderr)
+        if fmt == 'json':
+            target.setFormatter(JsonFormatter())
+        else:
+            target.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        self.dropped = 0
+        self.unreported = 0
+        self.target = target
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        atexit.unregister(self.stop)
+        self.listener.stop()
+        if self.unreported:
+            self.target.handle(self.drop_report())
+            self.unreported = 0
+
+    def drop_report(self):
+        return self.prepare(logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': 'WARNING',
+            'msg': 'Dropped %d log records (queue full), %d since start',
+            'args': (self.unreported, self.dropped),
+        }))
+
+    def prepare(self, record):
+        # As QueueHandler.prepare: render the message now, while its arguments
+        # still hold the values they had at the call, and drop args / exc_info
+        # so nothing mutable or unformattable crosses to the listener thread.
+        # The traceback travels as exc_text, which the target formatters print.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Runs under the handler lock (Handler.handle), so the counters need no lock of their own.
+        try:
+            if self.unreported:
+                self.queue.put_nowait(self.drop_report())
+                self.unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.unreported += 1
+
+
+def dropped_records():
+    """Records dropped so far by the root logger's queued handlers in this process."""
+    return sum(
+        handler.dropped for handler in logging.getLogger().handlers
+        if isinstance(handler, QueuedStreamHandler)
+    )
+
+
+def parse_sampling(value):
+    """Parse ``"logger=rate,logger=rate"`` (the LOG_SAMPLING setting)."""
+    rates = {}
+    for part in (value or '').split(','):
+        name, _, rate = part.partition('=')
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
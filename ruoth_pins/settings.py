@@ -14,16 +14,13 @@ import os
 from pathlib import Path
 from decouple import config
 import sys
-import logging
 from dotenv import load_dotenv
 import dj_database_url
+from ruoth_pins.log_handlers import parse_sampling
 
 
 load_dotenv()  # Load environment variables from .env file
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-
 
 # Build paths
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -74,6 +71,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'pinterest_scheduler.middleware.ConnectionTelemetryMiddleware',
+    'pinterest_scheduler.middleware.SQLBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -103,6 +102,13 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ruoth_pins.wsgi.application'
+# ASGI is opt-in: the Procfile serves WSGI, where the async admin tools
+# (streaming exports, repurpose hooks) still work, each on its own event loop.
+# To serve them natively:
+#   gunicorn ruoth_pins.asgi:application -k uvicorn.workers.UvicornWorker
+# Under ASGI use DB_POOL_MODE=pool or none, not persistent: each request runs
+# its queries in a new thread, so a persistent connection is never reused.
+ASGI_APPLICATION = 'ruoth_pins.asgi.application'
 
 
 # Database
@@ -114,6 +120,95 @@ DATABASES = {
     )
 }
 
+# Connection reuse (per gunicorn worker)
+# DB_POOL_MODE:
+#   none        – open/close a connection per request (Django default)
+#   persistent  – keep the worker's connection open for DB_CONN_MAX_AGE seconds,
+#                 health-checked before reuse
+#   pool        – psycopg 3 connection pool (psycopg, psycopg-binary and
+#                 psycopg-pool in requirements.txt; Django uses psycopg 3
+#                 over psycopg2 whenever it is installed)
+# Opened vs reused connection counts (DB_POOL_TELEMETRY=True): /admin-tools/db-pool-stats/
+
+DB_POOL_MODE = config('DB_POOL_MODE', default='none')
+DB_POOL_TELEMETRY = config('DB_POOL_TELEMETRY', default=False, cast=bool)
+
+if DB_POOL_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=600, cast=int)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_POOL_MODE == 'pool':
+    from psycopg_pool import ConnectionPool
+
+    # Pooled connections are returned at the end of each request, so
+    # CONN_MAX_AGE must stay 0; the pool does its own health checks.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        'check': ConnectionPool.check_connection,
+    }
+
+# Cache
+# Shared by all gunicorn workers so generation-keyed invalidation (see
+# pinterest_scheduler/services/caching.py) is seen everywhere. Use Redis when
+# REDIS_URL is set (needs the redis package), otherwise a file-based cache on
+# the local disk.
+# Tests get an isolated in-memory cache.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if 'test' in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+elif REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=os.path.join(BASE_DIR, '.cache')),
+        }
+    }
+
+# Local-time windows the slot allocator spreads each day's pins across,
+# e.g. "09:00-12:00,17:00-21:00".
+POSTING_WINDOWS = config('POSTING_WINDOWS', default='09:00-21:00')
+# Seconds the SmartLoop pillar/board mix optimiser may spend per run, shared by
+# all the campaigns in the selection.
+SCHEDULE_OPTIMIZER_BUDGET = config('SCHEDULE_OPTIMIZER_BUDGET', default=2.0, cast=float)
+
+# Pinterest API (pinterest_scheduler.services.api_client)
+# Point PINTEREST_API_BASE at `manage.py pinterest_stub` to publish against a local stand-in.
+PINTEREST_API_BASE = config('PINTEREST_API_BASE', default='https://api.pinterest.com/v5')
+PINTEREST_ACCESS_TOKEN = config('PINTEREST_ACCESS_TOKEN', default='')
+# Sustained requests per second and burst size of the client's token bucket; keep under the app's quota.
+PINTEREST_RATE_PER_SECOND = config('PINTEREST_RATE_PER_SECOND', default=2.0, cast=float)
+PINTEREST_RATE_BURST = config('PINTEREST_RATE_BURST', default=10, cast=int)
+# Pooled keep-alive connections, which is also the number of concurrent create calls.
+PINTEREST_MAX_CONNECTIONS = config('PINTEREST_MAX_CONNECTIONS', default=8, cast=int)
+PINTEREST_MAX_RETRIES = config('PINTEREST_MAX_RETRIES', default=4, cast=int)
+PINTEREST_BATCH_SIZE = config('PINTEREST_BATCH_SIZE', default=100, cast=int)
+# Where `manage.py publish_daemon` sends due pins: 'api', 'file' or a dotted Publisher class path.
+PUBLISH_DAEMON_PUBLISHER = config('PUBLISH_DAEMON_PUBLISHER', default='api')
+
+# Per-request SQL budget (pinterest_scheduler.middleware.SQLBudgetMiddleware)
+# Always on with DEBUG; in production only a sampled share of requests is measured.
+SQL_BUDGET_ENABLED = config('SQL_BUDGET_ENABLED', default=DEBUG, cast=bool)
+SQL_BUDGET_SAMPLE_RATE = config('SQL_BUDGET_SAMPLE_RATE', default=0.0, cast=float)
+SQL_BUDGET_MAX_QUERIES = config('SQL_BUDGET_MAX_QUERIES', default=50, cast=int)
+SQL_BUDGET_MAX_TIME_MS = config('SQL_BUDGET_MAX_TIME_MS', default=500, cast=int)
+SQL_BUDGET_REPEAT_THRESHOLD = config('SQL_BUDGET_REPEAT_THRESHOLD', default=5, cast=int)
+SQL_BUDGET_HEADER = config('SQL_BUDGET_HEADER', default=DEBUG, cast=bool)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -155,17 +250,36 @@ USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Logging configuration to display errors in the console
+# Logging
+# Everything goes through a queue to a single listener thread (JSON lines by
+# default), so request threads never block on log I/O. Hot-loop loggers are
+# sampled below WARNING: LOG_SAMPLING="logger=rate,logger=rate".
+
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_FORMAT = config('LOG_FORMAT', default='json')  # json | text
+LOG_SAMPLING = parse_sampling(config(
+    'LOG_SAMPLING',
+    default='pinterest_scheduler.admin.csv_rows=0.01,pinterest_scheduler.services.hook_generator=0.25',
+))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'sampling': {
+            '()': 'ruoth_pins.log_handlers.SamplingFilter',
+            'rates': LOG_SAMPLING,
+        },
+    },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            '()': 'ruoth_pins.log_handlers.QueuedStreamHandler',
+            'fmt': LOG_FORMAT,
+            'filters': ['sampling'],
         },
     },
     'root': {
         'handlers': ['console'],
-        'level': 'DEBUG',
+        'level': LOG_LEVEL,
     },
 }